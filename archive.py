@@ -0,0 +1,333 @@
+"""
+Rugby Council AI - Session Archive
+
+save_council_session writes one timestamped markdown file per run into
+sessions/, with no index, so finding earlier plans for an age group or
+focus meant opening file after file.
+
+The archive is a SQLite database (sessions/archive.db) holding every run's
+parameters (parsed into age group, duration, players, coaches and focus),
+plans, reviews, final plan, Stage 3 path and telemetry totals, with an
+FTS5 full-text index over the text. Runs are added as they are saved.
+Sessions saved before the archive existed are added with a backfill,
+which reads the markdown files and their telemetry sidecars:
+
+    python archive.py backfill
+    python archive.py search breakdown --age U10
+    python archive.py search --model reasoning --since 2024-12-01
+
+With config.ARCHIVE_REFERENCE_PLANS set, Stage 1 prompts also include the
+final plans of the most similar past sessions, so the council starts from
+proven material rather than a blank page.
+"""
+
+import json
+import re
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import config
+import plan_linter
+import telemetry
+from session_params import parse_session_params
+
+DEFAULT_PATH = Path(__file__).parent / "sessions" / "archive.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    session_file TEXT UNIQUE NOT NULL,
+    run_id TEXT,
+    created TEXT NOT NULL,
+    session_params TEXT NOT NULL,
+    age_group TEXT,
+    duration_minutes INTEGER,
+    players INTEGER,
+    coaches INTEGER,
+    focus TEXT,
+    final_plan TEXT NOT NULL,
+    stage_3_path TEXT,
+    metrics TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_age_group ON runs (age_group);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created);
+CREATE TABLE IF NOT EXISTS contributions (
+    run INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    model_key TEXT NOT NULL,
+    role TEXT,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contributions_model ON contributions (model_key);
+CREATE VIRTUAL TABLE IF NOT EXISTS runs_fts USING fts5 (session_params, focus, final_plan, contributions);
+"""
+
+# Matches the headings save_council_session writes
+_STAGE_HEADINGS = re.compile(r"^## STAGE (\d):.*$", re.MULTILINE)
+_MEMBER_HEADING = re.compile(r"^### (?:Review by )?(.+?) \(([\w-]+)\)\s*$", re.MULTILINE)
+
+
+@dataclass
+class ArchivedSession:
+    """One archived council run."""
+    session_file: str
+    created: str
+    session_params: str
+    age_group: Optional[str]
+    focus: str
+    final_plan: str
+    stage_3_path: Optional[str] = None
+
+
+def _split_members(section: str) -> List[Dict[str, str]]:
+    # Plans have headings of their own, like "### Main Activity (20 min)";
+    # only a council member's key starts a new member
+    headings = [heading for heading in _MEMBER_HEADING.finditer(section)
+                if heading.group(2) in config.COUNCIL_MODELS]
+    members = []
+    for heading, following in zip(headings, headings[1:] + [None]):
+        end = following.start() if following else len(section)
+        text = section[heading.end():end].strip()
+        text = re.sub(r"\n-{3,}\s*$", "", text).strip()
+        members.append({"role": heading.group(1), "model_key": heading.group(2), "text": text})
+    return members
+
+
+def parse_session_file(path: Path) -> Dict:
+    """
+    Reads a saved session's markdown (and its telemetry sidecar, if there is one).
+
+    Returns:
+        Dictionary with session_params, created, plans, reviews, final_plan,
+        stage_3_path, run_id and metrics
+
+    Raises:
+        ValueError: If the file isn't a council session
+    """
+    path = Path(path)
+    content = path.read_text(encoding="utf-8")
+    params = re.search(r"^\*\*Session Parameters:\*\*\s*(.+)$", content, re.MULTILINE)
+    if not params:
+        raise ValueError(f"{path.name} is not a council session (no Session Parameters line)")
+    generated = re.search(r"^\*\*Generated:\*\*\s*(.+)$", content, re.MULTILINE)
+
+    stages = {}
+    headings = list(_STAGE_HEADINGS.finditer(content))
+    for heading, following in zip(headings, headings[1:] + [None]):
+        end = following.start() if following else len(content)
+        stages[heading.group(1)] = content[heading.end():end]
+
+    # The plan checks and tier table that follow the final plan aren't part of it
+    appendices = "|".join(re.escape(heading) for heading in (plan_linter.CHECKS_HEADING, telemetry.TIERS_HEADING))
+    final_plan = re.split(rf"\n---\n\n## (?:{appendices})", stages.get("3", ""))[0].strip()
+    note = re.match(r"^\*([^*\n]+)\*\n", final_plan)
+    if note:
+        final_plan = final_plan[note.end():].strip()
+
+    sidecar = path.with_suffix(".json")
+    report = json.loads(sidecar.read_text(encoding="utf-8")) if sidecar.exists() else {}
+    created = generated.group(1).strip() if generated else datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+    return {
+        "session_params": params.group(1).strip(),
+        "created": created.replace(" ", "T"),
+        "plans": _split_members(stages.get("1", "")),
+        "reviews": _split_members(stages.get("2", "")),
+        "final_plan": final_plan,
+        "stage_3_path": (report.get("stage_3") or {}).get("path"),
+        "run_id": report.get("run_id"),
+        "metrics": report.get("totals"),
+    }
+
+
+def _fts_query(text: str) -> str:
+    # Quote every word so user text can't be read as FTS5 syntax, and match any of them
+    words = re.findall(r"\w+", text.lower())
+    return " OR ".join(f'"{word}"' for word in words if len(word) > 2)
+
+
+class SessionArchive:
+    """
+    The archive database.
+
+    Args:
+        path: SQLite file; created (with its tables) on first use
+    """
+
+    def __init__(self, path: Path = DEFAULT_PATH):
+        self.path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def add_session_file(self, path: Path) -> bool:
+        """
+        Adds a saved session to the archive.
+
+        Returns:
+            False if it was already archived
+        """
+        path = Path(path)
+        session = parse_session_file(path)
+        params = parse_session_params(session["session_params"])
+        contributions = (
+            [("plan", member) for member in session["plans"]]
+            + [("review", member) for member in session["reviews"]]
+        )
+        with closing(self._connect()) as connection, connection:
+            if connection.execute("SELECT 1 FROM runs WHERE session_file = ?", (path.name,)).fetchone():
+                return False
+            cursor = connection.execute(
+                "INSERT INTO runs (session_file, run_id, created, session_params, age_group, duration_minutes,"
+                " players, coaches, focus, final_plan, stage_3_path, metrics)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (path.name, session["run_id"], session["created"], session["session_params"], params.age_group,
+                 params.duration_minutes, params.players, params.coaches, params.focus, session["final_plan"],
+                 session["stage_3_path"], json.dumps(session["metrics"]) if session["metrics"] else None),
+            )
+            run = cursor.lastrowid
+            connection.executemany(
+                "INSERT INTO contributions (run, kind, model_key, role, text) VALUES (?, ?, ?, ?, ?)",
+                [(run, kind, member["model_key"], member["role"], member["text"]) for kind, member in contributions],
+            )
+            connection.execute(
+                "INSERT INTO runs_fts (rowid, session_params, focus, final_plan, contributions) VALUES (?, ?, ?, ?, ?)",
+                (run, session["session_params"], params.focus, session["final_plan"],
+                 "\n\n".join(member["text"] for _, member in contributions)),
+            )
+        return True
+
+    def backfill(self, sessions_dir: Path) -> int:
+        """Adds every saved session in a folder that isn't archived yet. Returns how many were added."""
+        added = 0
+        for path in sorted(Path(sessions_dir).glob("council_session_*.md")):
+            try:
+                added += self.add_session_file(path)
+            except ValueError as e:
+                print(f"   ⚠️  Skipped {path.name}: {e}")
+        return added
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        age_group: Optional[str] = None,
+        focus: Optional[str] = None,
+        model: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 20
+    ) -> List[ArchivedSession]:
+        """
+        Finds archived runs. Every filter given must match.
+
+        Args:
+            text: Words to look for anywhere (parameters, plans, reviews); best matches first
+            age_group: e.g. "U10"
+            focus: Words to look for in the session focus
+            model: Council member key that took part (e.g. "reasoning")
+            since: Earliest date, ISO format (e.g. "2024-12-01")
+            until: Latest date, ISO format (inclusive)
+            limit: Most results to return
+        """
+        conditions, values = [], []
+        # FTS5 allows one MATCH per query, so text and focus share one expression
+        match = [f"({_fts_query(text)})"] if text and _fts_query(text) else []
+        if focus and _fts_query(focus):
+            match.append(f"focus : ({_fts_query(focus)})")
+        if match:
+            conditions.append("runs_fts MATCH ?")
+            values.append(" AND ".join(match))
+        if age_group:
+            conditions.append("runs.age_group = ?")
+            values.append(parse_session_params(age_group).age_group or age_group)
+        if model:
+            conditions.append("EXISTS (SELECT 1 FROM contributions c WHERE c.run = runs.id AND c.model_key = ?)")
+            values.append(model)
+        if since:
+            conditions.append("runs.created >= ?")
+            values.append(since)
+        if until:
+            conditions.append("runs.created < ?")
+            values.append(until + "~")  # sorts after any time on that date
+        order = "bm25(runs_fts)" if match else "runs.created DESC"
+        query = (
+            "SELECT runs.* FROM runs JOIN runs_fts ON runs_fts.rowid = runs.id"
+            + (" WHERE " + " AND ".join(conditions) if conditions else "")
+            + f" ORDER BY {order} LIMIT ?"
+        )
+        with closing(self._connect()) as connection:
+            rows = connection.execute(query, values + [limit]).fetchall()
+        return [
+            ArchivedSession(row["session_file"], row["created"], row["session_params"], row["age_group"],
+                            row["focus"] or "", row["final_plan"], row["stage_3_path"])
+            for row in rows
+        ]
+
+    def plans_for(self, session_file: str) -> Dict[str, str]:
+        """The Stage 1 plans of an archived run, by council member key."""
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT c.model_key, c.text FROM contributions c JOIN runs ON runs.id = c.run"
+                " WHERE runs.session_file = ? AND c.kind = 'plan'",
+                (session_file,),
+            ).fetchall()
+        return {row["model_key"]: row["text"] for row in rows}
+
+    def similar_sessions(self, session_params: str, limit: int = 2) -> List[ArchivedSession]:
+        """
+        The past runs most like a new request: same age group where possible, ranked by focus words.
+        """
+        params = parse_session_params(session_params)
+        words = params.focus or session_params
+        matches = self.search(text=words, age_group=params.age_group, limit=limit) if params.age_group else []
+        if len(matches) < limit:
+            seen = {match.session_file for match in matches}
+            matches += [match for match in self.search(text=words, limit=limit * 2)
+                        if match.session_file not in seen][:limit - len(matches)]
+        return matches
+
+
+def format_reference_plans(sessions: List[ArchivedSession]) -> str:
+    """Past final plans as a block for the Stage 1 prompt."""
+    return "\n\n".join(
+        f"--- Past session: {session.session_params} ({session.created[:10]}) ---\n{session.final_plan}"
+        for session in sessions
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Search and maintain the council session archive")
+    parser.add_argument("--db", type=Path, default=DEFAULT_PATH, help="archive database file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    backfill = commands.add_parser("backfill", help="add saved sessions that aren't archived yet")
+    backfill.add_argument("sessions_dir", type=Path, nargs="?", default=DEFAULT_PATH.parent)
+    search = commands.add_parser("search", help="find archived sessions")
+    search.add_argument("text", nargs="*", help="words to search for")
+    search.add_argument("--age", help="age group, e.g. U10")
+    search.add_argument("--focus", help="words in the session focus")
+    search.add_argument("--model", help="council member key, e.g. reasoning")
+    search.add_argument("--since", help="earliest date, e.g. 2024-12-01")
+    search.add_argument("--until", help="latest date")
+    search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    session_archive = SessionArchive(args.db)
+    if args.command == "backfill":
+        print(f"Archived {session_archive.backfill(args.sessions_dir)} session(s) into {args.db}")
+    else:
+        results = session_archive.search(" ".join(args.text) or None, args.age, args.focus, args.model,
+                                         args.since, args.until, args.limit)
+        for result in results:
+            print(f"{result.created[:16]}  {result.age_group or '-':<4}  {result.session_file}")
+            print(f"    {result.session_params}")
+        print(f"\n{len(results)} session(s) found")
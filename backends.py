@@ -0,0 +1,142 @@
+"""
+Rugby Council AI - Multi-Endpoint Backend Pool
+
+With a single LM Studio server the council has to run one model at a time.
+If you have several machines, each running its own OpenAI-compatible server
+with a different model loaded, the independent calls in a stage (the three
+stage 1 plans, the three stage 2 reviews) don't need to wait for each other.
+
+This module maps each council member to its endpoint (config.MODEL_ENDPOINTS)
+and runs a stage's calls on a thread pool, with a per-endpoint limit on how
+many requests a server is given at once. Stage time then matches the slowest
+model instead of the sum of all of them.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import config
+
+
+class Endpoint:
+    """One OpenAI-compatible server and how many requests it may handle at once."""
+
+    def __init__(self, url: str, max_concurrency: int = 1):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1 (got {max_concurrency} for {url})")
+        self.url = url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def run(self, task: Callable[[str], str]) -> str:
+        # Blocks until this server has a free slot, then runs the call
+        with self._slots:
+            return task(self.url)
+
+
+class BackendPool:
+    """
+    Routes council members to their endpoints and runs calls concurrently.
+
+    Members without an entry in the endpoint map use the default URL. Members
+    that share a URL share that endpoint's concurrency limit.
+    """
+
+    def __init__(self, model_endpoints: Dict[str, Dict], default_url: str):
+        self._endpoints: Dict[str, Endpoint] = {}
+        self._by_model: Dict[str, Endpoint] = {}
+        for model_key, settings in model_endpoints.items():
+            self._by_model[model_key] = self._endpoint(
+                settings["url"], settings.get("max_concurrency", 1)
+            )
+        self._default = self._endpoint(default_url, 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _endpoint(self, url: str, max_concurrency: int) -> Endpoint:
+        url = url.rstrip("/")
+        if url not in self._endpoints:
+            self._endpoints[url] = Endpoint(url, max_concurrency)
+        return self._endpoints[url]
+
+    def endpoint_for(self, model_key: str) -> Endpoint:
+        return self._by_model.get(model_key, self._default)
+
+    def url_for(self, model_key: str) -> str:
+        return self.endpoint_for(model_key).url
+
+    def run(self, tasks: Dict[str, Callable[[str], str]]) -> Dict[str, str]:
+        """
+        Runs one call per council member concurrently.
+
+        Args:
+            tasks: Maps model keys to a function that makes the call, given
+                   the base URL of that model's endpoint
+
+        Returns:
+            Dictionary mapping model keys to each call's result, in the same
+            order as tasks. If any call fails, its exception is re-raised once
+            every call has finished.
+        """
+        results = self.run_many(list(tasks.items()))
+        return dict(zip(tasks, results))
+
+    def run_many(self, tasks: List[Tuple[str, Callable[[str], str]]]) -> List[str]:
+        """
+        Runs any number of calls concurrently, several per model if needed.
+
+        Args:
+            tasks: (model key, call) pairs; each call is given the base URL
+                   of that model's endpoint
+
+        Returns:
+            Each call's result, in the same order as tasks
+        """
+        if not tasks:
+            return []
+        workers = sum(endpoint.max_concurrency for endpoint in self._endpoints.values())
+        with ThreadPoolExecutor(max_workers=min(len(tasks), workers)) as executor:
+            futures = [
+                executor.submit(self.endpoint_for(model_key).run, task)
+                for model_key, task in tasks
+            ]
+            return [future.result() for future in futures]
+
+    def submit(self, model_key: str, task: Callable[[str], str]) -> Future:
+        """
+        Starts one call in the background and returns its Future.
+
+        For pipelines that start new work as each result arrives (see
+        pipeline.py) rather than waiting for a whole stage. Calls still
+        respect each endpoint's concurrency limit.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                # Calls wait for their endpoint's slot inside a worker, so allow
+                # enough workers that a busy endpoint can't hold up the others
+                workers = sum(endpoint.max_concurrency for endpoint in self._endpoints.values())
+                self._executor = ThreadPoolExecutor(max_workers=4 * workers)
+        return self._executor.submit(self.endpoint_for(model_key).run, task)
+
+
+_pool: Optional[BackendPool] = None
+_pool_settings = None
+
+
+def get_pool() -> Optional[BackendPool]:
+    """
+    Returns the shared backend pool, or None when no endpoints are configured.
+
+    With no MODEL_ENDPOINTS the council keeps its original one-model-at-a-time
+    behaviour against LM_STUDIO_BASE_URL.
+    """
+    global _pool, _pool_settings
+    endpoints = config.MODEL_ENDPOINTS
+    if not endpoints:
+        return None
+    settings = (repr(endpoints), config.LM_STUDIO_BASE_URL)
+    if _pool is None or settings != _pool_settings:
+        _pool = BackendPool(endpoints, config.LM_STUDIO_BASE_URL)
+        _pool_settings = settings
+    return _pool
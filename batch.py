@@ -0,0 +1,376 @@
+"""
+Rugby Council AI - Batch Session Planning
+
+Planning a term of sessions for several age groups one `python council.py`
+at a time means dozens of runs, each paying for every model load again.
+
+A batch run reads many session specs from a file and plans them together.
+All stage 1 calls for a model run back to back across every session, then
+all stage 2 calls, then all stage 3 calls - so each model is loaded about
+once per stage for the whole batch rather than once per session. Each
+session still gets its own output file, exactly as a single run would.
+
+Usage:
+    python batch.py examples/batch/autumn-term.jsonl
+
+Spec files can be JSONL, one session per line:
+    {"id": "u10-breakdown", "session_params": "60 minutes, U10s, 24 players, ..."}
+
+or CSV with either a session_params column or the columns
+duration, age_group, players, coaches, focus (and optionally id).
+
+Either format can give a session a "profile" (see council_profiles.py), so
+one batch can mix, say, creative and systematic councils. Sessions are
+planned in groups, one group per profile.
+
+Every session is checkpointed (see checkpoint.py) under an id derived from
+the spec file and its parameters, so rerunning the same batch after an
+interruption picks up where it stopped.
+"""
+
+import csv
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import backends
+import checkpoint as checkpoints
+import config
+import consensus
+import council
+import council_profiles
+import prompt_prefix
+import response_cache
+import scheduler
+import telemetry
+
+# Wall time of each stage in the most recent run_batch(), in seconds
+last_run_stage_times: Dict[str, float] = {}
+
+# CSV columns that can be used instead of a single session_params column
+SPEC_COLUMNS = ["duration", "age_group", "players", "coaches", "focus"]
+
+
+@dataclass
+class SessionSpec:
+    """One session to plan in a batch."""
+    session_id: str
+    session_params: str
+    profile: Optional[str] = None
+
+
+def _params_from_row(row: Dict[str, str]) -> str:
+    if row.get("session_params"):
+        return row["session_params"].strip()
+    missing = [column for column in SPEC_COLUMNS if not row.get(column)]
+    if missing:
+        raise ValueError(f"Session spec is missing session_params or columns: {', '.join(missing)}")
+    # JSONL specs may give counts as numbers rather than text
+    players, coaches = str(row["players"]), str(row["coaches"])
+    players = players if "player" in players else f"{players} players"
+    coaches = coaches if "coach" in coaches else f"{coaches} coaches"
+    return f"{row['duration']}, {row['age_group']}, {players}, {coaches}, focus on {row['focus']}"
+
+
+def read_session_specs(path: Path) -> List[SessionSpec]:
+    """
+    Reads session specs from a JSONL or CSV file.
+
+    Raises:
+        ValueError: If a spec has no session parameters, or ids are repeated
+    """
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.suffix.lower() == ".csv":
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    specs = []
+    for number, row in enumerate(rows, start=1):
+        session_id = str(row.get("id") or f"session-{number:02d}")
+        specs.append(SessionSpec(session_id, _params_from_row(row), row.get("profile") or None))
+
+    ids = [spec.session_id for spec in specs]
+    duplicates = sorted({session_id for session_id in ids if ids.count(session_id) > 1})
+    if duplicates:
+        raise ValueError(f"Repeated session ids in {path.name}: {', '.join(duplicates)}")
+    return specs
+
+
+def _run_id(batch_name: str, spec: SessionSpec) -> str:
+    # Stable across reruns of the same file, but a changed spec gets a new run
+    key = spec.session_params + (f"|{spec.profile}" if spec.profile else "")
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:8]
+    return f"batch_{batch_name}_{spec.session_id}_{digest}"
+
+
+def _build_layers(runs: Dict[str, checkpoints.RunCheckpoint]) -> List[List[scheduler.CouncilCall]]:
+    # Same shape as a single council, but every layer holds the calls for
+    # every session that still needs them
+    writers, reviewers = council.stage_roster("stage_1"), council.stage_roster("stage_2")
+    stage_1, stage_2, stage_3 = [], [], []
+    for session_id, run in runs.items():
+        stage_1 += [scheduler.CouncilCall(1, key, session_id) for key in writers if key not in run.responses]
+        stage_2 += [scheduler.CouncilCall(2, key, session_id) for key in reviewers if key not in run.reviews]
+        if run.final_plan is None:
+            stage_3.append(scheduler.CouncilCall(3, config.CHAIRMAN_MODEL, session_id))
+    return [stage_1, stage_2, stage_3]
+
+
+def _separate_run_loads(runs: Dict[str, checkpoints.RunCheckpoint]) -> int:
+    # What planning each session with its own (scheduled) council run would cost
+    return sum(
+        scheduler.plan_schedule(_build_layers({session_id: run})).model_loads
+        for session_id, run in runs.items()
+    )
+
+
+class _BatchPrompts:
+    """Builds each session's prompts once, when the stage that needs them starts."""
+
+    def __init__(self, runs: Dict[str, checkpoints.RunCheckpoint], framework: str):
+        self.runs = runs
+        self.framework = framework
+        # Stage 3 path per session, once the reviews are in (see consensus.py)
+        self.decisions: Dict[str, consensus.Decision] = {}
+        self._cache: Dict[tuple, str] = {}
+
+    def for_call(self, call: scheduler.CouncilCall) -> str:
+        run = self.runs[call.session_id]
+        responses = council.in_config_order(run.responses)
+        # Reviewers get different plans in a review tournament (see tournament.py)
+        group = tuple(council.review_groups(responses)[call.model_key]) if call.stage == 2 else ()
+        key = (call.stage, call.session_id, group)
+        if key not in self._cache:
+            if call.stage == 1:
+                prompt = council.build_plan_prompt(
+                    run.session_params, council.reference_plans_for(run.session_params)
+                )
+            elif call.stage == 2:
+                prompt = council.prepare_review_prompt(responses, self.framework, list(group))
+            elif self.decisions[call.session_id].path == consensus.LIGHT_EDIT:
+                prompt = council.prepare_light_edit_prompt(
+                    run.responses[self.decisions[call.session_id].winner_key],
+                    council.in_config_order(run.reviews), run.session_params, self.framework
+                )
+            else:
+                prompt = council.prepare_synthesis_prompt(
+                    responses, council.in_config_order(run.reviews), run.session_params, self.framework
+                )
+            self._cache[key] = prompt
+        return self._cache[key]
+
+    def stage_3_record(self, call: scheduler.CouncilCall) -> Optional[Dict]:
+        decision = self.decisions.get(call.session_id) if call.stage == 3 else None
+        return decision.to_dict() if decision else None
+
+
+def _apply_consensus(
+    layer: List[scheduler.CouncilCall],
+    runs: Dict[str, checkpoints.RunCheckpoint],
+    prompts: _BatchPrompts
+) -> List[scheduler.CouncilCall]:
+    # Decides each session's Stage 3 path. Sessions whose reviewers agreed
+    # (in "winner" mode) are finished here and drop out of the layer
+    remaining = []
+    for call in layer:
+        run = runs[call.session_id]
+        decision = council.decide_stage_3(council.in_config_order(run.responses), run.reviews)
+        prompts.decisions[call.session_id] = decision
+        if decision.path == consensus.WINNER:
+            print(f"🏆 [{call.session_id}] {decision.note}")
+            run.record_final_plan(run.responses[decision.winner_key], decision.to_dict())
+        else:
+            remaining.append(call)
+    return remaining
+
+
+def _record(
+    run: checkpoints.RunCheckpoint,
+    call: scheduler.CouncilCall,
+    text: str,
+    stage_3: Optional[Dict] = None
+):
+    if call.stage == 1:
+        run.record_plan(call.model_key, text)
+    elif call.stage == 2:
+        run.record_review(call.model_key, text)
+    else:
+        run.record_final_plan(text, stage_3)
+
+
+def _make_call(
+    call: scheduler.CouncilCall,
+    prompt: str,
+    prefix: str,
+    run: checkpoints.RunCheckpoint,
+    stage_3: Optional[Dict] = None
+):
+    def make(base_url: Optional[str] = None) -> str:
+        # Stage 1 and 3 produce plans, which may be structured (see structured.py)
+        stage = f"stage_{call.stage}"
+        if call.stage == 2:
+            text = council.call_council_model(prompt, call.model_key, prefix, base_url=base_url,
+                                              stage=stage, session_id=call.session_id)
+        else:
+            text = council.ask_for_plan(prompt, call.model_key, prefix, base_url=base_url, stage=stage,
+                                        session_id=call.session_id, session_params=run.session_params)
+        _record(run, call, text, stage_3)
+        return text
+
+    return make
+
+
+def run_batch(specs: List[SessionSpec], batch_name: str = "batch") -> Dict[str, Path]:
+    """
+    Plans every session in specs, grouping calls by model across sessions.
+
+    Args:
+        specs: Sessions to plan
+        batch_name: Used in checkpoint run ids, so rerunning a batch resumes it
+
+    Returns:
+        Dictionary mapping session ids to their saved session files
+    """
+    print("\n" + "="*70)
+    print("🏉 RUGBY COUNCIL AI - BATCH SESSION PLANNER")
+    print("="*70)
+    print(f"\nSessions in batch: {len(specs)}")
+
+    framework = council.load_coaching_framework()
+    prefixes = {stage: prompt_prefix.build_stage_prefix(framework, f"stage_{stage}") for stage in (1, 2, 3)}
+    checkpoint_dir = checkpoints.checkpoint_dir_for(council.SESSIONS_DIR)
+    runs = {
+        spec.session_id: checkpoints.RunCheckpoint.load_or_create(_run_id(batch_name, spec), spec.session_params,
+                                                                  checkpoint_dir)
+        for spec in specs
+    }
+    resumed = sum(1 for run in runs.values() if run.completed_calls())
+    if resumed:
+        print(f"Resuming: {resumed} session(s) already have saved progress")
+
+    layers = _build_layers(runs)
+    pool = backends.get_pool()
+    if pool:
+        print("Backend pool: calls within each stage run in parallel")
+    else:
+        schedule = scheduler.plan_schedule(layers, loaded_model=council.loaded_model_key())
+        print(f"Model schedule: {schedule.model_loads} model loads for the whole batch "
+              f"(separate runs would need {_separate_run_loads(runs)})")
+
+    prompts = _BatchPrompts(runs, framework)
+    council.get_model_manager().reset()
+    telemetry.recorder.clear()
+    last_run_stage_times.clear()
+    for stage, layer in enumerate(layers, start=1):
+        if stage == 3:
+            layer = _apply_consensus(layer, runs, prompts)
+        if not layer:
+            continue
+        stage_start = time.perf_counter()
+        print("\n" + "="*70)
+        print(f"BATCH STAGE {stage}: {len(layer)} call(s)")
+        print("="*70)
+
+        if pool:
+            pool.run_many([
+                (call.model_key, _make_call(call, prompts.for_call(call), prefixes[stage], runs[call.session_id],
+                                            prompts.stage_3_record(call)))
+                for call in layer
+            ])
+            last_run_stage_times[f"stage_{stage}"] = time.perf_counter() - stage_start
+            continue
+
+        for call in (c for c in schedule.calls if c.stage == stage and c in layer):
+            model_info = config.COUNCIL_MODELS[call.model_key]
+            print(f"\n📝 [{call.session_id}] Stage {stage} from {model_info['role']} ({call.model_key})...")
+            council.ensure_model_loaded(model_info['name'])
+            text = _make_call(call, prompts.for_call(call), prefixes[stage], runs[call.session_id],
+                              prompts.stage_3_record(call))()
+            print(f"✅ Received ({len(text)} characters)")
+        last_run_stage_times[f"stage_{stage}"] = time.perf_counter() - stage_start
+
+    # Each session still gets its own output file
+    outputs = {}
+    for session_id, run in runs.items():
+        if run.output_file is None:
+            # Stage times cover the whole batch; calls are this session's own
+            report = telemetry.recorder.session_report(
+                run.session_params, last_run_stage_times, session_id=session_id, run_id=run.run_id
+            )
+            report["stage_3"] = run.stage_3 or {}
+            output_file = council.save_council_session(
+                run.session_params,
+                council.in_config_order(run.responses),
+                council.in_config_order(run.reviews),
+                run.final_plan,
+                name=session_id,
+                stage_3_note=(run.stage_3 or {}).get("note"),
+                tiers=report["by_tier"]
+            )
+            run.record_output(output_file)
+            telemetry.write_sidecar(output_file, report)
+            council.archive_session(output_file)
+        outputs[session_id] = Path(run.output_file)
+
+    print("\n" + "="*70)
+    print("✅ BATCH COMPLETE")
+    print("="*70)
+    for session_id, output_file in outputs.items():
+        print(f"   {session_id}: {output_file}")
+    load_report = council.get_model_manager().report()
+    if load_report:
+        print("Model load time:")
+        print("\n".join(load_report))
+    cache = response_cache.get_cache()
+    if cache:
+        print(f"Response cache: {cache.summary()}")
+    return outputs
+
+
+def run_profiled_batch(specs: List[SessionSpec], batch_name: str = "batch") -> Dict[str, Path]:
+    """
+    Plans every session in specs, each with its own profile.
+
+    Sessions sharing a profile are planned together as one batch (see
+    run_batch), with that profile applied.
+
+    Raises:
+        council_profiles.ProfileError: If a profile is missing or invalid,
+                                       before any session is planned
+    """
+    groups: Dict[Optional[str], List[SessionSpec]] = {}
+    for spec in specs:
+        groups.setdefault(spec.profile, []).append(spec)
+    for profile in groups:
+        if profile:
+            council_profiles.loader.load(profile)
+
+    outputs = {}
+    for profile, group in groups.items():
+        if profile:
+            print(f"\n🎛️  Profile {profile}: {len(group)} session(s)")
+        with council_profiles.applied(profile):
+            outputs.update(run_batch(group, batch_name))
+    return outputs
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Plan many council sessions in one batch")
+    parser.add_argument("spec_file", type=Path, help="JSONL or CSV file of session specs")
+    args = parser.parse_args()
+
+    try:
+        run_profiled_batch(read_session_specs(args.spec_file), batch_name=args.spec_file.stem)
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Batch interrupted by user")
+        print(f"   Progress is saved. Run the same command again to resume: python batch.py {args.spec_file}")
+    except Exception as e:
+        print(f"\n\n❌ Error: {e}")
+        print(f"\nProgress is saved. Run the same command again to resume: python batch.py {args.spec_file}")
@@ -0,0 +1 @@
+"""Benchmark harness and mock LLM backend for Rugby Council AI."""
@@ -0,0 +1,312 @@
+"""
+Rugby Council AI - Mock LLM Backend
+
+A local, deterministic stand-in for LM Studio's OpenAI-compatible server,
+so the council can be driven end to end (and timed) without real models.
+
+It answers POST /chat/completions, plain or streamed, GET /models, and
+LM Studio-style POST /models/load and /models/unload (the load finishes in
+the background, so clients have to poll /models until it's ready).
+Everything slow about a real server can be dialled in:
+
+- latency:            fixed delay before any output, in seconds
+- tokens_per_second:  generation speed (None = instant)
+- response_tokens:    length of each response, capped by the request's max_tokens
+- load_seconds:       time to "load" a model when a request asks for a
+                      different model from the last one (counted as a swap)
+
+And for testing failure handling:
+
+- fail_first:    answer the first N requests with 503
+- stall_after:   stop sending a streamed response after this many chunks
+- stall_for:     ...for this many seconds
+
+Responses are built from a hash of the request, so the same request always
+gets the same text. Requests with a response_format get a structured
+session plan (see structured.py) instead of plain text. Run it standalone with:
+
+    python -m benchmarks.mock_server --port 1234 --tokens-per-second 15
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+# Section headings used to give mock plans a realistic markdown shape
+PLAN_SECTIONS = ["Session Objectives", "Warm-up", "Main Activity", "Game", "Cool-down and Review",
+                 "Coaching Points", "Coaching Habits"]
+FILLER_WORDS = ("players coaches pass ruck support space decision tackle ball width depth "
+                "communicate scan praise review choice progression game pressure").split()
+
+
+def mock_content(model: str, prompt_key: str, tokens: int) -> str:
+    """Deterministic response text: 'response from <model>' plus `tokens` words of filler."""
+    content = f"response from {model}"
+    if tokens <= 0:
+        return content
+    rng = random.Random(hashlib.sha256(f"{model}|{prompt_key}".encode("utf-8")).hexdigest())
+    words = []
+    section = 0
+    for index in range(tokens):
+        if index % 60 == 0:
+            words.append(f"\n\n## {PLAN_SECTIONS[section % len(PLAN_SECTIONS)]}\n\n")
+            section += 1
+        words.append(rng.choice(FILLER_WORDS))
+    return content + " " + " ".join(words)
+
+
+def mock_plan_json(model: str, prompt_key: str, tokens: int) -> str:
+    """A deterministic structured session plan (see structured.py), for requests with a response_format."""
+    rng = random.Random(hashlib.sha256(f"{model}|{prompt_key}".encode("utf-8")).hexdigest())
+    words = max(tokens // 12, 3)
+
+    def text() -> str:
+        return " ".join(rng.choice(FILLER_WORDS) for _ in range(words)).capitalize() + "."
+
+    phases = [("warm-up", 10), ("skill", 15), ("skill", 15), ("game", 15), ("cool-down", 5)]
+    return json.dumps({
+        "title": f"response from {model}",
+        "objectives": [text(), text()],
+        "activities": [
+            {"name": f"Activity {number}", "phase": phase, "duration_minutes": minutes, "description": text(),
+             "step_progressions": [text()], "coaching_points": [text()]}
+            for number, (phase, minutes) in enumerate(phases, start=1)
+        ],
+        "coaching_points": [text(), text()],
+        "coaching_habits": [{"habit": habit, "how": text()}
+                            for habit in ("Shared Purpose", "Progression", "Praise", "Review", "Choice")],
+    })
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            mock = self.server.mock
+            with mock.lock:
+                data = [{"id": model, "state": mock.model_state(model)}
+                        for model in sorted(mock.models_seen | ({mock.loaded_model, mock.loading} - {None}))]
+            self._send_json(200, {"object": "list", "data": data})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        mock = self.server.mock
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.loads(raw or b"{}")
+        path = self.path.rstrip("/")
+        if path.endswith("/models/load"):
+            mock.start_load(body.get("model", ""))
+            self._send_json(200, {"status": "loading"})
+            return
+        if path.endswith("/models/unload"):
+            with mock.lock:
+                if mock.loaded_model == body.get("instance_id"):
+                    mock.loaded_model = None
+            self._send_json(200, {"status": "unloaded"})
+            return
+
+        with mock.lock:
+            failing = mock.fail_first > 0
+            mock.fail_first -= 1
+        if failing:
+            self._send_json(503, {"error": "busy"})
+            return
+
+        model = body.get("model", "")
+        with mock.lock:
+            mock.requests.append(body)
+            mock.request_bytes.append(len(raw))
+            mock.request_times.append(time.perf_counter())
+            mock.models_seen.add(model)
+            mock.active += 1
+            mock.peak = max(mock.peak, mock.active)
+
+        try:
+            # One GPU: asking for a different model means loading it first
+            with mock.gpu:
+                if model != mock.loaded_model:
+                    mock.model_loads += 1
+                    time.sleep(mock.load_seconds)
+                    mock.loaded_model = model
+            time.sleep(mock.latency)
+
+            prompt_key = json.dumps(body.get("messages", []), sort_keys=True)
+            tokens = mock.response_tokens
+            if body.get("max_tokens"):
+                tokens = min(tokens, body["max_tokens"])
+            if body.get("response_format"):
+                content = mock_plan_json(model, prompt_key, tokens)
+            else:
+                content = mock_content(model, prompt_key, tokens)
+            usage = {"prompt_tokens": len(prompt_key) // 4, "completion_tokens": max(tokens, 1)}
+
+            if body.get("stream"):
+                self._stream(content, usage)
+            else:
+                if mock.tokens_per_second:
+                    time.sleep(usage["completion_tokens"] / mock.tokens_per_second)
+                self._send_json(200, {
+                    "choices": [{"message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                    "usage": usage,
+                })
+        finally:
+            with mock.lock:
+                mock.active -= 1
+
+    def _stream(self, content: str, usage: dict):
+        # Chunked, like real servers, so each event reaches the client as it is sent
+        mock = self.server.mock
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(event: str):
+            data = event.encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        pieces = content.split(" ")
+        for index, word in enumerate(pieces):
+            if index == mock.stall_after:
+                time.sleep(mock.stall_for)
+                return
+            if mock.tokens_per_second:
+                time.sleep(1 / mock.tokens_per_second)
+            piece = word if index == 0 else " " + word
+            send(f"data: {json.dumps({'choices': [{'delta': {'content': piece}}]})}\n\n")
+        send(f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n")
+        send("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_json(self, status: int, payload: dict):
+        reply = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+class MockLLMServer:
+    """
+    A mock OpenAI-compatible server running on a background thread.
+
+    Use as a context manager, or call start() and stop(). After requests,
+    the attributes requests, request_bytes, request_times (perf_counter at
+    arrival), model_loads and peak (most requests in flight at once)
+    describe what the server saw.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        tokens_per_second: Optional[float] = None,
+        response_tokens: int = 0,
+        load_seconds: float = 0.0,
+        fail_first: int = 0,
+        stall_after: int = -1,
+        stall_for: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.load_seconds = load_seconds
+        self.fail_first = fail_first
+        self.stall_after = stall_after
+        self.stall_for = stall_for
+        self.host = host
+        self.port = port
+
+        self.lock = threading.Lock()
+        self.gpu = threading.Lock()
+        self.requests: List[dict] = []
+        self.request_bytes: List[int] = []
+        self.request_times: List[float] = []
+        self.models_seen = set()
+        self.loaded_model: Optional[str] = None
+        self.loading: Optional[str] = None
+        self.model_loads = 0
+        self.active = 0
+        self.peak = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def model_state(self, model: str) -> str:
+        if model == self.loaded_model:
+            return "loaded"
+        return "loading" if model == self.loading else "not-loaded"
+
+    def start_load(self, model: str):
+        """Loads a model in the background, as a management API load request does."""
+        def load():
+            with self.gpu:
+                if model != self.loaded_model:
+                    self.model_loads += 1
+                    time.sleep(self.load_seconds)
+                    self.loaded_model = model
+            with self.lock:
+                self.loading = None
+
+        with self.lock:
+            self.models_seen.add(model)
+            self.loading = model
+        threading.Thread(target=load, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        """Base URL in the same form as config.LM_STUDIO_BASE_URL."""
+        return f"http://{self.host}:{self._server.server_address[1]}/v1"
+
+    def start(self) -> "MockLLMServer":
+        self._server = ThreadingHTTPServer((self.host, self.port), _MockHandler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a mock OpenAI-compatible LLM server")
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before output starts")
+    parser.add_argument("--tokens-per-second", type=float, default=15.0)
+    parser.add_argument("--response-tokens", type=int, default=800)
+    parser.add_argument("--load-seconds", type=float, default=2.0, help="seconds to swap models")
+    args = parser.parse_args()
+
+    server = MockLLMServer(latency=args.latency, tokens_per_second=args.tokens_per_second,
+                           response_tokens=args.response_tokens, load_seconds=args.load_seconds,
+                           port=args.port).start()
+    print(f"Mock LLM server running at {server.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,231 @@
+"""
+Rugby Council AI - Benchmark Harness
+
+Drives the real orchestration code end to end against mock LLM servers
+(benchmarks/mock_server.py), so orchestration overhead and the effect of
+scheduling, concurrency and batching can be measured without LM Studio.
+
+Scenarios:
+    sequential  one council run against one server, switching models
+    concurrent  one council run with each model on its own server (backend pool)
+    pipeline    as concurrent, with incremental Stage 2 (pipeline.py)
+    batch       several sessions planned together with batch.py
+
+Each scenario reports wall time per stage, model swaps seen by the servers,
+bytes sent per prompt and token throughput. Settings that change which
+calls a council makes (COUNCIL_SETTINGS) are pinned, whatever config.py
+says. Results are saved as JSON in benchmarks/results/ (named by time and
+git commit), with the settings used, so runs can be compared across
+commits:
+
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/<earlier>.json
+"""
+
+import contextlib
+import io
+import json
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import batch
+import checkpoint
+import config
+import council
+import http_client
+import response_cache
+from benchmarks.mock_server import MockLLMServer
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SCENARIOS = ["sequential", "concurrent", "pipeline", "batch"]
+SESSION_PARAMS = "60 minutes, U10s, 24 players, 4 coaches, focus on decision making around the breakdown"
+
+# Council settings every scenario runs with, whatever config.py says, so
+# results from different commits measure the same calls
+COUNCIL_SETTINGS = {
+    "RESPONSE_CACHE_ENABLED": False,
+    "LINT_FIX": "off",
+    "FRAMEWORK_DIGESTS": True,
+    "ADAPTIVE_BUDGETS": False,
+    "ARCHIVE_ENABLED": False,
+    "REQUEST_MATCH_ACTION": "off",
+}
+
+
+@contextlib.contextmanager
+def _overrides(target, **values):
+    # Temporarily set attributes on a module, restoring them afterwards
+    saved = {name: getattr(target, name) for name in values}
+    for name, value in values.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(target, name, value)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _server_metrics(servers: List[MockLLMServer], response_tokens: int) -> Dict:
+    sizes = [size for server in servers for size in server.request_bytes]
+    # The mock generates response_tokens words, capped by each request's max_tokens
+    completion_tokens = sum(
+        min(response_tokens, request.get("max_tokens") or response_tokens)
+        for server in servers for request in server.requests
+    )
+    return {
+        "requests": len(sizes),
+        "model_swaps": sum(server.model_loads for server in servers),
+        "bytes_sent_total": sum(sizes),
+        "bytes_per_prompt_mean": round(statistics.mean(sizes)) if sizes else 0,
+        "bytes_per_prompt_max": max(sizes, default=0),
+        "completion_tokens": completion_tokens,
+    }
+
+
+def run_scenario(name: str, settings: Dict, verbose: bool = False) -> Dict:
+    """
+    Runs one scenario against fresh mock servers and returns its metrics.
+
+    Args:
+        name: One of SCENARIOS
+        settings: Mock server settings plus "sessions" (batch size) and "stream"
+        verbose: Show the council's normal console output
+    """
+    server_settings = {key: settings[key] for key in
+                       ("latency", "tokens_per_second", "response_tokens", "load_seconds")}
+    model_keys = list(config.COUNCIL_MODELS)
+    pooled = name in ("concurrent", "pipeline")
+    server_count = len(model_keys) if pooled else 1
+    servers = [MockLLMServer(**server_settings).start() for _ in range(server_count)]
+    endpoints = (
+        {key: {"url": server.url, "max_concurrency": 1} for key, server in zip(model_keys, servers)}
+        if pooled else {}
+    )
+
+    output = None if verbose else io.StringIO()
+    with tempfile.TemporaryDirectory() as workdir, \
+            _overrides(config, LM_STUDIO_BASE_URL=servers[0].url, MODEL_ENDPOINTS=endpoints,
+                       MODEL_SWITCH_MODE="none", **COUNCIL_SETTINGS,
+                       STREAM_RESPONSES=settings["stream"],
+                       STAGE_2_MODE="incremental" if name == "pipeline" else "combined"), \
+            _overrides(council, SESSIONS_DIR=Path(workdir) / "sessions", _loaded_model=None), \
+            _overrides(checkpoint, CHECKPOINT_DIR=Path(workdir) / "checkpoints"), \
+            _overrides(response_cache, _cache=None), \
+            _overrides(http_client, _client=None), \
+            contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+        start = time.perf_counter()
+        try:
+            if name == "batch":
+                specs = [batch.SessionSpec(f"session-{index:02d}", f"{SESSION_PARAMS} (group {index})")
+                         for index in range(1, settings["sessions"] + 1)]
+                batch.run_batch(specs, batch_name="benchmark")
+                stage_times = dict(batch.last_run_stage_times)
+                sessions = len(specs)
+            else:
+                council.run_council(SESSION_PARAMS)
+                stage_times = dict(council.last_run_stage_times)
+                sessions = 1
+        finally:
+            wall_time = time.perf_counter() - start
+            for server in servers:
+                server.stop()
+
+    metrics = _server_metrics(servers, settings["response_tokens"])
+    return {
+        "scenario": name,
+        "sessions": sessions,
+        "wall_time": round(wall_time, 3),
+        "stage_times": {stage: round(seconds, 3) for stage, seconds in stage_times.items()},
+        **metrics,
+        "tokens_per_second": round(metrics["completion_tokens"] / wall_time, 1) if wall_time else 0.0,
+        "sessions_per_hour": round(sessions * 3600 / wall_time, 1) if wall_time else 0.0,
+    }
+
+
+def run_benchmarks(settings: Dict, scenarios: List[str], verbose: bool = False) -> Dict:
+    """Runs the chosen scenarios and returns a results document ready to save."""
+    results = []
+    for name in scenarios:
+        print(f"▶️  Running {name}...")
+        results.append(run_scenario(name, settings, verbose))
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "settings": settings,
+        "council_settings": dict(COUNCIL_SETTINGS),
+        "results": results,
+    }
+
+
+def print_results(document: Dict, baseline: Dict = None):
+    """Prints a results table, with % change in wall time against a baseline if given."""
+    previous = {result["scenario"]: result for result in (baseline or {}).get("results", [])}
+    council_settings = document.get("council_settings", {})
+    if council_settings:
+        print("\nCouncil settings: " + ", ".join(f"{name}={value}" for name, value in council_settings.items()))
+    if baseline and baseline.get("council_settings", council_settings) != council_settings:
+        print("⚠️  The baseline ran with different council settings: "
+              + ", ".join(f"{name}={value}" for name, value in baseline["council_settings"].items()))
+    print(f"\n{'Scenario':<12} {'Wall':>8} {'Stage 1':>8} {'Stage 2':>8} {'Stage 3':>8} "
+          f"{'Swaps':>6} {'Req':>5} {'Bytes/prompt':>13} {'Tok/s':>8} {'vs base':>8}")
+    for result in document["results"]:
+        stages = [result["stage_times"].get(f"stage_{n}", 0.0) for n in (1, 2, 3)]
+        change = ""
+        if result["scenario"] in previous and previous[result["scenario"]]["wall_time"]:
+            before = previous[result["scenario"]]["wall_time"]
+            change = f"{100 * (result['wall_time'] - before) / before:+.1f}%"
+        print(f"{result['scenario']:<12} {result['wall_time']:>7.2f}s "
+              + " ".join(f"{seconds:>7.2f}s" for seconds in stages)
+              + f" {result['model_swaps']:>6} {result['requests']:>5} {result['bytes_per_prompt_mean']:>13}"
+              f" {result['tokens_per_second']:>8.1f} {change:>8}")
+
+
+def save_results(document: Dict, results_dir: Path = RESULTS_DIR) -> Path:
+    results_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = results_dir / f"{stamp}_{document['commit']}.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the council against mock LLM servers")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds before output starts")
+    parser.add_argument("--tokens-per-second", type=float, default=2000.0)
+    parser.add_argument("--response-tokens", type=int, default=600)
+    parser.add_argument("--load-seconds", type=float, default=0.2, help="seconds to swap models")
+    parser.add_argument("--sessions", type=int, default=4, help="sessions in the batch scenario")
+    parser.add_argument("--stream", action="store_true", help="use streaming responses")
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    parser.add_argument("--verbose", action="store_true", help="show the council's console output")
+    args = parser.parse_args()
+
+    settings = {
+        "latency": args.latency,
+        "tokens_per_second": args.tokens_per_second,
+        "response_tokens": args.response_tokens,
+        "load_seconds": args.load_seconds,
+        "sessions": args.sessions,
+        "stream": args.stream,
+    }
+    document = run_benchmarks(settings, args.scenarios, args.verbose)
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+    print_results(document, baseline)
+    print(f"\n💾 Results saved to: {save_results(document)}")
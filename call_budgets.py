@@ -0,0 +1,201 @@
+"""
+Rugby Council AI - Adaptive Call Budgets
+
+Every call used to get the same 10-minute timeout and the same
+config.MAX_TOKENS, whatever the model or stage. Models run at very
+different speeds (6 tok/s for one, 15+ for another), so the timeout was
+far too generous for the fast models - a hung one held up the run for ten
+minutes - and reviews were allowed as many tokens as plans.
+
+The telemetry sidecars (see telemetry.py) already record every call's
+model, stage, wall time, output tokens and tokens/sec. From them, each
+(model, stage) pair gets a profile: its typical generation speed, its
+long-tail response length and wall time. Once a pair has
+config.ADAPTIVE_MIN_SAMPLES calls on record, its calls get:
+
+- max_tokens: the long-tail response length plus headroom, never more
+  than the stage's cap (config.STAGE_MAX_TOKENS, else config.MAX_TOKENS)
+- timeout: enough time to generate that many tokens at the model's usual
+  speed (or its slowest recorded call), with a safety factor
+- streaming stall and first-token limits scaled to the model's speed
+
+Pairs without enough history keep the fixed settings. Profiles keep
+learning from calls made while the process runs, so a long-running
+service adapts without a restart.
+"""
+
+import math
+import statistics
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import config
+import telemetry
+
+# Fixed limits, for calls with no history
+DEFAULT_TIMEOUT = 600
+
+# Never cut a call shorter than this, however fast the model usually is
+MIN_TIMEOUT = 60
+MIN_STALL_TIMEOUT = 15
+MIN_FIRST_TOKEN_TIMEOUT = 30
+
+# Budgets are rounded up to a multiple of this, so small changes in the
+# history don't change max_tokens (and with it the response cache key)
+TOKEN_STEP = 250
+
+
+@dataclass
+class Budget:
+    """Limits for one call."""
+    max_tokens: int
+    timeout: float
+    first_token_timeout: float
+    stall_timeout: float
+    learned: bool = False
+
+    def describe(self) -> str:
+        source = "learned" if self.learned else "default"
+        return f"max_tokens {self.max_tokens}, timeout {self.timeout:.0f}s ({source})"
+
+
+def token_cap(stage: str) -> int:
+    """The most tokens a call at this stage may have."""
+    return config.STAGE_MAX_TOKENS.get(stage, config.MAX_TOKENS)
+
+
+def default_budget(stage: str = "") -> Budget:
+    return Budget(token_cap(stage), DEFAULT_TIMEOUT, config.STREAM_FIRST_TOKEN_TIMEOUT, config.STREAM_STALL_TIMEOUT)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+@dataclass
+class CallProfile:
+    """What one model's calls at one stage usually look like."""
+    model: str
+    stage: str
+    samples: int
+    tokens_per_second: float
+    completion_tokens: int
+    wall_time: float
+    time_to_first_token: Optional[float] = None
+
+    @classmethod
+    def from_calls(cls, model: str, stage: str, calls: List[telemetry.CallMetrics]) -> Optional["CallProfile"]:
+        usable = [call for call in calls if call.tokens_per_second is not None]
+        if not usable:
+            return None
+        first_tokens = [call.time_to_first_token for call in usable if call.time_to_first_token is not None]
+        return cls(
+            model, stage, len(usable),
+            tokens_per_second=statistics.median(call.tokens_per_second for call in usable),
+            completion_tokens=int(_percentile([call.completion_tokens for call in usable], 0.9)),
+            wall_time=_percentile([call.wall_time for call in usable], 0.9),
+            time_to_first_token=_percentile(first_tokens, 0.9) if first_tokens else None,
+        )
+
+    def budget(self) -> Budget:
+        tokens = self.completion_tokens * config.ADAPTIVE_TOKEN_HEADROOM
+        max_tokens = min(token_cap(self.stage), max(TOKEN_STEP, math.ceil(tokens / TOKEN_STEP) * TOKEN_STEP))
+        # Long enough to write every allowed token at the usual speed, or to
+        # match the slowest recorded call, whichever is longer
+        expected = max(self.wall_time, (self.time_to_first_token or 0.0) + max_tokens / self.tokens_per_second)
+        timeout = min(DEFAULT_TIMEOUT, max(MIN_TIMEOUT, expected * config.ADAPTIVE_TIMEOUT_FACTOR))
+        # A healthy stream sends several tokens a second, so a gap worth
+        # ADAPTIVE_STALL_TOKENS tokens means it has stopped
+        stall = min(config.STREAM_STALL_TIMEOUT,
+                    max(MIN_STALL_TIMEOUT, config.ADAPTIVE_STALL_TOKENS / self.tokens_per_second))
+        first_token = config.STREAM_FIRST_TOKEN_TIMEOUT
+        if self.time_to_first_token is not None:
+            first_token = min(first_token, max(MIN_FIRST_TOKEN_TIMEOUT,
+                                               self.time_to_first_token * config.ADAPTIVE_TIMEOUT_FACTOR))
+        return Budget(max_tokens, round(timeout, 1), round(first_token, 1), round(stall, 1), learned=True)
+
+
+class CallBudgets:
+    """Call profiles learned from saved telemetry, and the budgets they give."""
+
+    def __init__(self, calls: Optional[List[telemetry.CallMetrics]] = None):
+        self._calls: Dict[Tuple[str, str], List[telemetry.CallMetrics]] = {}
+        self._profiles: Dict[Tuple[str, str], Optional[CallProfile]] = {}
+        self._lock = threading.Lock()
+        for call in calls or []:
+            self.observe(call)
+
+    @classmethod
+    def from_sessions(cls, sessions_dir: Path) -> "CallBudgets":
+        calls = []
+        for report in telemetry.load_sidecars(sessions_dir):
+            for call in report.get("calls", []):
+                try:
+                    calls.append(telemetry.CallMetrics.from_dict(call))
+                except (TypeError, AttributeError):
+                    # A call from an older or damaged sidecar; the rest still count
+                    continue
+        return cls(calls)
+
+    def observe(self, call: telemetry.CallMetrics):
+        """Adds a finished call to its model and stage's history."""
+        if call.cached or not call.stage or call.stage == "warm-up":
+            return
+        with self._lock:
+            history = self._calls.setdefault((call.model, call.stage), [])
+            history.append(call)
+            # Keep the profile to recent calls, so it follows model or hardware changes
+            del history[:-config.ADAPTIVE_HISTORY]
+            self._profiles.pop((call.model, call.stage), None)
+
+    def profile(self, model: str, stage: str) -> Optional[CallProfile]:
+        with self._lock:
+            key = (model, stage)
+            if key not in self._profiles:
+                self._profiles[key] = CallProfile.from_calls(model, stage, self._calls.get(key, []))
+            return self._profiles[key]
+
+    def budget(self, model: str, stage: str) -> Budget:
+        """Limits for a call, learned if the model and stage have enough history."""
+        profile = self.profile(model, stage) if config.ADAPTIVE_BUDGETS else None
+        if profile is None or profile.samples < config.ADAPTIVE_MIN_SAMPLES:
+            return default_budget(stage)
+        return profile.budget()
+
+    def profiles(self) -> List[CallProfile]:
+        found = [self.profile(model, stage) for model, stage in sorted(self._calls)]
+        return [profile for profile in found if profile]
+
+
+_budgets: Optional[CallBudgets] = None
+_budgets_dir: Optional[Path] = None
+_budgets_lock = threading.Lock()
+
+
+def get_budgets(sessions_dir: Path) -> CallBudgets:
+    """The shared budgets, learned from sessions_dir the first time they're needed."""
+    global _budgets, _budgets_dir
+    with _budgets_lock:
+        if _budgets is None or _budgets_dir != Path(sessions_dir):
+            _budgets = CallBudgets.from_sessions(sessions_dir)
+            _budgets_dir = Path(sessions_dir)
+        return _budgets
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show the call budgets learned from saved sessions")
+    parser.add_argument("sessions_dir", type=Path, nargs="?", default=Path(__file__).parent / "sessions")
+    args = parser.parse_args()
+
+    budgets = CallBudgets.from_sessions(args.sessions_dir)
+    print(f"\n{'Model':<28} {'Stage':<9} {'Calls':>5} {'Tok/s':>6} {'p90 tok':>8} {'max_tokens':>10} {'Timeout':>8}")
+    for profile in budgets.profiles():
+        budget = budgets.budget(profile.model, profile.stage)
+        print(f"{profile.model:<28} {profile.stage:<9} {profile.samples:>5} {profile.tokens_per_second:>6.1f} "
+              f"{profile.completion_tokens:>8} {budget.max_tokens:>10} {budget.timeout:>7.0f}s"
+              + ("" if budget.learned else "  (too few calls; defaults)"))
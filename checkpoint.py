@@ -0,0 +1,144 @@
+"""
+Rugby Council AI - Checkpointed Runs
+
+A council run is a long chain of slow model calls. If the chairman times out
+or the run is interrupted, everything from stages 1 and 2 used to be lost,
+because nothing was written until all three stages had finished.
+
+A RunCheckpoint saves every response the moment it arrives, to
+<run-id>.json in the checkpoints folder inside the sessions folder. `python council.py --resume <run-id>`
+loads it back, skips every call that already finished and carries on from
+the first missing one.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_SESSIONS_DIR = Path(__file__).parent / "sessions"
+
+# Set to keep checkpoints somewhere other than <sessions folder>/checkpoints
+CHECKPOINT_DIR: Optional[Path] = None
+
+
+def checkpoint_dir_for(sessions_dir: Path) -> Path:
+    """Where the checkpoints of runs saving to sessions_dir go (CHECKPOINT_DIR, if it is set)."""
+    return Path(CHECKPOINT_DIR) if CHECKPOINT_DIR else Path(sessions_dir) / "checkpoints"
+
+
+def _resolve(checkpoint_dir: Optional[Path]) -> Path:
+    return Path(checkpoint_dir) if checkpoint_dir else checkpoint_dir_for(DEFAULT_SESSIONS_DIR)
+
+
+class RunCheckpoint:
+    """Everything a council run has produced so far, saved after every response."""
+
+    def __init__(self, run_id: str, session_params: str, path: Path):
+        self.run_id = run_id
+        self.session_params = session_params
+        self.path = path
+        self.responses: Dict[str, str] = {}
+        self.reviews: Dict[str, str] = {}
+        self.final_plan: Optional[str] = None
+        # How the final plan was produced (see consensus.Decision.to_dict)
+        self.stage_3: Optional[Dict] = None
+        self.output_file: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(
+        cls,
+        session_params: str,
+        checkpoint_dir: Optional[Path] = None,
+        run_id: Optional[str] = None
+    ) -> "RunCheckpoint":
+        """Starts a new checkpoint, with a timestamped run id unless one is given."""
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        checkpoint = cls(run_id, session_params, _resolve(checkpoint_dir) / f"{run_id}.json")
+        checkpoint.save()
+        return checkpoint
+
+    @classmethod
+    def load(cls, run_id: str, checkpoint_dir: Optional[Path] = None) -> "RunCheckpoint":
+        """
+        Loads the checkpoint for an earlier run.
+
+        Raises:
+            FileNotFoundError: If there is no checkpoint with that run id
+        """
+        path = _resolve(checkpoint_dir) / f"{run_id}.json"
+        if not path.exists():
+            available = ", ".join(list_run_ids(checkpoint_dir)[-5:]) or "none"
+            raise FileNotFoundError(f"No checkpoint for run '{run_id}' (recent runs: {available})")
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        checkpoint = cls(data["run_id"], data["session_params"], path)
+        checkpoint.responses = data.get("responses", {})
+        checkpoint.reviews = data.get("reviews", {})
+        checkpoint.final_plan = data.get("final_plan")
+        checkpoint.stage_3 = data.get("stage_3")
+        checkpoint.output_file = data.get("output_file")
+        return checkpoint
+
+    def save(self):
+        # Write to a temporary file first so an interruption mid-write can't
+        # leave a half-written checkpoint behind
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "run_id": self.run_id,
+                    "session_params": self.session_params,
+                    "responses": self.responses,
+                    "reviews": self.reviews,
+                    "final_plan": self.final_plan,
+                    "stage_3": self.stage_3,
+                    "output_file": self.output_file,
+                }, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def record_plan(self, model_key: str, plan: str):
+        with self._lock:
+            self.responses[model_key] = plan
+        self.save()
+
+    def record_review(self, model_key: str, review: str):
+        with self._lock:
+            self.reviews[model_key] = review
+        self.save()
+
+    def record_final_plan(self, final_plan: str, stage_3: Optional[Dict] = None):
+        self.final_plan = final_plan
+        self.stage_3 = stage_3
+        self.save()
+
+    def record_output(self, output_file: Path):
+        self.output_file = str(output_file)
+        self.save()
+
+    @classmethod
+    def load_or_create(
+        cls,
+        run_id: str,
+        session_params: str,
+        checkpoint_dir: Optional[Path] = None
+    ) -> "RunCheckpoint":
+        """Loads the checkpoint for run_id if there is one, otherwise starts it."""
+        if (_resolve(checkpoint_dir) / f"{run_id}.json").exists():
+            return cls.load(run_id, checkpoint_dir)
+        return cls.create(session_params, checkpoint_dir, run_id=run_id)
+
+    def completed_calls(self) -> int:
+        return len(self.responses) + len(self.reviews) + (1 if self.final_plan is not None else 0)
+
+
+def list_run_ids(checkpoint_dir: Optional[Path] = None) -> List[str]:
+    """Run ids with a checkpoint on disk, oldest first."""
+    checkpoint_dir = _resolve(checkpoint_dir)
+    if not checkpoint_dir.exists():
+        return []
+    return sorted(path.stem for path in checkpoint_dir.glob("*.json"))
@@ -16,7 +16,8 @@ LM_STUDIO_BASE_URL = "http://localhost:1234/v1"
 # Council Model Configuration
 # These are the exact model names as they appear in LM Studio
 # IMPORTANT: You can only load one model at a time in LM Studio,
-# so the script will pause between each model to give you time to switch
+# so the script will pause between each model to give you time to switch.
+# Calls are ordered to keep the number of switches down (see scheduler.py)
 
 COUNCIL_MODELS = {
     "reasoning": {
@@ -36,6 +37,33 @@ COUNCIL_MODELS = {
     }
 }
 
+# Model Switching
+# "manual":   pause and ask you to load each model in LM Studio (the default)
+# "none":     don't pause - for servers that load the requested model on their
+#             own (LM Studio's just-in-time loading, or the benchmark mock server)
+# "lmstudio": load and unload models automatically through LM Studio's
+#             management API, so runs and batches can go unattended
+MODEL_SWITCH_MODE = "manual"
+
+# Management API used by "lmstudio" switching. None means the same server
+# as LM_STUDIO_BASE_URL (http://localhost:1234/api/v1)
+LM_STUDIO_API_URL = None
+MODEL_LOAD_TIMEOUT = 300  # Longest wait for a model to finish loading, in seconds
+MODEL_LOAD_POLL_INTERVAL = 1.0  # How often to check whether it's ready, in seconds
+MODEL_UNLOAD_OTHERS = True  # Unload other models first so they don't share the GPU
+
+# Backend Pool (optional)
+# If you have several machines, each running its own OpenAI-compatible server
+# with a different model already loaded, map council members to them here.
+# Calls within a stage then run in parallel and there are no model switches.
+# max_concurrency limits how many requests one server is given at once.
+# Members left out use LM_STUDIO_BASE_URL. Leave empty for a single LM Studio.
+MODEL_ENDPOINTS = {
+    # "reasoning": {"url": "http://192.168.1.20:1234/v1", "max_concurrency": 1},
+    # "instruct": {"url": "http://192.168.1.21:1234/v1", "max_concurrency": 1},
+    # "gpt": {"url": "http://192.168.1.22:1234/v1", "max_concurrency": 1},
+}
+
 # Chairman Configuration
 # This model synthesizes all the responses into a final session plan
 # The reasoning model is a good choice because it thinks through problems step-by-step
@@ -48,12 +76,191 @@ CHAIRMAN_MODEL = "reasoning"
 # For session design, we want some creativity but also consistency
 TEMPERATURE = 0.7
 
+# Per-stage temperatures, e.g. {"stage_2": 0.3} for steadier reviews.
+# Stages left out ("stage_1", "stage_2", "stage_3") use TEMPERATURE
+STAGE_TEMPERATURES = {}
+
 # Maximum tokens per response
 # This controls how long each model's response can be
 # For session plans, we want detailed responses so this is set high
+# (With ADAPTIVE_BUDGETS, calls get less once their usual length is known)
 MAX_TOKENS = 2000
 
+# Context Window
+# How many tokens the models can take in at once (prompt + response).
+# Plans and reviews in stages 2 and 3 are packed to fit what's left after the
+# instructions, framework and response allowance (see context_packer.py).
+# The safety margin covers the gap between our token estimate and the real tokenizer.
+CONTEXT_WINDOW = 16384
+CONTEXT_SAFETY_MARGIN = 512
+
+# Shared Prompt Prefix
+# Every prompt starts with the same system message (council role + framework)
+# so servers with prompt caching only process it once per model.
+# Set USE_SYSTEM_MESSAGE to False if a model's chat template rejects system
+# messages - the prefix then goes at the start of the user message instead.
+USE_SYSTEM_MESSAGE = True
+
+# Send each model the shared prefix on its own the first time it's used in a
+# run, so its first real call already starts from a warm cache
+PREFIX_WARMUP = False
+
+# HTTP Connection Settings
+# All calls share one keep-alive connection pool. Dropped connections and
+# busy-server responses (429, 5xx) are retried with a randomised, doubling
+# delay (1s, 2s, 4s... capped at HTTP_BACKOFF_MAX) so one hiccup costs a
+# retry rather than the whole run.
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_BASE = 1.0
+HTTP_BACKOFF_MAX = 30.0
+HTTP_POOL_SIZE = 10
+
+# Streaming
+# With streaming on, responses arrive token by token: you see live tokens/sec
+# and time-to-first-token, and a server that stops sending tokens is caught
+# quickly instead of after the full 10-minute request timeout.
+STREAM_RESPONSES = False
+
+# Seconds to wait for the first token (this includes prompt processing,
+# which can be slow for long prompts), then between tokens after that
+STREAM_FIRST_TOKEN_TIMEOUT = 180
+STREAM_STALL_TIMEOUT = 60
+
+# Response Cache
+# Identical calls (same model, prompt, temperature and max_tokens) are answered
+# from a cache on disk in .cache/responses/ instead of asking the model again.
+# Handy when iterating on one stage: the unchanged stages take milliseconds.
+# Set to False to always get fresh responses from the models.
+RESPONSE_CACHE_ENABLED = True
+
+# Maximum size of the response cache; least recently used entries go first
+RESPONSE_CACHE_MAX_MB = 200
+
 # Review stage settings
 # When models critique each other, should they see the model names?
 # Setting to False makes the review more objective
-ANONYMIZE_REVIEWS = True
\ No newline at end of file
+ANONYMIZE_REVIEWS = True
+
+# Early exit when the reviewers agree (see consensus.py)
+# If the reviews' rankings agree on one plan at least CONSENSUS_THRESHOLD
+# (0-1; 1.0 means every reviewer ranked it first), Stage 3 can be cut short:
+# "off":        always run the full chairman synthesis
+# "winner":     use the winning plan as the final plan
+# "light_edit": have the chairman apply the reviewers' improvements to the
+#               winning plan, a much shorter call than a full synthesis
+CONSENSUS_MODE = "off"
+CONSENSUS_THRESHOLD = 0.9
+
+
+# Structured plans (see structured.py)
+# Ask for Stage 1 and Stage 3 plans as JSON checked against a schema, using
+# the server's response_format support. Reviewers and the chairman then see
+# compact summaries of each plan, which cuts prompt tokens. Replies that
+# aren't valid plans are sent back for repair up to STRUCTURED_MAX_REPAIRS times.
+STRUCTURED_OUTPUT = False
+STRUCTURED_MAX_REPAIRS = 2
+
+
+# Stage 2 review format
+# "combined":    after every plan is written, each model reviews and ranks
+#                all of them in one long prompt
+# "incremental": with a backend pool (MODEL_ENDPOINTS), each plan is scored
+#                against a short rubric as soon as it arrives, then each
+#                model ranks the plans from the scorecards, so Stages 1 and 2
+#                overlap (see pipeline.py)
+STAGE_2_MODE = "combined"
+
+
+# Session archive (see archive.py)
+# Every saved session is added to a searchable SQLite archive in sessions/.
+# Set ARCHIVE_REFERENCE_PLANS to 1 or 2 to include the final plans of that
+# many similar past sessions in the Stage 1 prompt, each cut to
+# ARCHIVE_REFERENCE_TOKENS
+ARCHIVE_ENABLED = True
+ARCHIVE_REFERENCE_PLANS = 0
+ARCHIVE_REFERENCE_TOKENS = 800
+
+
+# Repeat requests (see request_matching.py)
+# Before a new run, the request is compared with archived runs. When one
+# matches at least REQUEST_MATCH_THRESHOLD (0-1), REQUEST_MATCH_ACTION says
+# what to do: "ask" (at the terminal; unattended runs don't reuse),
+# "reuse_result" (use the earlier session as it is), "reuse_plans" (reuse
+# its Stage 1 plans, rerun Stages 2 and 3) or "off"
+REQUEST_MATCH_ACTION = "off"
+REQUEST_MATCH_THRESHOLD = 0.8
+
+
+# Council service (see service.py)
+# python service.py listens on SERVICE_HOST:SERVICE_PORT. Once a job is
+# queued, the worker waits SERVICE_BATCH_WINDOW seconds for others to
+# arrive, then plans up to SERVICE_MAX_BATCH jobs together as one batch
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_BATCH_WINDOW = 5.0
+SERVICE_MAX_BATCH = 8
+SERVICE_POLL_INTERVAL = 0.5
+
+
+# Adaptive call budgets (see call_budgets.py)
+# Each model's timeouts and max_tokens at each stage are learned from the
+# telemetry of saved sessions, once it has ADAPTIVE_MIN_SAMPLES calls there
+# (of its last ADAPTIVE_HISTORY). max_tokens is its long-tail response length
+# times ADAPTIVE_TOKEN_HEADROOM, never more than MAX_TOKENS. The timeout
+# allows ADAPTIVE_TIMEOUT_FACTOR times the expected time, and a stream counts
+# as stalled after the time it would take to write ADAPTIVE_STALL_TOKENS tokens
+ADAPTIVE_BUDGETS = True
+ADAPTIVE_MIN_SAMPLES = 3
+ADAPTIVE_HISTORY = 50
+ADAPTIVE_TOKEN_HEADROOM = 1.5
+ADAPTIVE_TIMEOUT_FACTOR = 2.0
+ADAPTIVE_STALL_TOKENS = 100
+
+
+# Council profiles (see council_profiles.py)
+# Named sets of overrides for the settings above, as .py files defining a
+# PRESET dict or as .json files. Use one with python council.py --profile
+# NAME, a "profile" column in batch specs, or "profile" in a service job
+PROFILES_DIR = "examples/config-presets"
+
+
+# Review groups (see tournament.py)
+# With more council members than REVIEW_GROUP_SIZE, each member reviews a
+# group of that many plans rather than every plan, and the group rankings
+# are combined into one order. Review prompts then stay the same size
+# however large the council grows
+REVIEW_GROUP_SIZE = 3
+
+
+# Per-stage rosters and tiers
+# By default every council member writes a plan ("stage_1") and reviews
+# ("stage_2"), and CHAIRMAN_MODEL writes the final plan ("stage_3"). A stage
+# can have its own roster instead - e.g. small, fast quantized models for the
+# reviews, and a large model that only chairs:
+#   STAGE_ROSTERS = {"stage_1": ["reasoning", "instruct", "gpt"], "stage_2": ["small-1", "small-2"]}
+# and its own cap on response length, e.g. STAGE_MAX_TOKENS = {"stage_2": 800}
+# (temperatures per stage are in STAGE_TEMPERATURES).
+# A council member can have a "tier" (e.g. "small", "large") and a
+# "cost_per_1k_tokens" (in whatever unit you like: GPU-seconds, pence...);
+# each session records calls, latency, tokens and cost per stage and tier
+STAGE_ROSTERS = {}
+STAGE_MAX_TOKENS = {}
+
+
+# Plan checks (see plan_linter.py)
+# Every Stage 1 plan and final plan is checked against the session
+# parameters (activity times, players per coach, the five Coaching Habits,
+# required sections) and the results are saved with the session.
+# LINT_FIX says which failing plans are sent back for a short fix-up:
+# "final" (the Stage 3 plan), "all" (Stage 1 plans too) or "off"
+LINT_PLANS = True
+LINT_FIX = "final"
+
+
+# Framework digests (see framework_digest.py)
+# Each stage's prompts carry a version of the coaching framework suited to
+# it - the full framework for planning, a checklist for reviews, the key
+# principles for the chairman - instead of the whole framework every time.
+# Digests are cached in .cache/framework_digests/ and rebuilt when
+# coaching_framework.md changes. Set to False to send the full framework
+FRAMEWORK_DIGESTS = True
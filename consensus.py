@@ -0,0 +1,198 @@
+"""
+Rugby Council AI - Early-Exit Consensus
+
+Stage 3 always ran a full chairman synthesis, even when every reviewer had
+ranked the same plan first. On easy sessions that is the most expensive
+call of the run spent on merging plans that don't need merging.
+
+Each Stage 2 review ends with a **Rankings:** block. This module reads
+those rankings and combines them with a Borda count (for N plans, 1st place
+is worth N-1 points, 2nd N-2, and so on). Agreement is the winner's share of
+the points it could have had if every reviewer had ranked it first.
+
+When reviewers ranked different groups of plans (a review tournament, see
+tournament.py), points aren't comparable between plans, so plans are
+scored by Bradley-Terry strength instead, and agreement is the share of
+its comparisons the winner won.
+
+When agreement reaches config.CONSENSUS_THRESHOLD, config.CONSENSUS_MODE
+decides what happens:
+
+- "off":        always run the full synthesis (the default)
+- "winner":     use the winning plan as the final plan; no Stage 3 call
+- "light_edit": ask the chairman for a short edit of the winning plan using
+                the reviewers' suggested improvements, instead of a synthesis
+
+The saved session records which path was taken.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import tournament
+
+SYNTHESIS = "synthesis"
+WINNER = "winner"
+LIGHT_EDIT = "light_edit"
+
+# "1st: [Plan B] - reason", "2. Plan A", "3rd - **Plan C**"...
+_RANKING_LINE = re.compile(r"^\W*(\d+)(?:st|nd|rd|th)?\b.*?\bPlan\s+([A-Z]{1,2})\b", re.MULTILINE)
+
+
+def extract_section(text: str, heading: str) -> Optional[str]:
+    """
+    The text under a bold heading such as **Rankings:**, up to the next bold heading.
+
+    Returns:
+        The section's text, or None if the heading isn't there
+    """
+    match = re.search(rf"\*\*{re.escape(heading)}:?\*\*:?", text, re.IGNORECASE)
+    if not match:
+        return None
+    rest = text[match.end():]
+    following = re.search(r"^\s*\*\*[^*\n]+:?\*\*:?\s*$", rest, re.MULTILINE)
+    return (rest[:following.start()] if following else rest).strip()
+
+
+def parse_rankings(review: str, labels: List[str]) -> List[str]:
+    """
+    Reads a review's ranking, best first.
+
+    Only labels in `labels` count, and each plan is taken at its first
+    (highest) position. Returns an empty list if no ranking can be found.
+    """
+    block = extract_section(review, "Rankings")
+    if block is None:
+        return []
+    ranked = []
+    for _, letter in sorted(_RANKING_LINE.findall(block), key=lambda found: int(found[0])):
+        label = f"Plan {letter}"
+        if label in labels and label not in ranked:
+            ranked.append(label)
+    return ranked
+
+
+def borda_scores(rankings: List[List[str]], labels: List[str]) -> Dict[str, float]:
+    """Borda points per plan. Plans a reviewer left out of their ranking get nothing from them."""
+    scores = {label: 0.0 for label in labels}
+    top = len(labels) - 1
+    for ranking in rankings:
+        for position, label in enumerate(ranking):
+            scores[label] += top - position
+    return scores
+
+
+@dataclass
+class Consensus:
+    """How far the reviewers agree on the best plan."""
+    scores: Dict[str, float]
+    ballots: int
+    reviewers: int
+    winner: Optional[str]
+    agreement: float
+
+    def summary(self) -> str:
+        if self.winner is None:
+            return f"no clear winner ({self.ballots} of {self.reviewers} rankings read)"
+        return (f"{self.winner} leads with {self.agreement:.0%} agreement "
+                f"({self.ballots} of {self.reviewers} rankings read)")
+
+
+def build_consensus(reviews: Dict[str, str], labels: List[str], pairwise: bool = False) -> Consensus:
+    """
+    Combines every review's ranking into scores over the plan labels.
+
+    Args:
+        reviews: Review text per reviewer
+        labels: Every plan label
+        pairwise: Reviewers ranked different groups of plans; score by
+                  Bradley-Terry strength rather than a Borda count
+    """
+    rankings = [ranking for ranking in (parse_rankings(review, labels) for review in reviews.values()) if ranking]
+    if pairwise:
+        wins = tournament.pairwise_results(rankings)
+        scores = {label: round(strength, 3) for label, strength in tournament.bradley_terry(labels, wins).items()}
+    else:
+        scores = borda_scores(rankings, labels)
+    best = max(scores.values(), default=0.0)
+    leaders = [label for label, score in scores.items() if score == best]
+    winner = leaders[0] if len(leaders) == 1 and rankings and (pairwise or best > 0) else None
+    if winner and pairwise:
+        agreement = tournament.win_rate(winner, wins)
+    else:
+        possible = len(rankings) * (len(labels) - 1)
+        agreement = scores[winner] / possible if winner and possible else 0.0
+    return Consensus(
+        scores=scores,
+        ballots=len(rankings),
+        reviewers=len(reviews),
+        winner=winner,
+        agreement=agreement,
+    )
+
+
+@dataclass
+class Decision:
+    """Which Stage 3 path to take, and why."""
+    path: str
+    consensus: Optional[Consensus] = None
+    winner_key: Optional[str] = None
+
+    @property
+    def note(self) -> str:
+        """One line for the saved session."""
+        if self.path == WINNER:
+            return (f"Reviewers agreed on {self.consensus.winner} ({self.consensus.agreement:.0%}); "
+                    "it is the final plan, without a chairman synthesis")
+        if self.path == LIGHT_EDIT:
+            return (f"Reviewers agreed on {self.consensus.winner} ({self.consensus.agreement:.0%}); "
+                    "the chairman made a light edit instead of a full synthesis")
+        if self.consensus:
+            return f"Full chairman synthesis ({self.consensus.summary()})"
+        return "Full chairman synthesis"
+
+    def to_dict(self) -> Dict:
+        data = {"path": self.path, "note": self.note}
+        if self.consensus:
+            data.update(winner=self.consensus.winner, agreement=round(self.consensus.agreement, 3),
+                        scores=self.consensus.scores, ballots=self.consensus.ballots)
+        return data
+
+
+def decide(
+    reviews: Dict[str, str],
+    plan_labels: Dict[str, str],
+    mode: str,
+    threshold: float,
+    pairwise: bool = False
+) -> Decision:
+    """
+    Chooses the Stage 3 path.
+
+    Consensus needs every review's ranking to be readable, a single leader,
+    and agreement of at least threshold.
+
+    Args:
+        reviews: Review text per reviewer
+        plan_labels: Anonymous label ("Plan A"...) to the model key that wrote that plan
+        mode: config.CONSENSUS_MODE ("off", "winner" or "light_edit")
+        threshold: Agreement needed, from 0 to 1
+        pairwise: Reviewers ranked different groups of plans (see build_consensus)
+
+    Raises:
+        ValueError: If mode is unknown
+    """
+    if mode not in ("off", WINNER, LIGHT_EDIT):
+        raise ValueError(f"Unknown CONSENSUS_MODE: {mode!r} (expected off, winner or light_edit)")
+    if mode == "off":
+        return Decision(SYNTHESIS)
+    consensus = build_consensus(reviews, list(plan_labels), pairwise)
+    reached = (
+        consensus.winner is not None
+        and consensus.ballots == consensus.reviewers
+        and consensus.agreement >= threshold
+    )
+    if not reached:
+        return Decision(SYNTHESIS, consensus)
+    return Decision(mode, consensus, plan_labels[consensus.winner])
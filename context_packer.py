@@ -0,0 +1,205 @@
+"""
+Rugby Council AI - Token-Budget Context Packer
+
+Stages 2 and 3 have to fit several plans (and reviews) into one prompt. The
+old approach cut every plan at a fixed character count, keeping the first
+60% and last 20%. That ignored how much room the rest of the prompt already
+took, ignored the model's real context window, and cut through the middle of
+activities.
+
+The packer works in tokens instead:
+
+1. Count what the fixed part of the prompt (instructions + framework) costs
+2. Take that and the response allowance off the context window
+3. Share what's left between the plans/reviews - short ones keep everything,
+   and their unused share goes to the longer ones
+4. Trim anything over its share along markdown section boundaries, keeping
+   the sections that matter most (objectives, warm-up, activities, review)
+
+Token counts are estimates - we don't have each model's tokenizer - so the
+estimate errs on the high side and a safety margin is kept back.
+"""
+
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+import config
+
+# Word pieces, numbers and individual punctuation marks
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+# Markdown headings, or a line that is just bold text ("**Warm-up (10 mins):**")
+_SECTION_HEADING = re.compile(r"^(#{1,6}\s+.+|\*\*[^*\n]+\*\*:?\s*)$", re.MULTILINE)
+
+# Sections worth keeping first when a plan or review has to be cut.
+# Earlier patterns are more important.
+SECTION_PRIORITIES = [
+    r"ranking",
+    r"objective|purpose|aim",
+    r"warm[\s-]?up",
+    r"activit|drill|skill|game|progression|step",
+    r"review|cool[\s-]?down|reflect",
+    r"habit|coaching point",
+    r"improve|recommend|feedback",
+]
+
+OMITTED_MARKER = "[... {count} section(s) omitted to fit the context window ...]"
+
+# Allowance for the separator and label wrapped around each packed part
+PART_OVERHEAD_TOKENS = 20
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates how many tokens a piece of text will use.
+
+    Counts words in pieces of up to four letters (roughly how BPE
+    tokenizers split English) plus one token per number and punctuation mark.
+    """
+    tokens = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        tokens += math.ceil(len(piece) / 4) if piece[0].isalpha() else 1
+    return tokens
+
+
+def split_sections(text: str) -> List[str]:
+    """Splits markdown text into sections, each starting at a heading (the first may have none)."""
+    starts = [match.start() for match in _SECTION_HEADING.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    starts.append(len(text))
+    return [text[begin:end] for begin, end in zip(starts, starts[1:]) if text[begin:end].strip()]
+
+
+def _section_priority(section: str) -> int:
+    heading = section.strip().splitlines()[0].lower()
+    for rank, pattern in enumerate(SECTION_PRIORITIES):
+        if re.search(pattern, heading):
+            return rank
+    return len(SECTION_PRIORITIES)
+
+
+def _trim_to_tokens(text: str, max_tokens: int) -> str:
+    # Keep whole lines while they fit
+    kept = []
+    used = 0
+    for line in text.splitlines(keepends=True):
+        cost = estimate_tokens(line)
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    return "".join(kept).rstrip() + "\n[... section shortened ...]\n"
+
+
+def fit_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Trims text to roughly max_tokens along section boundaries.
+
+    Sections are kept in order of importance until the budget runs out;
+    the survivors are put back in their original order, with a note where
+    sections were dropped. The opening section is always kept (it usually
+    holds the title and objectives) and is cut line by line if even that
+    doesn't fit.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    sections = split_sections(text)
+    marker_cost = estimate_tokens(OMITTED_MARKER)
+    budget = max_tokens - marker_cost
+
+    order = sorted(range(len(sections)), key=lambda i: (i != 0, _section_priority(sections[i]), i))
+    keep = set()
+    used = 0
+    for index in order:
+        cost = estimate_tokens(sections[index])
+        if used + cost <= budget:
+            keep.add(index)
+            used += cost
+
+    if not keep:
+        return _trim_to_tokens(sections[0], budget)
+
+    result = []
+    omitted = 0
+    for index, section in enumerate(sections):
+        if index in keep:
+            if omitted:
+                result.append(f"\n{OMITTED_MARKER.format(count=omitted)}\n\n")
+                omitted = 0
+            result.append(section)
+        else:
+            omitted += 1
+    if omitted:
+        result.append(f"\n{OMITTED_MARKER.format(count=omitted)}\n")
+    return "".join(result)
+
+
+def allocate_budget(sizes: Dict[str, int], total: int) -> Dict[str, int]:
+    """
+    Shares a token budget fairly between parts.
+
+    Parts that need less than an equal share get exactly what they need;
+    whatever they don't use is shared between the rest.
+    """
+    allocation: Dict[str, int] = {}
+    remaining = dict(sizes)
+    budget = max(total, 0)
+    while remaining:
+        share = budget // len(remaining)
+        small = {name: size for name, size in remaining.items() if size <= share}
+        if not small:
+            for name in remaining:
+                allocation[name] = share
+            break
+        for name, size in small.items():
+            allocation[name] = size
+            budget -= size
+            del remaining[name]
+    return allocation
+
+
+def available_tokens(fixed_prompt: str, max_output_tokens: Optional[int] = None) -> int:
+    """Tokens left for packed content once the fixed prompt and the response are accounted for."""
+    output = max_output_tokens or config.MAX_TOKENS
+    return (config.CONTEXT_WINDOW - output - config.CONTEXT_SAFETY_MARGIN
+            - estimate_tokens(fixed_prompt))
+
+
+def pack_parts(
+    parts: Dict[str, str],
+    fixed_prompt: str,
+    label: str,
+    max_output_tokens: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Fits several plans/reviews into the context left by the rest of the prompt.
+
+    Args:
+        parts: Named texts to pack, e.g. {"Plan A": ..., "Plan B": ...}
+        fixed_prompt: The rest of the prompt (instructions, framework, etc.)
+        label: Name used in the printed token report, e.g. "Stage 2"
+        max_output_tokens: Tokens reserved for the response
+
+    Returns:
+        The same names mapped to texts that fit the budget, in the same order
+    """
+    sizes = {name: estimate_tokens(text) + PART_OVERHEAD_TOKENS for name, text in parts.items()}
+    budget = available_tokens(fixed_prompt, max_output_tokens)
+    allocation = allocate_budget(sizes, budget)
+
+    packed = {}
+    report: List[Tuple[str, int, int]] = []
+    for name, text in parts.items():
+        limit = allocation[name] - PART_OVERHEAD_TOKENS
+        packed[name] = text if sizes[name] <= allocation[name] else fit_to_budget(text, max(limit, 0))
+        report.append((name, estimate_tokens(packed[name]), sizes[name] - PART_OVERHEAD_TOKENS))
+
+    print(f"   {label} context: prompt + framework {estimate_tokens(fixed_prompt)} tokens, "
+          f"{max(budget, 0)} tokens available for {len(parts)} part(s)")
+    for name, used, original in report:
+        note = f" (cut from {original})" if used < original else ""
+        print(f"      {name}: {used} tokens{note}")
+    return packed
@@ -15,11 +15,42 @@ Date: December 2024
 
 import requests
 import json
+import sqlite3
 import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Tuple
+import archive
+import backends
+import call_budgets
+import checkpoint as checkpoints
+import council_profiles
 import config
+import consensus
+import context_packer
+import framework_digest
+import http_client
+import model_manager
+import pipeline
+import plan_linter
+import prompt_prefix
+import request_matching
+import response_cache
+import scheduler
+import streaming
+import structured
+import telemetry
+import tournament
+
+# The model we last loaded (or asked the user to load). Lets us skip the
+# switch when consecutive calls use the same model (see scheduler.py)
+_loaded_model: Optional[str] = None
+
+# Where finished council sessions are saved
+SESSIONS_DIR = Path(__file__).parent / "sessions"
+
+# Wall time of each stage in the most recent run_council(), in seconds
+last_run_stage_times: Dict[str, float] = {}
 
 # Load the Trojans Coaching Framework
 # This reads your framework file so models have the context they need
@@ -39,7 +70,20 @@ def load_coaching_framework() -> str:
         return f.read()
 
 
-def call_lm_studio(prompt: str, model_name: str, temperature: float = 0.7) -> str:
+def call_lm_studio(
+    prompt: str,
+    model_name: str,
+    temperature: float = 0.7,
+    base_url: Optional[str] = None,
+    stream: Optional[bool] = None,
+    max_tokens: Optional[int] = None,
+    use_cache: bool = True,
+    system: Optional[str] = None,
+    stage: str = "",
+    session_id: str = "",
+    response_format: Optional[Dict] = None,
+    record_prompt_time: bool = True
+) -> str:
     """
     Makes an API call to LM Studio to get a response from a model.
     
@@ -51,53 +95,157 @@ def call_lm_studio(prompt: str, model_name: str, temperature: float = 0.7) -> st
         prompt: The question or instruction to send to the model
         model_name: Which model to use (must match name in LM Studio)
         temperature: How creative vs focused (0.0 = focused, 1.0 = creative)
+        base_url: Server to send the request to (defaults to LM_STUDIO_BASE_URL)
+        stream: Read the response token by token with live progress and stall
+                detection (defaults to config.STREAM_RESPONSES)
+        max_tokens: Maximum length of the response (defaults to what this model
+                    and stage usually need, up to config.MAX_TOKENS; see
+                    call_budgets.py)
+        use_cache: Set False to always ask the model, even if an identical
+                   call has been answered before
+        system: Stable text to send ahead of the prompt (the shared prefix),
+                so servers with prompt caching can reuse it between calls
+        stage: Which stage the call belongs to, for telemetry (e.g. "stage_1")
+        session_id: Which batch session the call belongs to, for telemetry
+        response_format: Constrains the reply's format, e.g. to a JSON schema
+                         (see structured.py)
+        record_prompt_time: Set False if the caller records the prompt
+                            processing time itself (see warm_prefix)
     
     Returns:
         The model's response as a string
     """
+    start = time.perf_counter()
+    base_url = base_url or config.LM_STUDIO_BASE_URL
+    stream = config.STREAM_RESPONSES if stream is None else stream
+    # Timeouts and max_tokens come from this model's recorded speed at this stage
+    budgets = call_budgets.get_budgets(SESSIONS_DIR)
+    budget = budgets.budget(model_name, stage)
+    max_tokens = max_tokens or budget.max_tokens
     
     # Prepare the request payload
     # This is the data we're sending to LM Studio
     # It follows the OpenAI API format, which LM Studio understands
+    messages = [
+        {
+            "role": "user",  # We're the user asking a question
+            "content": prompt  # This is what we're asking
+        }
+    ]
+    if system and config.USE_SYSTEM_MESSAGE:
+        messages.insert(0, {"role": "system", "content": system})
+    elif system:
+        # Some chat templates reject system messages; putting the prefix at
+        # the start of the user message keeps it just as cacheable
+        messages[0]["content"] = f"{system}\n\n{prompt}"
+    
     payload = {
         "model": model_name,  # Which model to use
-        "messages": [
-            {
-                "role": "user",  # We're the user asking a question
-                "content": prompt  # This is what we're asking
-            }
-        ],
+        "messages": messages,
         "temperature": temperature,  # Controls randomness
-        "max_tokens": config.MAX_TOKENS,  # Maximum length of response
-        "stream": False  # We want the complete response, not streaming
+        "max_tokens": max_tokens,  # Maximum length of response
+        "stream": stream  # Complete response in one go, or token by token
     }
+    if response_format:
+        payload["response_format"] = response_format
+    if stream:
+        # Ask for token counts in the final chunk, for telemetry
+        payload["stream_options"] = {"include_usage": True}
+    
+    # If we've answered exactly this call before, reuse the answer
+    cache = response_cache.get_cache() if use_cache else None
+    if cache:
+        cache_key = cache.make_key(model_name, payload["messages"], temperature, max_tokens)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"   💾 {model_name}: cached response reused")
+            telemetry.recorder.record_call(telemetry.CallMetrics(
+                stage, model_name, time.perf_counter() - start, cached=True, session_id=session_id
+            ))
+            return cached
+    
+    # When streaming, the read timeout only has to cover the gap between
+    # chunks, so a stalled server is caught long before the whole-call timeout.
+    # It starts at the first-token limit (prompt processing can be slow);
+    # consume_stream cuts it to the stall limit once tokens are flowing
+    if stream:
+        timeout = (10, budget.first_token_timeout)
+    else:
+        timeout = budget.timeout
     
     try:
         # Send the request to LM Studio
         # This is like knocking on LM Studio's door and handing over the question
-        response = requests.post(
-            f"{config.LM_STUDIO_BASE_URL}/chat/completions",
+        # The shared client keeps connections open and retries dropped
+        # connections and busy-server responses before giving up
+        response = http_client.get_client().post(
+            f"{base_url}/chat/completions",
             json=payload,
-            timeout=600  # Wait up to 10 minutes for a response
+            timeout=timeout,
+            stream=stream
         )
         
         # Check if the request was successful
         response.raise_for_status()
         
-        # Extract the actual text response from the JSON reply
-        # LM Studio wraps the response in a specific format
-        result = response.json()
-        return result['choices'][0]['message']['content']
+        if stream:
+            # Progress lines from several threads would overwrite each
+            # other, so only show them when calls run one at a time
+            text, stats = streaming.consume_stream(
+                response,
+                stall_timeout=budget.stall_timeout,
+                first_token_timeout=budget.first_token_timeout,
+                show_progress=backends.get_pool() is None
+            )
+            print(f"   ⚡ {model_name}: {stats.summary()}")
+            prompt_time = stats.time_to_first_token
+            usage = {"prompt_tokens": stats.prompt_tokens, "completion_tokens": stats.tokens}
+        else:
+            # Extract the actual text response from the JSON reply
+            # LM Studio wraps the response in a specific format
+            result = response.json()
+            text = result['choices'][0]['message']['content']
+            prompt_time = prompt_prefix.extract_prompt_time(result)
+            usage = result.get('usage') or {}
+        
+        if prompt_time is not None and record_prompt_time:
+            prompt_prefix.timings.record(model_name, "call", prompt_time)
+        
+        http_record = http_client.get_client().last_record()
+        metrics = telemetry.CallMetrics(
+            stage,
+            model_name,
+            time.perf_counter() - start,
+            prompt_tokens=usage.get('prompt_tokens'),
+            completion_tokens=usage.get('completion_tokens'),
+            time_to_first_token=stats.time_to_first_token if stream else None,
+            retries=http_record.retries if http_record else 0,
+            session_id=session_id
+        )
+        telemetry.recorder.record_call(metrics)
+        budgets.observe(metrics)
+        
+        if cache:
+            cache.put(cache_key, text, model_name)
+        return text
         
     except requests.exceptions.ConnectionError:
         print("\n❌ Error: Cannot connect to LM Studio")
         print("   Make sure LM Studio is running and the server is started")
-        print(f"   Expected URL: {config.LM_STUDIO_BASE_URL}")
+        print(f"   Expected URL: {base_url}")
+        raise
+        
+    except streaming.StreamStalledError as e:
+        print(f"\n❌ Error: {model_name} stalled - {e}")
+        print("   The server may have hung; check LM Studio's server log")
         raise
         
     except requests.exceptions.Timeout:
         print("\n❌ Error: Request timed out")
-        print("   The model took too long to respond (>5 minutes)")
+        if stream:
+            print(f"   {model_name} sent nothing for {timeout[1]:.0f} seconds")
+        else:
+            print(f"   {model_name} took longer than {timeout:.0f} seconds ({budget.describe()})")
         raise
         
     except Exception as e:
@@ -112,6 +260,9 @@ def wait_for_model_switch(model_name: str):
     Since LM Studio can only run one model at a time, you need to manually
     switch between models during the Council process. This function makes
     that clear and gives you time to do it.
+    
+    Used when config.MODEL_SWITCH_MODE is "manual"; set it to "lmstudio" to
+    have models loaded automatically instead (see model_manager.py).
     """
     print(f"\n{'='*70}")
     print(f"⏸️  PLEASE LOAD MODEL IN LM STUDIO:")
@@ -126,33 +277,232 @@ def wait_for_model_switch(model_name: str):
     input("\nPress Enter when ready...")
 
 
-def stage_1_individual_responses(session_params: str, framework: str) -> Dict[str, str]:
+def ensure_model_loaded(model_name: str):
     """
-    STAGE 1: Get individual session plans from each model.
+    Makes sure the given model is loaded, only pausing for a switch when it isn't.
     
-    Each model works independently, like asking three coaches to each
-    design a session without seeing what the others are doing.
+    The scheduler orders calls so the same model runs back to back where it can;
+    this is what turns that ordering into fewer actual model loads.
+    """
+    global _loaded_model
+    if model_name == _loaded_model:
+        print(f"   (reusing {model_name} - already loaded)")
+        return
+    manager = get_model_manager()
+    seconds = manager.ensure_loaded(model_name)
+    telemetry.recorder.record_load(model_name, seconds, manager.mode)
+    if config.MODEL_SWITCH_MODE != "none":
+        print(f"   ✅ {model_name} ready ({seconds:.1f}s to load)")
+    _loaded_model = model_name
+
+
+def get_model_manager() -> model_manager.ModelManager:
+    """The model manager for config.MODEL_SWITCH_MODE; "manual" uses wait_for_model_switch."""
+    return model_manager.get_manager(manual_prompt=lambda model_name: wait_for_model_switch(model_name))
+
+
+def warm_prefix(model_name: str, prefix: str, base_url: Optional[str] = None):
+    """
+    Sends a model the shared prefix on its own, once per run.
     
-    Args:
-        session_params: The session requirements (e.g., "60 mins, U10s, 24 players...")
-        framework: The Trojans Coaching Framework text
+    The reply is a single token; the point is that the server processes and
+    caches the prefix, so the model's real calls only pay for their own text.
+    """
+    def send():
+        start = time.perf_counter()
+        call_lm_studio("Reply with OK.", model_name, 0.0, base_url=base_url, stream=False,
+                       max_tokens=1, use_cache=False, system=prefix, stage="warm-up",
+                       record_prompt_time=False)
+        prompt_prefix.timings.record(model_name, "warm-up", time.perf_counter() - start)
     
-    Returns:
-        Dictionary mapping model names to their responses
+    if prompt_prefix.warmer.warm(model_name, prefix, send):
+        print(f"   🔥 Warmed {model_name} on the shared prefix")
+
+
+def call_council_model(
+    prompt: str,
+    model_key: str,
+    prefix: str,
+    base_url: Optional[str] = None,
+    stage: str = "",
+    session_id: str = "",
+    response_format: Optional[Dict] = None
+) -> str:
     """
-    print("\n" + "="*70)
-    print("STAGE 1: INDIVIDUAL SESSION PLANS")
-    print("="*70)
-    print("\nAsking each model to independently design a session...")
+    Asks one council member, with the shared prefix ahead of the prompt.
     
-    responses = {}
+    With config.PREFIX_WARMUP on, the model is first warmed on the prefix
+    (only the first time it's used in a run). stage and session_id tag the
+    call's telemetry, and pick its temperature (config.STAGE_TEMPERATURES).
+    """
+    model_name = config.COUNCIL_MODELS[model_key]['name']
+    if config.PREFIX_WARMUP:
+        warm_prefix(model_name, prefix, base_url)
+    temperature = config.STAGE_TEMPERATURES.get(stage, config.TEMPERATURE)
+    return call_lm_studio(prompt, model_name, temperature, base_url=base_url, system=prefix,
+                          stage=stage, session_id=session_id, response_format=response_format)
+
+
+def _request_plan(prompt: str, model_key: str, prefix: str, base_url: Optional[str], stage: str,
+                  session_id: str) -> str:
+    if not config.STRUCTURED_OUTPUT:
+        return call_council_model(prompt, model_key, prefix, base_url=base_url, stage=stage, session_id=session_id)
     
-    # Create the prompt that all models will receive
-    # This ensures they all have the same information to work with
-    prompt = f"""You are an experienced rugby coach working with Trojans RFC.
+    def ask(text: str) -> str:
+        return call_council_model(text, model_key, prefix, base_url=base_url, stage=stage,
+                                  session_id=session_id, response_format=structured.response_format())
+    
+    _, text = structured.request_plan(ask, prompt, config.STRUCTURED_MAX_REPAIRS)
+    return text
+
+
+def ask_for_plan(
+    prompt: str,
+    model_key: str,
+    prefix: str,
+    base_url: Optional[str] = None,
+    stage: str = "",
+    session_id: str = "",
+    session_params: Optional[str] = None
+) -> str:
+    """
+    Asks a council member for a session plan (Stage 1 or Stage 3).
+    
+    With config.STRUCTURED_OUTPUT on, the plan is requested as JSON, checked
+    against the schema and sent back for repair if it isn't valid (see
+    structured.py). The JSON text is returned, or the last reply if it never
+    became valid.
+    
+    Given session_params, plans from the stages in config.LINT_FIX are
+    checked (see plan_linter.py) and a plan with errors gets one short
+    fix-up request. The fixed plan is kept only if it has fewer errors.
+    """
+    text = _request_plan(prompt, model_key, prefix, base_url, stage, session_id)
+    if session_params is None or not plan_linter.fixes_stage(stage):
+        return text
+    
+    report = plan_linter.lint_plan(text, session_params)
+    if report.ok:
+        return text
+    print(f"   🩺 Plan check: {report.summary()} - asking {model_key} to fix it")
+    fix_prompt = plan_linter.build_fix_prompt(text, report, session_params)
+    if config.STRUCTURED_OUTPUT:
+        fix_prompt += "\n\n" + structured.JSON_INSTRUCTIONS
+    fixed = _request_plan(fix_prompt, model_key, prefix, base_url, f"{stage}_fix", session_id)
+    
+    # A fix that breaks a valid structured plan, or doesn't help, is thrown away
+    still_structured = structured.try_parse(fixed) is not None or structured.try_parse(text) is None
+    if still_structured and len(plan_linter.lint_plan(fixed, session_params).errors) < len(report.errors):
+        print("   ✅ Plan fixed")
+        return fixed
+    print("   ⚠️  The fix didn't help; keeping the original plan")
+    return text
+
+
+def _pooled_call(
+    prompt: str,
+    model_key: str,
+    prefix: str,
+    on_result: Optional[Callable[[str, str], None]] = None,
+    stage: str = "",
+    as_plan: bool = False,
+    session_params: Optional[str] = None
+):
+    # A call the backend pool can run once it knows which server to use.
+    # on_result is called as soon as this call finishes, not when the whole
+    # stage does, so checkpoints don't wait for the slowest model
+    def call(base_url: str) -> str:
+        if as_plan:
+            result = ask_for_plan(prompt, model_key, prefix, base_url=base_url, stage=stage,
+                                  session_params=session_params)
+        else:
+            result = call_council_model(prompt, model_key, prefix, base_url=base_url, stage=stage)
+        if on_result:
+            on_result(model_key, result)
+        return result
+    
+    return call
+
+
+def loaded_model_key() -> Optional[str]:
+    """The council member whose model is currently loaded, if we know it."""
+    return next(
+        (key for key, info in config.COUNCIL_MODELS.items() if info['name'] == _loaded_model), None
+    )
+
+
+def stage_roster(stage: str) -> List[str]:
+    """
+    The council members who work at a stage ("stage_1" plans, "stage_2" reviews), in config order.
+    
+    Everyone, unless config.STAGE_ROSTERS gives the stage its own roster.
+    
+    Raises:
+        ValueError: If the roster names someone who isn't in config.COUNCIL_MODELS
+    """
+    roster = config.STAGE_ROSTERS.get(stage)
+    if not roster:
+        return list(config.COUNCIL_MODELS)
+    unknown = [key for key in roster if key not in config.COUNCIL_MODELS]
+    if unknown:
+        raise ValueError(f"STAGE_ROSTERS[{stage!r}] names {', '.join(unknown)}, not in COUNCIL_MODELS")
+    return [key for key in config.COUNCIL_MODELS if key in roster]
+
+
+def in_config_order(results: Dict[str, str]) -> Dict[str, str]:
+    # Calls may run in scheduled order, but outputs (plan labels, saved
+    # sessions) should stay in the order the council is configured in
+    return {key: results[key] for key in config.COUNCIL_MODELS if key in results}
+
+
+def get_archive() -> archive.SessionArchive:
+    """The session archive, kept alongside the saved sessions."""
+    return archive.SessionArchive(SESSIONS_DIR / "archive.db")
+
+
+def archive_session(output_file: Path):
+    """Adds a saved session to the archive; a problem here never fails the run."""
+    if not config.ARCHIVE_ENABLED:
+        return
+    try:
+        get_archive().add_session_file(output_file)
+    except (sqlite3.Error, ValueError) as e:
+        print(f"   ⚠️  Couldn't add the session to the archive: {e}")
+
+
+def reference_plans_for(session_params: str) -> str:
+    """
+    Final plans from the most similar archived sessions, for the Stage 1 prompt.
+    
+    Returns an empty string unless config.ARCHIVE_REFERENCE_PLANS is set and
+    the archive has a match. Each plan is cut to ARCHIVE_REFERENCE_TOKENS.
+    """
+    if not config.ARCHIVE_ENABLED or not config.ARCHIVE_REFERENCE_PLANS:
+        return ""
+    try:
+        matches = get_archive().similar_sessions(session_params, config.ARCHIVE_REFERENCE_PLANS)
+    except sqlite3.Error as e:
+        print(f"   ⚠️  Couldn't search the archive: {e}")
+        return ""
+    for match in matches:
+        print(f"   📚 Reference plan: {match.session_params} ({match.session_file})")
+        match.final_plan = context_packer.fit_to_budget(
+            structured.to_markdown(match.final_plan), config.ARCHIVE_REFERENCE_TOKENS
+        )
+    return archive.format_reference_plans(matches)
 
-COACHING FRAMEWORK:
-{framework}
+
+def build_plan_prompt(session_params: str, reference_plans: str = "") -> str:
+    """
+    Builds the Stage 1 prompt asking a model to design a session.
+    
+    Like the other build_*_prompt functions this is only the variable part
+    of the prompt; the framework goes in the shared prefix (see prompt_prefix.py).
+    With config.STRUCTURED_OUTPUT on, it asks for the plan as JSON.
+    reference_plans (see reference_plans_for) are past final plans for
+    similar sessions, offered as a starting point.
+    """
+    prompt = f"""You are an experienced rugby coach working with Trojans RFC.
 
 SESSION PARAMETERS:
 {session_params}
@@ -173,30 +523,103 @@ Please provide a detailed session plan including:
 - How the five coaching habits are integrated
 
 Be specific and practical - this should be a plan a coach can actually use."""
+    if reference_plans:
+        prompt += f"""
+
+PROVEN PLANS FROM SIMILAR PAST SESSIONS:
+Use these as a starting point - keep what worked, adapt them to these
+session parameters, and don't copy them unchanged.
+
+{reference_plans}"""
+    if config.STRUCTURED_OUTPUT:
+        prompt += "\n\n" + structured.JSON_INSTRUCTIONS
+    return prompt
 
+
+def stage_1_individual_responses(
+    session_params: str,
+    framework: str,
+    model_order: Optional[List[str]] = None,
+    checkpoint: Optional[checkpoints.RunCheckpoint] = None
+) -> Dict[str, str]:
+    """
+    STAGE 1: Get individual session plans from each model.
+    
+    Each model works independently, like asking three coaches to each
+    design a session without seeing what the others are doing.
+    
+    Args:
+        session_params: The session requirements (e.g., "60 mins, U10s, 24 players...")
+        framework: The Trojans Coaching Framework text
+        model_order: Order to call the models in (defaults to config order)
+        checkpoint: Saves each plan as it arrives; plans it already holds are
+                    reused instead of asking the model again
+    
+    Returns:
+        Dictionary mapping model names to their responses
+    """
+    print("\n" + "="*70)
+    print("STAGE 1: INDIVIDUAL SESSION PLANS")
+    print("="*70)
+    print("\nAsking each model to independently design a session...")
+    
+    responses = dict(checkpoint.responses) if checkpoint else {}
+    record = checkpoint.record_plan if checkpoint else None
+    
+    # Create the prompt that all models will receive
+    # This ensures they all have the same information to work with
+    prompt = build_plan_prompt(session_params, reference_plans_for(session_params))
+    prefix = prompt_prefix.build_stage_prefix(framework, "stage_1")
+    
+    model_order = [key for key in model_order or stage_roster("stage_1") if key not in responses]
+    if responses:
+        print(f"   Reusing {len(responses)} plan(s) saved in the checkpoint")
+    
+    # With a backend pool every model has its own server, so the plans
+    # can all be written at the same time
+    pool = backends.get_pool()
+    if pool and model_order:
+        print(f"\n📝 Requesting plans from {len(model_order)} models in parallel...")
+        new_responses = pool.run({
+            model_key: _pooled_call(prompt, model_key, prefix, record, stage="stage_1", as_plan=True,
+                                    session_params=session_params)
+            for model_key in model_order
+        })
+        for model_key, response in new_responses.items():
+            print(f"✅ Received plan from {model_key} ({len(response)} characters)")
+        responses.update(new_responses)
+        return in_config_order(responses)
+    
     # Loop through each model and get their response
-    for model_key, model_info in config.COUNCIL_MODELS.items():
+    for model_key in model_order:
+        model_info = config.COUNCIL_MODELS[model_key]
         print(f"\n📝 Requesting plan from {model_info['role']} ({model_key})...")
         
-        # Pause for model switching
-        wait_for_model_switch(model_info['name'])
+        # Pause for model switching (skipped if it's already loaded)
+        ensure_model_loaded(model_info['name'])
         
         # Get the response
-        response = call_lm_studio(prompt, model_info['name'], config.TEMPERATURE)
+        response = ask_for_plan(prompt, model_key, prefix, stage="stage_1", session_params=session_params)
         responses[model_key] = response
+        if record:
+            record(model_key, response)
         
         # Show a preview of the response
         preview = response[:200] + "..." if len(response) > 200 else response
         print(f"✅ Received plan ({len(response)} characters)")
         print(f"   Preview: {preview}")
     
-    return responses
+    return in_config_order(responses)
 
 
 def truncate_plan_for_review(plan: str, max_chars: int = 3000) -> str:
     """
     Intelligently truncates a session plan for review to stay within context limits.
     
+    The stages now use context_packer, which budgets in tokens and cuts along
+    section boundaries; this simpler character-based cut is kept for callers
+    that just need a quick fixed-size preview.
+    
     This keeps the beginning (objectives, structure) and end (coaching points, summary)
     while noting that middle sections are abbreviated.
     
@@ -224,55 +647,26 @@ def truncate_plan_for_review(plan: str, max_chars: int = 3000) -> str:
     return truncated
 
 
-def stage_2_peer_review(responses: Dict[str, str], framework: str) -> Dict[str, str]:
-    """
-    STAGE 2: Each model reviews all the plans (including their own).
-    
-    The plans are anonymized so models can't play favorites.
-    Each model ranks the plans and provides constructive feedback.
-    
-    NOTE: Session plans are truncated to fit within context window limits.
-    This preserves the key structural elements while reducing overall size.
-    
-    Args:
-        responses: Dictionary of model responses from Stage 1
-        framework: The Trojans Coaching Framework text
-    
-    Returns:
-        Dictionary mapping model names to their review responses
-    """
-    print("\n" + "="*70)
-    print("STAGE 2: PEER REVIEW")
-    print("="*70)
-    print("\nEach model will now review all three plans...")
-    print("(Plans are truncated to fit context limits while preserving key info)")
-    
-    reviews = {}
-    
-    # Create anonymized versions of the plans for review
-    # This removes bias by hiding which model created which plan
-    plan_labels = ['Plan A', 'Plan B', 'Plan C']
-    model_keys = list(responses.keys())
-    
-    # Build the plans section for the review prompt
-    # Truncate each plan to avoid context window issues
-    plans_text = ""
-    for label, model_key in zip(plan_labels, model_keys):
-        truncated_plan = truncate_plan_for_review(responses[model_key], max_chars=3000)
-        plans_text += f"\n{'='*70}\n"
-        plans_text += f"{label}:\n\n{truncated_plan}\n"
-        
-        # Show truncation info
-        original_length = len(responses[model_key])
-        truncated_length = len(truncated_plan)
-        if original_length > truncated_length:
-            print(f"   {label}: truncated from {original_length} to {truncated_length} chars")
-    
-    # Create the review prompt
-    review_prompt = f"""You are reviewing three different rugby session plans for Trojans RFC.
+def _join_parts(parts: Dict[str, str]) -> str:
+    # Lays out labelled plans/reviews one after another for a prompt
+    text = ""
+    for label, part in parts.items():
+        text += f"\n{'='*70}\n"
+        text += f"{label}:\n\n{part}\n"
+    return text
+
+
+def _count_words(count: int) -> str:
+    # "three plans" reads better than "3 plans" in a prompt
+    words = {2: "two", 3: "three", 4: "four", 5: "five", 6: "six", 7: "seven", 8: "eight"}
+    return words.get(count, str(count))
 
-COACHING FRAMEWORK:
-{framework}
+
+def build_review_prompt(plans_text: str, plan_count: int = 3) -> str:
+    """Builds the Stage 2 prompt asking a model to review and rank plan_count plans."""
+    places = [tournament.ordinal(position) for position in range(1, plan_count + 1)]
+    ranking_lines = "\n".join(f"{place}: [Plan X] - [brief reason]" for place in places)
+    return f"""You are reviewing {_count_words(plan_count)} different rugby session plans for Trojans RFC.
 
 SESSION PLANS TO REVIEW:
 {plans_text}
@@ -280,7 +674,7 @@ SESSION PLANS TO REVIEW:
 Your task is to:
 1. Evaluate each plan against the Trojans Coaching Framework
 2. Identify strengths and weaknesses in each plan
-3. Rank the plans from best to worst (1st, 2nd, 3rd)
+3. Rank the plans from best to worst ({", ".join(places)})
 4. Provide specific constructive feedback
 
 Consider:
@@ -292,9 +686,7 @@ Consider:
 
 Provide your review in this format:
 **Rankings:**
-1st: [Plan X] - [brief reason]
-2nd: [Plan Y] - [brief reason]
-3rd: [Plan Z] - [brief reason]
+{ranking_lines}
 
 **Detailed Feedback:**
 [Your detailed analysis of strengths and weaknesses of each plan]
@@ -302,18 +694,278 @@ Provide your review in this format:
 **Recommended Improvements:**
 [Specific suggestions for how to improve the plans]"""
 
+
+def plan_labels(responses: Dict[str, str]) -> Dict[str, str]:
+    """The anonymous label each plan is reviewed under ("Plan A"...), mapped to its model key."""
+    return {tournament.label(index): model_key for index, model_key in enumerate(responses)}
+
+
+def review_groups(responses: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    The plan labels each council member reviews.
+    
+    Everyone reviews every plan, unless there are more plans than
+    config.REVIEW_GROUP_SIZE (see tournament.py).
+    """
+    return tournament.review_groups(list(plan_labels(responses)), stage_roster("stage_2"),
+                                    config.REVIEW_GROUP_SIZE)
+
+
+def prepare_review_prompt(responses: Dict[str, str], framework: str, labels: Optional[List[str]] = None) -> str:
+    """
+    Builds the Stage 2 prompt for a set of plans, anonymized and packed to fit.
+    
+    labels limits the prompt to those plans (a reviewer's group, see
+    review_groups); by default it holds every plan.
+    """
+    # Create anonymized versions of the plans for review
+    # This removes bias by hiding which model created which plan
+    # Structured plans are reviewed as compact summaries rather than in full
+    labelled_plans = {
+        label: structured.for_review(responses[key]) for label, key in plan_labels(responses).items()
+        if labels is None or label in labels
+    }
+    
+    # Fit the plans into whatever context is left once the rest of the
+    # prompt is counted, cutting along section boundaries if they don't fit
+    packed_plans = context_packer.pack_parts(
+        labelled_plans,
+        prompt_prefix.build_stage_prefix(framework, "stage_2") + build_review_prompt("", len(labelled_plans)),
+        label="Stage 2",
+        max_output_tokens=call_budgets.token_cap("stage_2")
+    )
+    return build_review_prompt(_join_parts(packed_plans), len(labelled_plans))
+
+
+def stage_2_peer_review(
+    responses: Dict[str, str],
+    framework: str,
+    model_order: Optional[List[str]] = None,
+    checkpoint: Optional[checkpoints.RunCheckpoint] = None
+) -> Dict[str, str]:
+    """
+    STAGE 2: Each model reviews all the plans (including their own).
+    
+    The plans are anonymized so models can't play favorites.
+    Each model ranks the plans and provides constructive feedback.
+    With more plans than config.REVIEW_GROUP_SIZE, each model reviews
+    a group of that many plans instead (see tournament.py).
+    
+    NOTE: Session plans are packed into the model's context window by
+    context_packer, which cuts along section boundaries when they don't fit.
+    
+    Args:
+        responses: Dictionary of model responses from Stage 1
+        framework: The Trojans Coaching Framework text
+        model_order: Order to call the reviewers in (defaults to config order)
+        checkpoint: Saves each review as it arrives; reviews it already holds
+                    are reused instead of asking the model again
+    
+    Returns:
+        Dictionary mapping model names to their review responses
+    """
+    print("\n" + "="*70)
+    print("STAGE 2: PEER REVIEW")
+    print("="*70)
+    groups = review_groups(responses)
+    if tournament.is_tournament(len(responses), config.REVIEW_GROUP_SIZE):
+        print(f"\nEach model will now review {config.REVIEW_GROUP_SIZE} of the {len(responses)} plans...")
+    else:
+        print(f"\nEach model will now review all {_count_words(len(responses))} plans...")
+    print("(Plans are fitted to the context window, keeping the most important sections)")
+    
+    reviews = dict(checkpoint.reviews) if checkpoint else {}
+    record = checkpoint.record_review if checkpoint else None
+    
+    prompts: Dict[Tuple[str, ...], str] = {}
+    
+    def review_prompt(model_key: str) -> str:
+        # Reviewers with the same group share one prompt
+        group = tuple(groups[model_key])
+        if group not in prompts:
+            prompts[group] = prepare_review_prompt(responses, framework, list(group))
+        return prompts[group]
+    
+    prefix = prompt_prefix.build_stage_prefix(framework, "stage_2")
+    
+    model_order = [key for key in model_order or stage_roster("stage_2") if key not in reviews]
+    if reviews:
+        print(f"   Reusing {len(reviews)} review(s) saved in the checkpoint")
+    
+    pool = backends.get_pool()
+    if pool and model_order:
+        print(f"\n📊 Requesting reviews from {len(model_order)} models in parallel...")
+        new_reviews = pool.run({
+            model_key: _pooled_call(review_prompt(model_key), model_key, prefix, record, stage="stage_2")
+            for model_key in model_order
+        })
+        for model_key, review in new_reviews.items():
+            print(f"✅ Received review from {model_key} ({len(review)} characters)")
+        reviews.update(new_reviews)
+        return in_config_order(reviews)
+    
     # Get each model's review
-    for model_key, model_info in config.COUNCIL_MODELS.items():
+    for model_key in model_order:
+        model_info = config.COUNCIL_MODELS[model_key]
         print(f"\n📊 Requesting review from {model_info['role']} ({model_key})...")
         
-        wait_for_model_switch(model_info['name'])
+        ensure_model_loaded(model_info['name'])
         
-        review = call_lm_studio(review_prompt, model_info['name'], config.TEMPERATURE)
+        review = call_council_model(review_prompt(model_key), model_key, prefix, stage="stage_2")
         reviews[model_key] = review
+        if record:
+            record(model_key, review)
         
         print(f"✅ Received review ({len(review)} characters)")
     
-    return reviews
+    return in_config_order(reviews)
+
+
+def stages_1_and_2_incremental(
+    session_params: str,
+    framework: str,
+    checkpoint: Optional[checkpoints.RunCheckpoint] = None
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    STAGES 1 AND 2 as one pipeline, for when there is a backend pool.
+    
+    Each plan is scored against a rubric as soon as it arrives, while the
+    others are still being written, then every reviewer ranks the plans
+    from the scorecards (see pipeline.py). Stage times are recorded in
+    last_run_stage_times as the stages overlap: Stage 1 ends when the last
+    plan arrives, Stage 2 when the last ranking does.
+    
+    Returns:
+        The plans and the reviews, by model key, as the separate stages return them
+    """
+    print("\n" + "="*70)
+    print("STAGES 1 + 2: INCREMENTAL PIPELINE")
+    print("="*70)
+    print("\nPlans are scored as they arrive, then ranked from the scorecards...")
+    
+    pool = backends.get_pool()
+    start = time.perf_counter()
+    plan_prefix = prompt_prefix.build_stage_prefix(framework, "stage_1")
+    review_prefix = prompt_prefix.build_stage_prefix(framework, "stage_2")
+    model_keys = stage_roster("stage_1")
+    existing_plans = dict(checkpoint.responses) if checkpoint else {}
+    reviews = dict(checkpoint.reviews) if checkpoint else {}
+    reviewers = [key for key in stage_roster("stage_2") if key not in reviews]
+    
+    # Labels follow config order, so they're known before any plan arrives
+    label_of = {key: label for label, key in plan_labels(dict.fromkeys(model_keys, "")).items()}
+    scorers = pipeline.assign_scorers(model_keys, stage_roster("stage_2"))
+    plan_prompt = build_plan_prompt(session_params, reference_plans_for(session_params))
+    plan_tasks = {
+        key: _pooled_call(plan_prompt, key, plan_prefix, checkpoint.record_plan if checkpoint else None,
+                          stage="stage_1", as_plan=True, session_params=session_params)
+        for key in model_keys if key not in existing_plans
+    }
+    if existing_plans:
+        print(f"   Reusing {len(existing_plans)} plan(s) saved in the checkpoint")
+    
+    def score_task(author: str, plan: str):
+        label = label_of[author]
+        print(f"   🧮 {label} is in - {scorers[author]} is scoring it")
+        packed = context_packer.pack_parts(
+            {label: structured.for_review(plan)},
+            review_prefix + pipeline.build_scorecard_prompt(label, ""),
+            label=f"Scorecard {label}",
+            max_output_tokens=call_budgets.token_cap("stage_2")
+        )
+        prompt = pipeline.build_scorecard_prompt(label, packed[label])
+        return scorers[author], _pooled_call(prompt, scorers[author], review_prefix, stage="stage_2")
+    
+    def rank_tasks(scorecards: Dict[str, Tuple[str, str]]):
+        print(f"   📊 All plans scored - {len(reviewers)} ranking pass(es)")
+        scorecards_text = "\n\n".join(scorecards[key][1] for key in model_keys)
+        prompt = pipeline.build_ranking_prompt(scorecards_text, len(model_keys))
+        return {key: _pooled_call(prompt, key, review_prefix, stage="stage_2") for key in reviewers}
+    
+    def plans_done():
+        last_run_stage_times["stage_1"] = time.perf_counter() - start
+    
+    if not reviewers:
+        # Only plans are missing; there's nothing to overlap them with
+        responses = stage_1_individual_responses(session_params, framework, checkpoint=checkpoint)
+        plans_done()
+        return responses, in_config_order(reviews)
+    
+    responses, scorecards, rankings = pipeline.run_incremental(
+        pool, plan_tasks, existing_plans, score_task, rank_tasks, on_plans_done=plans_done
+    )
+    for reviewer, ranking in rankings.items():
+        own = [text for author, (scorer, text) in scorecards.items() if scorer == reviewer]
+        reviews[reviewer] = pipeline.combine_review(ranking, own)
+        if checkpoint:
+            checkpoint.record_review(reviewer, reviews[reviewer])
+        print(f"✅ Received review from {reviewer} ({len(reviews[reviewer])} characters)")
+    last_run_stage_times["stage_2"] = time.perf_counter() - start - last_run_stage_times["stage_1"]
+    return in_config_order(responses), in_config_order(reviews)
+
+
+def build_synthesis_prompt(session_params: str, all_plans: str, all_reviews: str, plan_count: int = 3) -> str:
+    """Builds the Stage 3 prompt asking the chairman for the final plan."""
+    prompt = f"""You are the Chairman of the Trojans RFC coaching council.
+
+You have received {_count_words(plan_count)} independent session plans and peer reviews from your coaching team.
+Your task is to synthesize these into a single, optimized session plan.
+
+SESSION PARAMETERS:
+{session_params}
+
+ORIGINAL PLANS:
+{all_plans}
+
+PEER REVIEWS:
+{all_reviews}
+
+Based on all this input, create a final session plan that:
+1. Incorporates the best ideas from all {_count_words(plan_count)} plans
+2. Addresses weaknesses identified in the reviews
+3. Fully embodies the Trojans Coaching Framework
+4. Is practical, detailed, and ready to use
+
+Provide the final plan in the same format as requested in Stage 1:
+- Session objectives
+- Warm-up activity
+- Main skill development activities (with STEP progressions)
+- Game-based activity
+- Cool-down and review
+- Coaching points
+- Integration of the five Coaching Habits
+
+Make this the best possible session for these players."""
+    if config.STRUCTURED_OUTPUT:
+        prompt += "\n\n" + structured.JSON_INSTRUCTIONS
+    return prompt
+
+
+def prepare_synthesis_prompt(
+    responses: Dict[str, str],
+    reviews: Dict[str, str],
+    session_params: str,
+    framework: str
+) -> str:
+    """Builds the Stage 3 prompt for the chairman, with plans and reviews packed to fit."""
+    # Compile all the information for the chairman, sharing the context
+    # left after the fixed prompt between all the plans and reviews
+    parts = {}
+    for model_key, response in responses.items():
+        parts[f"Plan from {config.COUNCIL_MODELS[model_key]['role']}"] = structured.for_review(response)
+    for model_key, review in reviews.items():
+        parts[f"Review from {config.COUNCIL_MODELS[model_key]['role']}"] = review
+    
+    packed = context_packer.pack_parts(
+        parts,
+        prompt_prefix.build_stage_prefix(framework, "stage_3")
+        + build_synthesis_prompt(session_params, "", "", len(responses)),
+        label="Stage 3",
+        max_output_tokens=call_budgets.token_cap("stage_3")
+    )
+    all_plans = _join_parts({label: text for label, text in packed.items() if label.startswith("Plan")})
+    all_reviews = _join_parts({label: text for label, text in packed.items() if label.startswith("Review")})
+    return build_synthesis_prompt(session_params, all_plans, all_reviews, len(responses))
 
 
 def stage_3_chairman_synthesis(
@@ -329,7 +981,7 @@ def stage_3_chairman_synthesis(
     then creates a final session plan that incorporates the best ideas
     and addresses the identified weaknesses.
     
-    NOTE: Plans and reviews may be truncated to fit context window limits.
+    NOTE: Plans and reviews may be cut (by section) to fit the context window.
     
     Args:
         responses: Original session plans from Stage 1
@@ -346,89 +998,156 @@ def stage_3_chairman_synthesis(
     
     chairman_info = config.COUNCIL_MODELS[config.CHAIRMAN_MODEL]
     print(f"\n🎯 {chairman_info['role']} will now create the final plan...")
-    print("(Content may be truncated to fit context limits)")
+    print("(Content is fitted to the context window, keeping the most important sections)")
     
-    # Compile all the information for the chairman
-    # Truncate individual plans to manage context window
-    all_plans = ""
-    for model_key, response in responses.items():
-        model_role = config.COUNCIL_MODELS[model_key]['role']
-        truncated_plan = truncate_plan_for_review(response, max_chars=2500)
-        all_plans += f"\n{'='*70}\n"
-        all_plans += f"Plan from {model_role}:\n\n{truncated_plan}\n"
+    synthesis_prompt = prepare_synthesis_prompt(responses, reviews, session_params, framework)
+    prefix = prompt_prefix.build_stage_prefix(framework, "stage_3")
     
-    # Keep reviews at full length since they're typically shorter
-    all_reviews = ""
-    for model_key, review in reviews.items():
-        model_role = config.COUNCIL_MODELS[model_key]['role']
-        # Truncate reviews too if needed, but with a higher limit
-        truncated_review = truncate_plan_for_review(review, max_chars=4000)
-        all_reviews += f"\n{'='*70}\n"
-        all_reviews += f"Review from {model_role}:\n\n{truncated_review}\n"
+    pool = backends.get_pool()
+    if pool:
+        final_plan = ask_for_plan(
+            synthesis_prompt, config.CHAIRMAN_MODEL, prefix, base_url=pool.url_for(config.CHAIRMAN_MODEL),
+            stage="stage_3", session_params=session_params
+        )
+    else:
+        ensure_model_loaded(chairman_info['name'])
+        final_plan = ask_for_plan(synthesis_prompt, config.CHAIRMAN_MODEL, prefix, stage="stage_3",
+                                  session_params=session_params)
+    
+    print(f"✅ Final plan created ({len(final_plan)} characters)")
     
-    # Create the synthesis prompt
-    synthesis_prompt = f"""You are the Chairman of the Trojans RFC coaching council.
+    return final_plan
 
-You have received three independent session plans and peer reviews from your coaching team.
-Your task is to synthesize these into a single, optimized session plan.
 
-COACHING FRAMEWORK:
-{framework}
+def build_light_edit_prompt(session_params: str, winning_plan: str, improvements: str) -> str:
+    """Builds the short Stage 3 prompt used when the reviewers agreed on one plan."""
+    prompt = f"""You are the Chairman of the Trojans RFC coaching council.
+
+Your coaching team reviewed several session plans and agreed this one is the best.
+Do not redesign it. Make a light edit: apply the reviewers' improvements where they
+fit, fix any errors (such as activity times that don't add up to the session length),
+and keep everything else as it is.
 
 SESSION PARAMETERS:
 {session_params}
 
-ORIGINAL PLANS:
-{all_plans}
+WINNING PLAN:
+{winning_plan}
 
-PEER REVIEWS:
-{all_reviews}
+REVIEWERS' SUGGESTED IMPROVEMENTS:
+{improvements}
 
-Based on all this input, create a final session plan that:
-1. Incorporates the best ideas from all three plans
-2. Addresses weaknesses identified in the reviews
-3. Fully embodies the Trojans Coaching Framework
-4. Is practical, detailed, and ready to use
+Return the complete edited session plan in the same format as the winning plan."""
+    if config.STRUCTURED_OUTPUT:
+        prompt += "\n\n" + structured.JSON_INSTRUCTIONS
+    return prompt
 
-Provide the final plan in the same format as requested in Stage 1:
-- Session objectives
-- Warm-up activity
-- Main skill development activities (with STEP progressions)
-- Game-based activity
-- Cool-down and review
-- Coaching points
-- Integration of the five Coaching Habits
 
-Make this the best possible session for these players."""
+def prepare_light_edit_prompt(
+    winning_plan: str,
+    reviews: Dict[str, str],
+    session_params: str,
+    framework: str
+) -> str:
+    """Builds the light-edit prompt, with only the improvements sections of the reviews."""
+    parts = {"Winning plan": winning_plan}
+    for model_key, review in reviews.items():
+        improvements = consensus.extract_section(review, "Recommended Improvements") or review
+        parts[f"From {config.COUNCIL_MODELS[model_key]['role']}"] = improvements
+    
+    packed = context_packer.pack_parts(
+        parts,
+        prompt_prefix.build_stage_prefix(framework, "stage_3") + build_light_edit_prompt(session_params, "", ""),
+        label="Stage 3",
+        max_output_tokens=call_budgets.token_cap("stage_3")
+    )
+    winning_plan = packed.pop("Winning plan")
+    return build_light_edit_prompt(session_params, winning_plan, _join_parts(packed))
 
-    wait_for_model_switch(chairman_info['name'])
+
+def decide_stage_3(responses: Dict[str, str], reviews: Dict[str, str]) -> consensus.Decision:
+    """Checks the reviewers' rankings for consensus (see consensus.py)."""
+    return consensus.decide(
+        reviews, plan_labels(responses), config.CONSENSUS_MODE, config.CONSENSUS_THRESHOLD,
+        pairwise=tournament.is_tournament(len(responses), config.REVIEW_GROUP_SIZE)
+    )
+
+
+def stage_3_final_plan(
+    responses: Dict[str, str],
+    reviews: Dict[str, str],
+    session_params: str,
+    framework: str
+) -> Tuple[str, consensus.Decision]:
+    """
+    STAGE 3, with an early exit when the reviewers agree.
     
-    final_plan = call_lm_studio(synthesis_prompt, chairman_info['name'], config.TEMPERATURE)
+    Depending on config.CONSENSUS_MODE, a plan every reviewer ranked first
+    either becomes the final plan as it is, or gets a light edit from the
+    chairman. Otherwise the chairman runs the full synthesis.
     
-    print(f"✅ Final plan created ({len(final_plan)} characters)")
+    Returns:
+        The final plan, and the decision saying which path produced it
+    """
+    decision = decide_stage_3(responses, reviews)
+    if decision.consensus:
+        print(f"\n🤝 Review consensus: {decision.consensus.summary()}")
+    if decision.path == consensus.SYNTHESIS:
+        return stage_3_chairman_synthesis(responses, reviews, session_params, framework), decision
     
-    return final_plan
+    print("\n" + "="*70)
+    print("STAGE 3: CONSENSUS - " + ("WINNING PLAN" if decision.path == consensus.WINNER else "LIGHT EDIT"))
+    print("="*70)
+    winning_plan = responses[decision.winner_key]
+    if decision.path == consensus.WINNER:
+        print(f"\n🏆 Using the plan from {config.COUNCIL_MODELS[decision.winner_key]['role']} as the final plan")
+        return winning_plan, decision
+    
+    chairman_info = config.COUNCIL_MODELS[config.CHAIRMAN_MODEL]
+    print(f"\n✏️  {chairman_info['role']} is making a light edit of the winning plan...")
+    prompt = prepare_light_edit_prompt(winning_plan, reviews, session_params, framework)
+    prefix = prompt_prefix.build_stage_prefix(framework, "stage_3")
+    pool = backends.get_pool()
+    if pool:
+        base_url = pool.url_for(config.CHAIRMAN_MODEL)
+    else:
+        base_url = None
+        ensure_model_loaded(chairman_info['name'])
+    final_plan = ask_for_plan(prompt, config.CHAIRMAN_MODEL, prefix, base_url=base_url, stage="stage_3",
+                              session_params=session_params)
+    print(f"✅ Final plan edited ({len(final_plan)} characters)")
+    return final_plan, decision
 
 
 def save_council_session(
     session_params: str,
     responses: Dict[str, str],
     reviews: Dict[str, str],
-    final_plan: str
+    final_plan: str,
+    name: Optional[str] = None,
+    stage_3_note: Optional[str] = None,
+    tiers: Optional[Dict] = None
 ):
     """
     Saves all the Council outputs to a file for review.
     
     This creates a complete record of the entire Council meeting:
     what each model said, how they reviewed each other, and the final plan.
+    
+    name is added to the filename so sessions saved in the same second
+    (e.g. by a batch run) don't overwrite each other. stage_3_note says how
+    the final plan was produced (e.g. a consensus early exit). tiers is the
+    per-stage tier summary from telemetry, shown as a table at the end.
+    With config.LINT_PLANS on, every plan's check results follow the final plan.
     """
     # Create sessions directory if it doesn't exist
-    sessions_dir = Path(__file__).parent / "sessions"
-    sessions_dir.mkdir(exist_ok=True)
+    sessions_dir = SESSIONS_DIR
+    sessions_dir.mkdir(parents=True, exist_ok=True)
     
     # Create filename with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = sessions_dir / f"council_session_{timestamp}.md"
+    suffix = f"_{name}" if name else ""
+    filename = sessions_dir / f"council_session_{timestamp}{suffix}.md"
     
     # Build the output content
     content = f"""# Rugby Council AI - Session Output
@@ -445,7 +1164,7 @@ def save_council_session(
     
     for model_key, response in responses.items():
         model_info = config.COUNCIL_MODELS[model_key]
-        content += f"### {model_info['role']} ({model_key})\n\n{response}\n\n---\n\n"
+        content += f"### {model_info['role']} ({model_key})\n\n{structured.to_markdown(response)}\n\n---\n\n"
     
     content += "## STAGE 2: Peer Reviews\n\n"
     
@@ -454,7 +1173,18 @@ def save_council_session(
         content += f"### Review by {model_info['role']} ({model_key})\n\n{review}\n\n---\n\n"
     
     content += "## STAGE 3: Final Synthesized Plan\n\n"
-    content += final_plan
+    if stage_3_note:
+        content += f"*{stage_3_note}*\n\n"
+    content += structured.to_markdown(final_plan)
+    if config.LINT_PLANS:
+        reports = {
+            f"{config.COUNCIL_MODELS[model_key]['role']} ({model_key})": plan_linter.lint_plan(response, session_params)
+            for model_key, response in responses.items()
+        }
+        reports["Final plan"] = plan_linter.lint_plan(final_plan, session_params)
+        content += f"\n\n---\n\n## {plan_linter.CHECKS_HEADING}\n\n" + plan_linter.format_checks(reports)
+    if tiers:
+        content += f"\n\n---\n\n## {telemetry.TIERS_HEADING}\n\n" + telemetry.format_tiers(tiers) + "\n"
     
     # Save to file
     with open(filename, 'w', encoding='utf-8') as f:
@@ -464,40 +1194,190 @@ def save_council_session(
     return filename
 
 
-def run_council(session_params: str):
+def run_council(
+    session_params: Optional[str] = None,
+    checkpoint: Optional[checkpoints.RunCheckpoint] = None
+) -> Path:
     """
     Main function that orchestrates the entire Council process.
     
     This is the conductor of the orchestra - it calls each stage in order
     and coordinates all the models working together.
+    
+    Every response is saved to a checkpoint as soon as it arrives. Pass the
+    checkpoint of an earlier run (see checkpoint.py) to resume it: calls that
+    already finished are skipped and the run picks up at the first missing one.
+    
+    Args:
+        session_params: The session requirements (not needed when resuming)
+        checkpoint: Checkpoint to resume, or None to start a new run
+    
+    Returns:
+        Path of the saved session file
     """
+    if checkpoint is None:
+        checkpoint = checkpoints.RunCheckpoint.create(session_params, checkpoints.checkpoint_dir_for(SESSIONS_DIR))
+    session_params = checkpoint.session_params
+    
     print("\n" + "="*70)
     print("🏉 RUGBY COUNCIL AI - SESSION PLANNER")
     print("="*70)
     print(f"\nSession Parameters: {session_params}")
     print(f"Models in Council: {len(config.COUNCIL_MODELS)}")
+    if config.STAGE_ROSTERS:
+        print(f"Plans by: {', '.join(stage_roster('stage_1'))}; reviews by: {', '.join(stage_roster('stage_2'))}")
     print(f"Chairman: {config.COUNCIL_MODELS[config.CHAIRMAN_MODEL]['role']}")
+    print(f"Run ID: {checkpoint.run_id}")
+    if checkpoint.completed_calls():
+        print(f"Resuming: {checkpoint.completed_calls()} call(s) already completed")
     
     # Load the coaching framework
     framework = load_coaching_framework()
     print(f"Coaching Framework: Loaded ({len(framework)} characters)")
+    if config.FRAMEWORK_DIGESTS:
+        print("Framework digests (estimated prompt tokens):")
+        print("\n".join(framework_digest.get_digests(framework).report()))
+    prompt_prefix.timings.clear()
+    prompt_prefix.warmer.reset()
+    get_model_manager().reset()
+    telemetry.recorder.clear()
+    
+    # Work out the call order that needs the fewest model loads
+    # (only the calls still to do - finished ones come from the checkpoint)
+    completed = (
+        [scheduler.CouncilCall(1, key) for key in checkpoint.responses]
+        + [scheduler.CouncilCall(2, key) for key in checkpoint.reviews]
+        + ([scheduler.CouncilCall(3, config.CHAIRMAN_MODEL)] if checkpoint.final_plan is not None else [])
+    )
+    schedule = scheduler.plan_council_schedule(
+        stage_roster("stage_1"), config.CHAIRMAN_MODEL, loaded_model=loaded_model_key(), completed=completed,
+        reviewer_keys=stage_roster("stage_2")
+    )
+    if backends.get_pool():
+        print("Backend pool: each model has its own server, stages run in parallel")
+    else:
+        print(f"Model schedule: {schedule.summary()}")
+    
+    # Run the three stages, timing each one
+    last_run_stage_times.clear()
+    if config.STAGE_2_MODE == "incremental" and backends.get_pool():
+        responses, reviews = stages_1_and_2_incremental(session_params, framework, checkpoint)
+    else:
+        if config.STAGE_2_MODE == "incremental":
+            print("Incremental Stage 2 needs a backend pool (MODEL_ENDPOINTS) - using combined reviews")
+        stage_start = time.perf_counter()
+        responses = stage_1_individual_responses(
+            session_params, framework, schedule.order_for_stage(1), checkpoint
+        )
+        last_run_stage_times["stage_1"] = time.perf_counter() - stage_start
+        
+        stage_start = time.perf_counter()
+        reviews = stage_2_peer_review(responses, framework, schedule.order_for_stage(2), checkpoint)
+        last_run_stage_times["stage_2"] = time.perf_counter() - stage_start
     
-    # Run the three stages
-    responses = stage_1_individual_responses(session_params, framework)
-    reviews = stage_2_peer_review(responses, framework)
-    final_plan = stage_3_chairman_synthesis(responses, reviews, session_params, framework)
+    stage_start = time.perf_counter()
+    if checkpoint.final_plan is None:
+        final_plan, decision = stage_3_final_plan(responses, reviews, session_params, framework)
+        checkpoint.record_final_plan(final_plan, decision.to_dict())
+    else:
+        print("\n🎯 Final plan already in the checkpoint - skipping Stage 3")
+        final_plan = checkpoint.final_plan
+    last_run_stage_times["stage_3"] = time.perf_counter() - stage_start
     
     # Save everything
-    output_file = save_council_session(session_params, responses, reviews, final_plan)
+    stage_3 = checkpoint.stage_3 or {}
+    report = telemetry.recorder.session_report(session_params, last_run_stage_times, run_id=checkpoint.run_id)
+    report["stage_3"] = stage_3
+    output_file = save_council_session(
+        session_params, responses, reviews, final_plan, stage_3_note=stage_3.get("note"), tiers=report["by_tier"]
+    )
+    checkpoint.record_output(output_file)
+    telemetry_file = telemetry.write_sidecar(output_file, report)
+    archive_session(output_file)
     
     print("\n" + "="*70)
     print("✅ COUNCIL COMPLETE")
     print("="*70)
     print(f"\nAll outputs saved to: {output_file}")
+    print(f"Telemetry saved to: {telemetry_file}")
+    print(f"Model swaps saved by scheduling: {schedule.swaps_saved}")
+    print("Stage times: " + ", ".join(
+        f"{stage.replace('_', ' ').title()} {seconds:.1f}s" for stage, seconds in last_run_stage_times.items()
+    ))
+    load_report = get_model_manager().report()
+    if load_report:
+        print("Model load time:")
+        print("\n".join(load_report))
+    print(f"HTTP: {http_client.get_client().summary()}")
+    cache = response_cache.get_cache()
+    if cache:
+        print(f"Response cache: {cache.summary()}")
+    prompt_report = prompt_prefix.timings.report()
+    if prompt_report:
+        print("Prompt processing time per call:")
+        print("\n".join(prompt_report))
     print("\nYou can now review:")
     print("- Individual plans from each model")
     print("- Peer reviews and rankings")
     print("- Final synthesized session plan")
+    return output_file
+
+
+def plan_with_reuse(checkpoint: checkpoints.RunCheckpoint, action: Optional[str] = None) -> Path:
+    """
+    Runs the council for a new request, unless an earlier run already answers it.
+    
+    The request is compared with every archived run (see request_matching.py).
+    If one matches closely enough, action (config.REQUEST_MATCH_ACTION by
+    default) decides what happens:
+    - "reuse_result": return the earlier session file; no model calls at all
+    - "reuse_plans":  seed this run's checkpoint with the earlier Stage 1
+                      plans, so only Stages 2 and 3 are run
+    - "ask":          ask which of those to do (or to run a new council)
+    - "off":          always run a new council
+    
+    Args:
+        checkpoint: The new run's checkpoint
+        action: Overrides config.REQUEST_MATCH_ACTION
+    
+    Returns:
+        Path of the session file that answers the request
+    """
+    action = action or config.REQUEST_MATCH_ACTION
+    if action not in request_matching.ACTIONS:
+        raise ValueError(f"Unknown REQUEST_MATCH_ACTION: {action!r}")
+    match = None
+    if action != "off" and config.ARCHIVE_ENABLED:
+        session_archive = get_archive()
+        try:
+            candidates = session_archive.search(limit=10000)
+        except sqlite3.Error as e:
+            print(f"   ⚠️  Couldn't search the archive: {e}")
+            candidates = []
+        match = request_matching.best_match(checkpoint.session_params, candidates, config.REQUEST_MATCH_THRESHOLD)
+    if match is None:
+        return run_council(checkpoint=checkpoint)
+    
+    if action == "ask":
+        action = request_matching.ask_what_to_do(match)
+    else:
+        print(f"\n🔁 Similar earlier run - {match.summary()}")
+    
+    if action == "reuse_result":
+        output_file = SESSIONS_DIR / match.session.session_file
+        print(f"♻️  Reusing the earlier result: {output_file}")
+        return output_file
+    if action == "reuse_plans":
+        try:
+            plans = session_archive.plans_for(match.session.session_file)
+        except sqlite3.Error as e:
+            print(f"   ⚠️  Couldn't read the earlier plans from the archive: {e}")
+            plans = {}
+        for model_key, plan in plans.items():
+            if plan.strip() and model_key in stage_roster("stage_1") and model_key not in checkpoint.responses:
+                checkpoint.record_plan(model_key, plan)
+        print(f"♻️  Reusing {len(checkpoint.responses)} Stage 1 plan(s) from the earlier run")
+    return run_council(checkpoint=checkpoint)
 
 
 if __name__ == "__main__":
@@ -506,19 +1386,45 @@ if __name__ == "__main__":
     
     You can modify the session_params below to request different sessions.
     Format: "duration, age group, player count, coach count, focus areas"
+    
+    To pick up an interrupted or failed run where it stopped:
+        python council.py --resume <run-id>
+    
+    To run with a council profile from config.PROFILES_DIR:
+        python council.py --profile creative-council
     """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Run the Rugby Council AI session planner")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="resume an earlier run from its checkpoint, skipping completed calls")
+    parser.add_argument("--profile", help="council profile to use (see council_profiles.py)")
+    args = parser.parse_args()
     
     # Example session request
     # Modify this to request different types of sessions
     session_params = "60 minutes, U10s, 24 players, 4 coaches, focus on decision making around the breakdown"
     
+    checkpoint = None
     try:
-        run_council(session_params)
+        with council_profiles.applied(args.profile):
+            if args.resume:
+                checkpoint = checkpoints.RunCheckpoint.load(args.resume, checkpoints.checkpoint_dir_for(SESSIONS_DIR))
+                run_council(checkpoint=checkpoint)
+            else:
+                checkpoint = checkpoints.RunCheckpoint.create(session_params,
+                                                              checkpoints.checkpoint_dir_for(SESSIONS_DIR))
+                # Offers an earlier run's result if one matches this request
+                plan_with_reuse(checkpoint)
     except KeyboardInterrupt:
         print("\n\n⏹️  Council interrupted by user")
+        if checkpoint:
+            print(f"   Progress is saved. Resume with: python council.py --resume {checkpoint.run_id}")
     except Exception as e:
         print(f"\n\n❌ Error: {e}")
+        if checkpoint and checkpoint.completed_calls():
+            print(f"\nProgress is saved. Resume with: python council.py --resume {checkpoint.run_id}")
         print("\nPlease check that:")
         print("1. LM Studio is running")
         print("2. The server is started in LM Studio")
-        print("3. The model names in config.py match LM Studio exactly")
\ No newline at end of file
+        print("3. The model names in config.py match LM Studio exactly")
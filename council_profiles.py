@@ -0,0 +1,242 @@
+"""
+Rugby Council AI - Council Profiles
+
+config.py is read once, when the process starts, so trying a different
+council (other members, temperatures, token budgets) meant editing it and
+starting again - and the presets in examples/config-presets/ were never
+loaded by anything.
+
+A profile is a named set of config overrides, in a file in
+config.PROFILES_DIR: either a .py file defining a PRESET dict (like the
+examples) or a .json file holding the same dict. Keys are config.py
+setting names, plus an optional DESCRIPTION:
+
+    PRESET = {
+        "TEMPERATURE": 0.95,
+        "STAGE_TEMPERATURES": {"stage_2": 0.3},
+        "MAX_TOKENS": 1500,
+        "DESCRIPTION": "High creativity, more varied session ideas."
+    }
+
+Profiles are checked before use: unknown settings, wrong types,
+out-of-range temperatures and a chairman or endpoint that isn't on the
+council are all reported together. Files are read again only when they
+change, so a long-running process (service.py, batch.py) can switch
+profile per request without a restart:
+
+    with council_profiles.applied("creative-council"):
+        council.run_council(session_params)
+"""
+
+import json
+import runpy
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import config
+
+PROFILE_SUFFIXES = (".py", ".json")
+
+# Keys a profile may hold that aren't config settings
+EXTRA_KEYS = {"DESCRIPTION"}
+
+
+class ProfileError(ValueError):
+    """A profile is missing or its settings are invalid."""
+
+
+@dataclass
+class Profile:
+    """A named set of config overrides."""
+    name: str
+    settings: Dict = field(default_factory=dict)
+    description: str = ""
+    path: Optional[Path] = None
+
+
+def profiles_dir() -> Path:
+    path = Path(config.PROFILES_DIR)
+    return path if path.is_absolute() else Path(__file__).parent / path
+
+
+def available_profiles() -> List[str]:
+    """Names of the profiles in config.PROFILES_DIR."""
+    directory = profiles_dir()
+    if not directory.is_dir():
+        return []
+    return sorted(path.stem for path in directory.iterdir() if path.suffix in PROFILE_SUFFIXES)
+
+
+def _read(path: Path) -> Dict:
+    if path.suffix == ".json":
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    else:
+        data = runpy.run_path(str(path)).get("PRESET")
+    if not isinstance(data, dict):
+        raise ProfileError(f"{path.name} must define a PRESET dictionary")
+    return data
+
+
+def _type_problem(key: str, value, default) -> Optional[str]:
+    if default is None:
+        return None
+    expected = (int, float) if isinstance(default, float) else type(default)
+    if isinstance(value, bool) != isinstance(default, bool) or not isinstance(value, expected):
+        return f"{key} should be {type(default).__name__}, not {type(value).__name__}"
+    return None
+
+
+def _temperature_problem(name: str, value) -> Optional[str]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 2:
+        return f"{name} must be a number from 0 to 2"
+    return None
+
+
+def validate_settings(settings: Dict) -> List[str]:
+    """
+    Checks profile settings against config.py.
+
+    Returns:
+        A list of problems, empty if the settings are valid
+    """
+    problems = []
+    for key, value in settings.items():
+        if key in EXTRA_KEYS:
+            continue
+        if not key.isupper() or not hasattr(config, key):
+            problems.append(f"unknown setting {key}")
+            continue
+        problem = _type_problem(key, value, getattr(config, key))
+        if problem:
+            problems.append(problem)
+    if problems:
+        return problems
+
+    # What the council would look like with the profile applied
+    effective = {key: settings.get(key, getattr(config, key)) for key in
+                 ("COUNCIL_MODELS", "CHAIRMAN_MODEL", "MODEL_ENDPOINTS", "TEMPERATURE", "STAGE_TEMPERATURES",
+                  "MAX_TOKENS", "CONTEXT_WINDOW", "STAGE_ROSTERS")}
+    members = effective["COUNCIL_MODELS"]
+    if not members:
+        problems.append("COUNCIL_MODELS needs at least one member")
+    for key, member in members.items():
+        if not isinstance(member, dict) or not all(isinstance(member.get(f), str) for f in ("name", "role")):
+            problems.append(f'council member {key} needs a "name" and a "role"')
+    if effective["CHAIRMAN_MODEL"] not in members:
+        problems.append(f"CHAIRMAN_MODEL {effective['CHAIRMAN_MODEL']!r} is not in COUNCIL_MODELS")
+    for key, endpoint in effective["MODEL_ENDPOINTS"].items():
+        if key not in members:
+            problems.append(f"MODEL_ENDPOINTS has {key!r}, which is not in COUNCIL_MODELS")
+        elif not isinstance(endpoint, dict) or not endpoint.get("url"):
+            problems.append(f'MODEL_ENDPOINTS[{key!r}] needs a "url"')
+    for stage, roster in effective["STAGE_ROSTERS"].items():
+        unknown = [key for key in roster if key not in members]
+        if unknown:
+            problems.append(f"STAGE_ROSTERS[{stage!r}] has {', '.join(unknown)}, not in COUNCIL_MODELS")
+    problem = _temperature_problem("TEMPERATURE", effective["TEMPERATURE"])
+    if problem:
+        problems.append(problem)
+    for stage, temperature in effective["STAGE_TEMPERATURES"].items():
+        problem = _temperature_problem(f"STAGE_TEMPERATURES[{stage!r}]", temperature)
+        if problem:
+            problems.append(problem)
+    for key in ("MAX_TOKENS", "CONTEXT_WINDOW"):
+        if effective[key] <= 0:
+            problems.append(f"{key} must be positive")
+    if not problems and effective["MAX_TOKENS"] >= effective["CONTEXT_WINDOW"]:
+        problems.append("MAX_TOKENS must be smaller than CONTEXT_WINDOW")
+    return problems
+
+
+class ProfileLoader:
+    """Loads profiles from files, reading each again only when it changes."""
+
+    def __init__(self):
+        self._cache: Dict[Path, Tuple[int, Profile]] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, name: str) -> Path:
+        for suffix in PROFILE_SUFFIXES:
+            path = profiles_dir() / f"{name}{suffix}"
+            if path.exists():
+                return path
+        available = ", ".join(available_profiles()) or "none"
+        raise ProfileError(f"No profile called {name!r} in {profiles_dir()} (available: {available})")
+
+    def load(self, name: str) -> Profile:
+        """
+        The named profile, validated.
+
+        Raises:
+            ProfileError: If there is no such profile or its settings are invalid
+        """
+        path = self.path_for(name)
+        modified = path.stat().st_mtime_ns
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached and cached[0] == modified:
+                return cached[1]
+        settings = _read(path)
+        problems = validate_settings(settings)
+        if problems:
+            raise ProfileError(f"Profile {name!r} is invalid: " + "; ".join(problems))
+        profile = Profile(name, {k: v for k, v in settings.items() if k not in EXTRA_KEYS},
+                          str(settings.get("DESCRIPTION", "")), path)
+        with self._lock:
+            self._cache[path] = (modified, profile)
+        return profile
+
+
+loader = ProfileLoader()
+
+# Held while a profile is applied: config is shared by every thread, so
+# only one profile can be in force at a time
+_apply_lock = threading.RLock()
+
+
+@contextmanager
+def applied(profile: Optional[str]) -> Iterator[Optional[Profile]]:
+    """
+    Applies a profile's settings to config for the duration of the block.
+
+    The previous values are restored afterwards, even if the block fails.
+    None applies nothing, so callers can pass an optional profile straight in.
+    """
+    if profile is None:
+        yield None
+        return
+    loaded = loader.load(profile)
+    with _apply_lock:
+        previous = {key: getattr(config, key) for key in loaded.settings}
+        for key, value in loaded.settings.items():
+            setattr(config, key, value)
+        try:
+            yield loaded
+        finally:
+            for key, value in previous.items():
+                setattr(config, key, value)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List and check council profiles")
+    parser.add_argument("names", nargs="*", help="profiles to check (default: all)")
+    args = parser.parse_args()
+
+    failed = False
+    for name in args.names or available_profiles():
+        try:
+            profile = loader.load(name)
+        except ProfileError as e:
+            failed = True
+            print(f"❌ {e}")
+            continue
+        print(f"✅ {profile.name}: {profile.description or '(no description)'}")
+        for key, value in profile.settings.items():
+            print(f"      {key} = {value!r}")
+    raise SystemExit(1 if failed else 0)
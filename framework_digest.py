@@ -0,0 +1,269 @@
+"""
+Rugby Council AI - Framework Digests
+
+The whole coaching framework went into the shared prefix of every prompt:
+seven copies per council (three plans, three reviews, one synthesis), all
+growing with coaching_framework.md. Only the planners need all of it.
+
+Each stage now gets a digest of the framework suited to its job:
+
+- stage_1 (planning): the full framework, minus the source footer
+- stage_2 (review): a checklist - the Coaching Habits, values and
+  principles to check plans against, one line each
+- stage_3 (synthesis): the key principles - the checklist plus each
+  section's purpose and the one-line meaning of each principle
+
+Digests are built from the framework's markdown structure, with no model
+call, and cached in .cache/framework_digests/ under a hash of the
+framework text, so they are rebuilt only when the file changes.
+
+The shared prompt prefix (see prompt_prefix.py) becomes one prefix per
+stage. Every call in a stage still starts with the same system message, so
+prompt caching still works across the members of a stage and across the
+sessions of a batch; a model that plans, reviews and chairs warms three
+prefixes instead of one.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import config
+import context_packer
+
+DIGEST_DIR = Path(__file__).parent / ".cache" / "framework_digests"
+
+# The framework council.load_coaching_framework reads
+DEFAULT_SOURCE = "coaching_framework"
+
+# Changing how digests are built changes this, so cached ones are rebuilt
+DIGEST_VERSION = 1
+
+PLANNING = "planning"
+REVIEW = "review"
+SYNTHESIS = "synthesis"
+
+STAGE_DIGESTS = {"stage_1": PLANNING, "stage_2": REVIEW, "stage_3": SYNTHESIS}
+
+# A bullet of up to this many words ("Teamwork", "Age group rules") is a
+# list item rather than a statement; so is a longer one that is mostly
+# capitalised, like a name ("Keep Your Boots On methodology")
+ITEM_WORDS = 3
+
+
+@dataclass
+class _Section:
+    title: str
+    paragraphs: List[str] = field(default_factory=list)
+    bullets: List[str] = field(default_factory=list)
+    subsections: List["_Section"] = field(default_factory=list)
+
+
+def _clean(text: str) -> str:
+    return text.replace("**", "").replace("__", "").strip().rstrip(":").strip()
+
+
+def _split(bullet: str) -> Tuple[str, str]:
+    """A bullet's name and description: "**Active** - Players engaged" -> ("Active", "Players engaged")."""
+    parts = re.split(r"\s+[-–—]\s+|:\s", _clean(bullet), maxsplit=1)
+    name = re.sub(r"\s*\([^)]*\)", "", parts[0]).strip()
+    return name, parts[1].strip() if len(parts) > 1 else ""
+
+
+def _is_named(bullet: str) -> bool:
+    words = _split(bullet)[0].split()
+    return len(words) <= ITEM_WORDS or 2 * sum(word[0].isupper() for word in words) > len(words)
+
+
+def parse_sections(framework: str) -> List[_Section]:
+    """The framework's ## sections, with their paragraphs, bullets and ### subsections."""
+    sections: List[_Section] = []
+    current: Optional[_Section] = None
+    for line in framework.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped == "---" or stripped.startswith("# "):
+            continue
+        if stripped.startswith("## "):
+            current = _Section(_clean(stripped[3:]))
+            sections.append(current)
+        elif stripped.startswith("### ") and sections:
+            current = _Section(re.sub(r"^\d+\.\s*", "", _clean(stripped[4:])))
+            sections[-1].subsections.append(current)
+        elif current is None:
+            continue
+        elif re.match(r"^[-*+]\s", stripped):
+            current.bullets.append(stripped[2:].strip())
+        elif not re.match(r"^\*[^*].*\*$", stripped):
+            # Italic lines on their own are notes such as the source footer
+            current.paragraphs.append(_clean(stripped))
+    return sections
+
+
+def _list_line(name: str, bullets: List[str], detail: bool) -> str:
+    # Named items are listed by name - with their descriptions too if
+    # detail is set; statements give their first point (review) or all of
+    # them (synthesis)
+    if all(_is_named(bullet) for bullet in bullets):
+        items = [_split(bullet) for bullet in bullets]
+        if detail and any(description for _, description in items):
+            return f"- {name}: " + "; ".join(f"{item} - {description}" if description else item
+                                             for item, description in items)
+        return f"- {name}: " + ", ".join(item for item, _ in items)
+    if detail:
+        return f"- {name}: " + "; ".join(_clean(bullet) for bullet in bullets)
+    return f"- {name}: {_clean(bullets[0])}"
+
+
+def build_planning_digest(framework: str) -> str:
+    """The full framework for planners, without the source footer and rules."""
+    lines = [line.rstrip() for line in framework.splitlines()
+             if line.strip() != "---" and not re.match(r"^\*[^*].*\*\s*$", line.strip())]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def build_review_digest(framework: str) -> str:
+    """A checklist of what the framework asks of every session, for reviewers."""
+    lines = ["Check each plan against the Trojans Coaching Framework:"]
+    for section in parse_sections(framework):
+        if section.subsections:
+            lines.append(f"- {section.title}:")
+            lines += ["  " + _list_line(sub.title, sub.bullets, detail=False)
+                      for sub in section.subsections if sub.bullets]
+        elif section.bullets:
+            lines.append(_list_line(section.title, section.bullets, detail=False))
+    return "\n".join(lines) if len(lines) > 1 else build_planning_digest(framework)
+
+
+def build_synthesis_digest(framework: str) -> str:
+    """The framework's key principles, for the chairman."""
+    lines = ["Key principles of the Trojans Coaching Framework:"]
+    for section in parse_sections(framework):
+        purpose = f" ({section.paragraphs[0]})" if section.paragraphs and (section.bullets or section.subsections) \
+            else ""
+        if section.subsections:
+            lines.append(f"- {section.title}{purpose}:")
+            lines += ["  " + _list_line(sub.title, sub.bullets, detail=False)
+                      for sub in section.subsections if sub.bullets]
+        elif section.bullets:
+            lines.append(_list_line(section.title + purpose, section.bullets, detail=True))
+        elif section.paragraphs:
+            lines.append(f"- {section.title}: " + " ".join(section.paragraphs))
+    return "\n".join(lines) if len(lines) > 1 else build_planning_digest(framework)
+
+
+BUILDERS = {PLANNING: build_planning_digest, REVIEW: build_review_digest, SYNTHESIS: build_synthesis_digest}
+
+
+def framework_hash(framework: str) -> str:
+    material = f"{DIGEST_VERSION}\n{framework}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class FrameworkDigests:
+    """Every stage's digest of one version of the framework."""
+    source_hash: str
+    full: str
+    digests: Dict[str, str]
+
+    def for_stage(self, stage: str) -> str:
+        """The framework text a stage's prompts carry; the full framework for any other call."""
+        kind = STAGE_DIGESTS.get(stage)
+        return self.digests[kind] if kind else self.full
+
+    def token_counts(self) -> Dict[str, int]:
+        """Estimated tokens of each stage's framework text (see context_packer.estimate_tokens)."""
+        return {stage: context_packer.estimate_tokens(self.for_stage(stage)) for stage in STAGE_DIGESTS}
+
+    def report(self) -> List[str]:
+        """Framework tokens per stage and per council, with digests and without."""
+        full = context_packer.estimate_tokens(self.full)
+        counts = self.token_counts()
+        lines = [f"   {stage:<8} {STAGE_DIGESTS[stage]:<10} {tokens:>6} tokens (full framework {full})"
+                 for stage, tokens in counts.items()]
+        # Each roster member plans and reviews once; the chairman writes one final plan
+        members = {stage: config.STAGE_ROSTERS.get(stage) or config.COUNCIL_MODELS for stage in ("stage_1", "stage_2")}
+        calls = {stage: len(roster) for stage, roster in members.items()}
+        calls["stage_3"] = 1
+        per_council = sum(counts[stage] * count for stage, count in calls.items())
+        without = full * sum(calls.values())
+        lines.append(f"   Per council: {per_council} framework tokens instead of {without} "
+                     f"({100 * (1 - per_council / max(without, 1)):.0f}% fewer)")
+        return lines
+
+
+class DigestCache:
+    """
+    Framework digests on disk, one file per framework version.
+
+    Files are named after their source (the framework file's name) and the
+    hash of its text. Storing a new version removes only older versions of
+    the same source, so digests of different frameworks can share the cache.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self._loaded: Dict[str, FrameworkDigests] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, source: str, key: str) -> Path:
+        return self.cache_dir / f"{source}-{key}.json"
+
+    def get(self, framework: str, source: str = DEFAULT_SOURCE) -> FrameworkDigests:
+        """The digests of this framework text, built only if no cached copy exists."""
+        key = framework_hash(framework)
+        with self._lock:
+            if key in self._loaded:
+                return self._loaded[key]
+            path = self._path(source, key)
+            digests = None
+            if path.exists():
+                try:
+                    digests = json.loads(path.read_text(encoding="utf-8"))["digests"]
+                except (OSError, ValueError, KeyError):
+                    digests = None
+            if digests is None or set(digests) != set(BUILDERS):
+                digests = {kind: build(framework) for kind, build in BUILDERS.items()}
+                self._store(source, key, digests)
+            self._loaded[key] = FrameworkDigests(key, framework, digests)
+            return self._loaded[key]
+
+    def _store(self, source: str, key: str, digests: Dict[str, str]):
+        # Digests of earlier versions of this framework are no longer needed
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(source, key)
+        for old in self.cache_dir.glob(f"{source}-*.json"):
+            if old != path and re.fullmatch(r"[0-9a-f]{64}", old.stem[len(source) + 1:]):
+                old.unlink(missing_ok=True)
+        path.write_text(json.dumps({"digests": digests}, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+_cache: Optional[DigestCache] = None
+
+
+def get_digests(framework: str, source: str = DEFAULT_SOURCE) -> FrameworkDigests:
+    """The shared cache's digests of framework; source names the file it came from."""
+    global _cache
+    if _cache is None:
+        _cache = DigestCache(DIGEST_DIR)
+    return _cache.get(framework, source)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show the framework digest each stage's prompts carry")
+    parser.add_argument("framework", type=Path, nargs="?", default=Path(__file__).parent / "coaching_framework.md")
+    parser.add_argument("--show", choices=sorted(BUILDERS), help="print one digest")
+    args = parser.parse_args()
+
+    found = get_digests(args.framework.read_text(encoding="utf-8"), args.framework.stem)
+    if args.show:
+        print(found.digests[args.show])
+    else:
+        print(f"\nFramework digests ({found.source_hash[:12]}):")
+        print("\n".join(found.report()))
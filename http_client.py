@@ -0,0 +1,170 @@
+"""
+Rugby Council AI - Pooled HTTP Client
+
+call_lm_studio used to call the bare requests.post: a new connection for
+every call, and no second chance. One dropped connection or a server that
+briefly answered 503 took down the whole council run.
+
+All calls now go through one shared requests.Session, which keeps
+connections alive and pools them per server. Connection resets and
+retryable responses (429 and 5xx) are retried with jittered exponential
+backoff, and every request's latency and retry count are recorded.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+
+# Responses worth trying again: rate limiting and server-side errors
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class CallRecord:
+    """
+    Latency and retries for one request.
+
+    Latency covers all attempts; for a streamed call it runs until the
+    response headers arrive, not to the end of the stream.
+    """
+    url: str
+    latency: float
+    attempts: int
+    status: Optional[int]
+
+    @property
+    def retries(self) -> int:
+        return self.attempts - 1
+
+
+class CouncilHTTPClient:
+    """
+    A keep-alive session with a retry and backoff policy.
+
+    Args:
+        max_retries: Extra attempts after the first one fails
+        backoff_base: Delay before the first retry, in seconds
+        backoff_max: Longest delay between attempts, in seconds
+        pool_size: Connections kept open per server
+        sleep: Function used to wait between attempts (replaceable in tests)
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        pool_size: int = 10,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Most recent requests only, so a long-running process doesn't grow forever
+        self.records: Deque[CallRecord] = deque(maxlen=1000)
+        self._lock = threading.Lock()
+        # The last request's record, per thread, so a caller can look up
+        # the retries of the call it just made
+        self._local = threading.local()
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        How long to wait before retry number `attempt` (1 for the first retry).
+
+        Uses "full jitter": a random delay up to the exponential limit, so
+        several clients retrying together don't all hit the server at once.
+        A server's Retry-After header, when given in seconds, takes priority.
+        """
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        limit = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, limit)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """
+        POSTs with retries. Takes the same arguments as requests.post.
+
+        Retries connection errors and 429/5xx responses; other errors (and
+        timeouts, which mean the model is slow rather than the link broken)
+        are raised straight away. After the last attempt the final error is
+        raised, or the final error response is returned for the caller's
+        raise_for_status() to report.
+        """
+        start = time.perf_counter()
+        attempt = 0
+        status = None
+        try:
+            while True:
+                attempt += 1
+                try:
+                    response = self.session.post(url, **kwargs)
+                except requests.exceptions.ConnectionError as e:
+                    if attempt > self.max_retries:
+                        raise
+                    delay = self.backoff_delay(attempt)
+                    print(f"   🔁 Connection problem ({type(e).__name__}), retrying in {delay:.1f}s "
+                          f"(attempt {attempt + 1} of {self.max_retries + 1})")
+                    self._sleep(delay)
+                    continue
+
+                status = response.status_code
+                if status in RETRYABLE_STATUS and attempt <= self.max_retries:
+                    delay = self.backoff_delay(attempt, response.headers.get("Retry-After"))
+                    print(f"   🔁 Server answered {status}, retrying in {delay:.1f}s "
+                          f"(attempt {attempt + 1} of {self.max_retries + 1})")
+                    response.close()
+                    self._sleep(delay)
+                    continue
+                return response
+        finally:
+            record = CallRecord(url, time.perf_counter() - start, attempt, status)
+            self._local.last = record
+            with self._lock:
+                self.records.append(record)
+
+    def last_record(self) -> Optional[CallRecord]:
+        """The record of the last request made from this thread."""
+        return getattr(self._local, "last", None)
+
+    def summary(self) -> str:
+        with self._lock:
+            records = list(self.records)
+        if not records:
+            return "no requests"
+        retries = sum(record.retries for record in records)
+        average = sum(record.latency for record in records) / len(records)
+        return f"{len(records)} requests, {retries} retries, {average:.1f}s average latency"
+
+
+_client: Optional[CouncilHTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> CouncilHTTPClient:
+    """Returns the HTTP client shared by every stage."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = CouncilHTTPClient(
+                max_retries=config.HTTP_MAX_RETRIES,
+                backoff_base=config.HTTP_BACKOFF_BASE,
+                backoff_max=config.HTTP_BACKOFF_MAX,
+                pool_size=config.HTTP_POOL_SIZE,
+            )
+        return _client
@@ -0,0 +1,260 @@
+"""
+Rugby Council AI - Model Lifecycle Control
+
+LM Studio runs one model at a time on a single GPU, so the council has to
+switch models between calls. That used to mean a prompt and input("Press
+Enter when ready..."), so nobody could leave a run (or a batch) unattended,
+and time went by between a model finishing its load and someone noticing.
+
+A model manager makes sure the model a call needs is loaded. Which one is
+used is set by config.MODEL_SWITCH_MODE:
+
+- "manual":   ask you to load it in LM Studio and wait for Enter (the fallback)
+- "none":     do nothing - the server loads whatever model is requested
+- "lmstudio": load and unload models through LM Studio's management API,
+              polling the model list until the model is ready
+
+Every manager times each load, so model loading shows up in the run summary
+as a measured figure rather than going uncounted.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+import config
+import http_client
+
+
+class ModelLoadError(Exception):
+    """A model could not be loaded, or didn't become ready in time."""
+
+
+class ModelManager(ABC):
+    """
+    Base class: loads models and records how long each load took.
+
+    Subclasses implement load() (a manager without one can't be created);
+    callers use ensure_loaded(), which times it.
+    """
+
+    mode = ""
+
+    def __init__(self):
+        self.load_times: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def load(self, model_name: str):
+        """Makes sure model_name is loaded and ready, raising ModelLoadError if it can't be."""
+
+    def ensure_loaded(self, model_name: str) -> float:
+        """
+        Loads the model and records the time taken.
+
+        Returns:
+            Seconds spent loading
+        """
+        start = time.perf_counter()
+        self.load(model_name)
+        seconds = time.perf_counter() - start
+        with self._lock:
+            self.load_times.setdefault(model_name, []).append(seconds)
+        return seconds
+
+    def reset(self):
+        with self._lock:
+            self.load_times = {}
+
+    def report(self) -> List[str]:
+        """One line per model (loads and total time), then the total."""
+        with self._lock:
+            load_times = {name: list(times) for name, times in self.load_times.items()}
+        if not load_times:
+            return []
+        lines = [
+            f"   {name:<28} {len(times)} load(s) {sum(times):8.1f}s"
+            for name, times in load_times.items()
+        ]
+        total = sum(sum(times) for times in load_times.values())
+        lines.append(f"   {'Total model loading (' + self.mode + ')':<38} {total:8.1f}s")
+        return lines
+
+
+class ManualModelManager(ModelManager):
+    """Asks a person to load the model; the recorded time includes their wait."""
+
+    mode = "manual"
+
+    def __init__(self, prompt: Callable[[str], None]):
+        super().__init__()
+        self.prompt = prompt
+
+    def load(self, model_name: str):
+        self.prompt(model_name)
+
+
+class NoOpModelManager(ModelManager):
+    """For servers that load the requested model on their own."""
+
+    mode = "none"
+
+    def load(self, model_name: str):
+        pass
+
+    def report(self) -> List[str]:
+        # Loading happens inside the first request, so there's nothing to time here
+        return []
+
+
+class LMStudioModelManager(ModelManager):
+    """
+    Loads models through LM Studio's management API.
+
+    Before loading, other loaded models are unloaded (when unload_others is
+    set) so they don't compete for GPU memory. The load request is sent, then
+    the model list is polled until the model reports as loaded. Servers
+    without a load endpoint are sent a one-token chat request instead, which
+    triggers LM Studio's just-in-time loading.
+
+    Args:
+        api_url: Management API base URL (e.g. http://localhost:1234/api/v1)
+        base_url: OpenAI-compatible base URL, for the just-in-time fallback
+        load_timeout: Longest wait for a model to become ready, in seconds
+        poll_interval: Time between checks of the model list, in seconds
+        unload_others: Unload other models before loading a new one
+    """
+
+    mode = "lmstudio"
+
+    def __init__(
+        self,
+        api_url: str,
+        base_url: str,
+        load_timeout: float = 300.0,
+        poll_interval: float = 1.0,
+        unload_others: bool = True
+    ):
+        super().__init__()
+        self.api_url = api_url.rstrip("/")
+        self.base_url = base_url.rstrip("/")
+        self.load_timeout = load_timeout
+        self.poll_interval = poll_interval
+        self.unload_others = unload_others
+
+    def list_models(self) -> Dict[str, str]:
+        """Maps each model id the server knows about to its state ("loaded", "not-loaded", ...)."""
+        response = http_client.get_client().session.get(f"{self.api_url}/models", timeout=30)
+        response.raise_for_status()
+        payload = response.json()
+        models = {}
+        # The v0 API lists {"id", "state"}; newer versions list {"key", "loaded_instances"}
+        for entry in payload.get("data", payload.get("models", [])):
+            model_id = entry.get("id") or entry.get("key")
+            if entry.get("loaded_instances"):
+                models[model_id] = "loaded"
+            else:
+                models[model_id] = entry.get("state", "not-loaded")
+        return models
+
+    def loaded_models(self) -> List[str]:
+        return [model_id for model_id, state in self.list_models().items() if state == "loaded"]
+
+    def unload(self, model_name: str):
+        response = http_client.get_client().post(
+            f"{self.api_url}/models/unload", json={"instance_id": model_name}, timeout=60
+        )
+        response.raise_for_status()
+
+    def _request_load(self, model_name: str):
+        response = http_client.get_client().post(
+            f"{self.api_url}/models/load", json={"model": model_name}, timeout=self.load_timeout
+        )
+        if response.status_code in (404, 405):
+            # No load endpoint: asking the model for one token makes LM Studio load it
+            print("   (no model load endpoint - loading through a one-token request)")
+            response = http_client.get_client().post(
+                f"{self.base_url}/chat/completions",
+                json={"model": model_name, "messages": [{"role": "user", "content": "Hi"}], "max_tokens": 1},
+                timeout=self.load_timeout,
+            )
+        response.raise_for_status()
+
+    def load(self, model_name: str):
+        loaded = self.loaded_models()
+        if model_name in loaded:
+            return
+        if self.unload_others:
+            for other in loaded:
+                print(f"   ⏏️  Unloading {other}")
+                self.unload(other)
+
+        print(f"   ⏳ Loading {model_name}...")
+        try:
+            self._request_load(model_name)
+        except requests.exceptions.RequestException as e:
+            raise ModelLoadError(f"LM Studio could not load {model_name}: {e}") from e
+
+        deadline = time.monotonic() + self.load_timeout
+        while True:
+            state = self.list_models().get(model_name)
+            if state == "loaded":
+                return
+            if time.monotonic() > deadline:
+                raise ModelLoadError(
+                    f"{model_name} wasn't ready after {self.load_timeout:.0f}s (last state: {state})"
+                )
+            time.sleep(self.poll_interval)
+
+
+def management_api_url() -> str:
+    """config.LM_STUDIO_API_URL, or the API on the same server as LM_STUDIO_BASE_URL."""
+    if config.LM_STUDIO_API_URL:
+        return config.LM_STUDIO_API_URL
+    base_url = config.LM_STUDIO_BASE_URL.rstrip("/")
+    if base_url.endswith("/v1"):
+        base_url = base_url[:-len("/v1")]
+    return f"{base_url}/api/v1"
+
+
+def create_manager(mode: str, manual_prompt: Optional[Callable[[str], None]] = None) -> ModelManager:
+    """
+    Builds the model manager for a MODEL_SWITCH_MODE.
+
+    Raises:
+        ValueError: If the mode is unknown, or "manual" is given without a prompt
+    """
+    if mode == "manual":
+        if manual_prompt is None:
+            raise ValueError("Manual model switching needs a prompt function")
+        return ManualModelManager(manual_prompt)
+    if mode == "none":
+        return NoOpModelManager()
+    if mode == "lmstudio":
+        return LMStudioModelManager(
+            api_url=management_api_url(),
+            base_url=config.LM_STUDIO_BASE_URL,
+            load_timeout=config.MODEL_LOAD_TIMEOUT,
+            poll_interval=config.MODEL_LOAD_POLL_INTERVAL,
+            unload_others=config.MODEL_UNLOAD_OTHERS,
+        )
+    raise ValueError(f"Unknown MODEL_SWITCH_MODE: {mode!r} (expected manual, none or lmstudio)")
+
+
+_manager: Optional[ModelManager] = None
+_manager_settings: Optional[tuple] = None
+_manager_lock = threading.Lock()
+
+
+def get_manager(manual_prompt: Optional[Callable[[str], None]] = None) -> ModelManager:
+    """Returns the shared model manager, rebuilding it if the switch mode or server has changed."""
+    global _manager, _manager_settings
+    settings = (config.MODEL_SWITCH_MODE, config.LM_STUDIO_BASE_URL, config.LM_STUDIO_API_URL)
+    with _manager_lock:
+        if _manager is None or settings != _manager_settings:
+            _manager = create_manager(config.MODEL_SWITCH_MODE, manual_prompt)
+            _manager_settings = settings
+        return _manager
@@ -0,0 +1,158 @@
+"""
+Rugby Council AI - Incremental Stage 1/2 Pipeline
+
+Stage 2 can't start until every Stage 1 plan exists, so with several
+backends the fast models sit idle while the slowest one finishes its plan,
+and then every reviewer reads every plan from scratch.
+
+With config.STAGE_2_MODE = "incremental" (and a backend pool configured),
+review work starts as soon as each plan arrives:
+
+1. Each plan is scored on its own against a short rubric by one other
+   council member (the next one in config order), while the remaining
+   plans are still being written.
+2. Once every plan is scored, each reviewer makes a short comparative
+   ranking pass over the scorecards, in the usual **Rankings:** format.
+
+Each reviewer's review is their ranking followed by the scorecards they
+wrote, so Stage 3 and consensus.py work exactly as they do for the
+combined review. Stages overlap, so end-to-end time drops towards the
+critical path: the slowest plan, one scorecard and one ranking pass.
+
+This module holds the prompts and the scheduling; council.py supplies the
+calls (see stages_1_and_2_incremental).
+"""
+
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+import backends
+import tournament
+
+# A call the backend pool can run, given its endpoint's base URL
+Task = Callable[[str], str]
+
+RUBRIC = [
+    ("Coaching Habits", "uses all five (Shared Purpose, Progression, Praise, Review, Choice)"),
+    ("TREDS and APES", "aligned with the values and principles"),
+    ("Age-appropriate", "suitable and engaging for the age group"),
+    ("STEP progression", "clear progressions using STEP"),
+    ("Practical", "timings, numbers and setup a coach can run"),
+]
+
+
+def build_scorecard_prompt(label: str, plan: str) -> str:
+    """Builds the prompt asking a council member to score one plan against the rubric."""
+    criteria = "\n".join(f"- {name}: {description}" for name, description in RUBRIC)
+    score_lines = "\n".join(f"{name}: [1-5] - [one line]" for name, _ in RUBRIC)
+    return f"""You are scoring one rugby session plan for Trojans RFC against the Trojans Coaching Framework.
+
+{label.upper()}:
+{plan}
+
+Score each criterion from 1 (poor) to 5 (excellent):
+{criteria}
+
+Provide your scorecard in this format:
+**Scorecard for {label}:**
+{score_lines}
+Total: [out of {5 * len(RUBRIC)}]
+Strength: [the plan's main strength]
+Weakness: [the plan's main weakness]
+Improvement: [one specific improvement]"""
+
+
+def build_ranking_prompt(scorecards_text: str, plan_count: int) -> str:
+    """Builds the short comparative ranking prompt, over the scorecards rather than the plans."""
+    places = [tournament.ordinal(position) for position in range(1, plan_count + 1)]
+    ranking_lines = "\n".join(f"{place}: [Plan X] - [brief reason]" for place in places)
+    return f"""You are ranking {plan_count} rugby session plans for Trojans RFC.
+Each plan has already been scored against the coaching rubric by a member of the council:
+
+{scorecards_text}
+
+Rank the plans from best to worst, weighing the scores and the comments.
+
+Provide your review in this format:
+**Rankings:**
+{ranking_lines}
+
+**Recommended Improvements:**
+[Specific suggestions for how to improve the plans]"""
+
+
+def assign_scorers(model_keys: List[str], scorer_keys: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Who scores each member's plan.
+
+    When the writers also score (the default), each plan goes to the next
+    member in order, so nobody scores their own. A separate Stage 2 roster
+    (scorer_keys) takes the plans in turn.
+    """
+    if scorer_keys is not None and scorer_keys != model_keys:
+        return {key: scorer_keys[index % len(scorer_keys)] for index, key in enumerate(model_keys)}
+    if len(model_keys) == 1:
+        return {model_keys[0]: model_keys[0]}
+    return {key: model_keys[(index + 1) % len(model_keys)] for index, key in enumerate(model_keys)}
+
+
+def combine_review(ranking: str, own_scorecards: List[str]) -> str:
+    """A reviewer's review: their ranking, then the scorecards they wrote as the detailed feedback."""
+    if not own_scorecards:
+        return ranking
+    return ranking.rstrip() + "\n\n**Detailed Feedback:**\n\n" + "\n\n".join(own_scorecards)
+
+
+def run_incremental(
+    pool: backends.BackendPool,
+    plan_tasks: Dict[str, Task],
+    existing_plans: Dict[str, str],
+    score_task: Callable[[str, str], Tuple[str, Task]],
+    rank_tasks: Callable[[Dict[str, Tuple[str, str]]], Dict[str, Task]],
+    on_plans_done: Optional[Callable[[], None]] = None
+) -> Tuple[Dict[str, str], Dict[str, Tuple[str, str]], Dict[str, str]]:
+    """
+    Runs Stage 1 and Stage 2 as one pipeline on the backend pool.
+
+    Args:
+        pool: Backend pool to run the calls on
+        plan_tasks: Plan calls still to make, by author
+        existing_plans: Plans already written (e.g. from a checkpoint), scored straight away
+        score_task: Given an author and their plan, returns (scorer, call) for its scorecard
+        rank_tasks: Given every scorecard (author -> (scorer, text)), returns the
+                    ranking calls to make, by reviewer
+        on_plans_done: Called once, as soon as every plan exists
+
+    Returns:
+        Plans by author, scorecards by author as (scorer, text), and ranking replies by reviewer
+    """
+    plans = dict(existing_plans)
+    scorecards: Dict[str, Tuple[str, str]] = {}
+    running = {}
+
+    def start_scoring(author: str, plan: str):
+        scorer, task = score_task(author, plan)
+        running[pool.submit(scorer, task)] = ("score", author, scorer)
+
+    for author, task in plan_tasks.items():
+        running[pool.submit(author, task)] = ("plan", author, author)
+    for author, plan in existing_plans.items():
+        start_scoring(author, plan)
+    if not plan_tasks and on_plans_done:
+        on_plans_done()
+
+    while running:
+        finished, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in finished:
+            kind, author, model_key = running.pop(future)
+            result = future.result()
+            if kind == "plan":
+                plans[author] = result
+                start_scoring(author, result)
+                if len(plans) == len(existing_plans) + len(plan_tasks) and on_plans_done:
+                    on_plans_done()
+            else:
+                scorecards[author] = (model_key, result)
+
+    rankings = pool.run(rank_tasks(scorecards))
+    return plans, scorecards, rankings
@@ -0,0 +1,239 @@
+"""
+Rugby Council AI - Plan Linter
+
+The case study's final plan gave 65 minutes of activities for a 60-minute
+session, and nothing noticed: the only checks were a person reading the
+output or another full council run.
+
+The linter checks a plan against its session parameters without asking
+a model, so it costs nothing to run on every Stage 1 plan and every final
+plan:
+
+- DURATION: the activity times add up to the session length
+- RATIO: the players per coach, and any "groups of N", suit the age group
+- HABITS: all five Coaching Habits are there
+- SECTIONS: objectives, warm-up, main activity, game, cool-down and
+  coaching points are all there
+
+Structured plans (see structured.py) are checked from their fields;
+markdown plans from their headings, e.g. "## Warm-up: Tag Gates (10 min)".
+
+A plan with errors can be sent back to the model that wrote it with a
+short prompt listing only what is wrong (build_fix_prompt), which is far
+cheaper than planning it again. Which plans get one is set by
+config.LINT_FIX. Every saved session ends with the results for each plan.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import config
+import structured
+from session_params import SessionParams, parse_session_params
+
+ERROR = "error"
+WARNING = "warning"
+
+CHECKS_HEADING = "Plan Checks"
+
+HABITS = ("Shared Purpose", "Progression", "Praise", "Review", "Choice")
+
+# Section name -> words that show it is there, in a heading or bold label
+SECTIONS = {
+    "Session Objectives": ("objective",),
+    "Warm-up": ("warm-up", "warm up", "warmup"),
+    "Main Activity": ("main activity", "main activities", "skill"),
+    "Game": ("game",),
+    "Cool-down": ("cool-down", "cool down", "cooldown"),
+    "Coaching Points": ("coaching point",),
+}
+
+# Structured plan phases -> the section they provide
+PHASE_SECTIONS = {"warm-up": "Warm-up", "skill": "Main Activity", "game": "Game", "cool-down": "Cool-down"}
+
+# Most players one coach should run an activity for: (oldest age group, players)
+PLAYERS_PER_COACH = ((8, 8), (12, 10))
+OLDER_PLAYERS_PER_COACH = 12
+
+_LABEL = re.compile(r"^\s*(?:#{1,6}\s|\*\*|(?:\d+[.)]|[-*])\s+\*\*)")
+_DURATION = re.compile(r"[(\[:–—-]\s*(\d{1,3})\s*(?:minutes?|mins?)\b", re.IGNORECASE)
+_RANGE = re.compile(r"\d+\s*[-–]\s*\d+\s*(?:minutes?|mins?)\b", re.IGNORECASE)
+_GROUPS = re.compile(r"\bgroups? of (\d{1,2})\b", re.IGNORECASE)
+
+
+@dataclass
+class LintIssue:
+    """One problem with a plan."""
+    code: str
+    message: str
+    severity: str = ERROR
+
+
+@dataclass
+class LintReport:
+    """Everything the linter found in one plan."""
+    issues: List[LintIssue] = field(default_factory=list)
+    total_minutes: Optional[int] = None
+
+    @property
+    def errors(self) -> List[LintIssue]:
+        return [issue for issue in self.issues if issue.severity == ERROR]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def summary(self) -> str:
+        if not self.issues:
+            return "no problems found"
+        warnings = len(self.issues) - len(self.errors)
+        parts = [f"{len(self.errors)} error(s)"] + ([f"{warnings} warning(s)"] if warnings else [])
+        return ", ".join(parts) + ": " + "; ".join(issue.message for issue in self.issues)
+
+    def to_markdown(self) -> str:
+        if not self.issues:
+            return "✅ No problems found"
+        return "\n".join(f"- {'❌' if issue.severity == ERROR else '⚠️'} {issue.message}" for issue in self.issues)
+
+
+def max_players_per_coach(age: Optional[int]) -> int:
+    """The most players per coach for an age group (older groups if it isn't known)."""
+    if age is not None:
+        for oldest, players in PLAYERS_PER_COACH:
+            if age <= oldest:
+                return players
+    return OLDER_PLAYERS_PER_COACH
+
+
+def _labels(text: str) -> List[str]:
+    """Headings and bold labels: where markdown plans name their sections and activities."""
+    return [line.strip() for line in text.splitlines() if _LABEL.match(line)]
+
+
+def markdown_minutes(text: str) -> Optional[int]:
+    """
+    The total of the activity times in a markdown plan, or None if it has none.
+
+    Times are read from headings such as "## Warm-up: Tag Gates (10 min)",
+    or from bold labels if no heading has one. Totals and time ranges
+    ("0-10 min") are skipped, as they aren't one activity's length, and so
+    is the plan's title.
+    """
+    timed: Dict[bool, List[int]] = {True: [], False: []}
+    for line in _labels(text):
+        lowered = line.lower()
+        if line.startswith("# ") or "total" in lowered or "duration" in lowered or _RANGE.search(line):
+            continue
+        found = _DURATION.search(line)
+        if found:
+            timed[line.startswith("#")].append(int(found.group(1)))
+    minutes = timed[True] or timed[False]
+    return sum(minutes) if minutes else None
+
+
+def _check_duration(total: Optional[int], params: SessionParams) -> List[LintIssue]:
+    if total is None:
+        return [LintIssue("DURATION", "No activity times found", WARNING)]
+    if params.duration_minutes and total != params.duration_minutes:
+        return [LintIssue("DURATION", f"Activities add up to {total} minutes, but the session is "
+                                      f"{params.duration_minutes} minutes")]
+    return []
+
+
+def _check_ratio(text: str, params: SessionParams) -> List[LintIssue]:
+    limit = max_players_per_coach(params.age)
+    who = f"{params.age_group} players" if params.age_group else "players"
+    issues = []
+    if params.players and params.coaches and params.players / params.coaches > limit:
+        issues.append(LintIssue("RATIO", f"{params.players} players with {params.coaches} coaches is more than "
+                                         f"{limit} {who} per coach; the plan needs extra helpers or fewer groups",
+                                WARNING))
+    for size in sorted({int(size) for size in _GROUPS.findall(text)}):
+        if size > limit:
+            issues.append(LintIssue("RATIO", f"Groups of {size} are too big for one coach "
+                                             f"(at most {limit} {who})"))
+    return issues
+
+
+def _check_habits(present: List[str]) -> List[LintIssue]:
+    missing = [habit for habit in HABITS if habit not in present]
+    if missing:
+        return [LintIssue("HABITS", "Missing Coaching Habit(s): " + ", ".join(missing))]
+    return []
+
+
+def _check_sections(present: List[str]) -> List[LintIssue]:
+    missing = [section for section in SECTIONS if section not in present]
+    if missing:
+        return [LintIssue("SECTIONS", "Missing section(s): " + ", ".join(missing))]
+    return []
+
+
+def lint_plan(plan_text: str, session_params: str) -> LintReport:
+    """
+    Checks a plan (structured or markdown) against its session parameters.
+
+    Args:
+        plan_text: The plan, as a model returned it
+        session_params: The session parameters the plan was written for
+
+    Returns:
+        The issues found; report.ok is True if none of them are errors
+    """
+    params = parse_session_params(session_params)
+    plan = structured.try_parse(plan_text)
+    if plan:
+        total = structured.total_minutes(plan)
+        text = structured.render_markdown(plan)
+        named = {habit["habit"].strip().lower() for habit in plan["coaching_habits"]}
+        habits = [habit for habit in HABITS if habit.lower() in named]
+        sections = ["Session Objectives", "Coaching Points"] + [
+            PHASE_SECTIONS[phase] for phase in {activity["phase"] for activity in plan["activities"]}
+        ]
+    else:
+        total = markdown_minutes(plan_text)
+        text = plan_text
+        lowered = plan_text.lower()
+        habits = [habit for habit in HABITS if re.search(rf"\b{habit.lower()}\b", lowered)]
+        labels = "\n".join(_labels(plan_text)).lower()
+        sections = [section for section, words in SECTIONS.items() if any(word in labels for word in words)]
+
+    issues = (_check_duration(total, params) + _check_ratio(text, params)
+              + _check_habits(habits) + _check_sections(sections))
+    return LintReport(issues, total)
+
+
+def fixes_stage(stage: str) -> bool:
+    """Whether plans from this stage get a fix-up request when they fail (config.LINT_FIX)."""
+    if not config.LINT_PLANS:
+        return False
+    stages = {"all": ("stage_1", "stage_3"), "final": ("stage_3",)}.get(config.LINT_FIX, ())
+    return stage in stages
+
+
+def build_fix_prompt(plan_text: str, report: LintReport, session_params: str) -> str:
+    """
+    Asks for a failing plan to be corrected, listing only what is wrong.
+
+    Much shorter than the original prompt: no reviews, no other plans, just
+    the plan and its problems.
+    """
+    problems = "\n".join(f"- {issue.message}" for issue in report.errors)
+    return f"""A check of your session plan found these problems:
+{problems}
+
+SESSION PARAMETERS:
+{session_params}
+
+YOUR PLAN:
+{plan_text}
+
+Fix only these problems - for example, adjust activity times so they add up
+to the session length - and keep everything else as it is. Return the
+complete corrected session plan in the same format."""
+
+
+def format_checks(reports: Dict[str, LintReport]) -> str:
+    """The lint results for each plan, for the saved session."""
+    return "\n\n".join(f"### {name}\n\n{report.to_markdown()}" for name, report in reports.items())
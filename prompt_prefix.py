@@ -0,0 +1,122 @@
+"""
+Rugby Council AI - Shared Prompt Prefix
+
+Every stage sends the whole coaching framework. It used to sit in the middle
+of each prompt, with request-specific text both before and after it, so the
+server had to process all of it again on every call.
+
+Servers with prompt caching (LM Studio, llama.cpp) can skip work for the part
+of a prompt that matches the start of the previous one. So every prompt now
+starts with the same prefix: a system message with the council's role and
+the framework. Only the stage-specific instructions, plans and reviews come
+after it. Once a model has seen the prefix, later calls to that model only
+pay for the variable part.
+
+Optionally (config.PREFIX_WARMUP) each model is sent the prefix on its own
+once per run, the first time it's used, so even its first real call starts
+from a warm cache. Prompt-processing time is recorded per call so the saving
+can be seen in the run summary.
+
+With config.FRAMEWORK_DIGESTS on, each stage's prefix carries that stage's
+digest of the framework instead of the whole of it (see framework_digest.py),
+so there is one prefix per stage rather than one per run.
+"""
+
+import threading
+from typing import Callable, List, Optional, Set, Tuple
+
+import config
+import framework_digest
+
+COUNCIL_SYSTEM_PROMPT = """You are a member of the Trojans RFC coaching council: experienced rugby coaches who design, review and refine youth training sessions together.
+
+Everything you produce must follow the Trojans Coaching Framework below."""
+
+
+def build_shared_prefix(framework: str) -> str:
+    """The system message every council prompt starts with."""
+    return f"""{COUNCIL_SYSTEM_PROMPT}
+
+COACHING FRAMEWORK:
+{framework}"""
+
+
+def build_stage_prefix(framework: str, stage: str) -> str:
+    """The system message for one stage's prompts: the shared prefix, with the stage's framework digest if enabled."""
+    if config.FRAMEWORK_DIGESTS:
+        framework = framework_digest.get_digests(framework).for_stage(stage)
+    return build_shared_prefix(framework)
+
+
+def extract_prompt_time(result: dict) -> Optional[float]:
+    """
+    Finds the prompt-processing time (seconds) in a non-streaming reply, if the server reports it.
+
+    llama.cpp-based servers send timings.prompt_ms; LM Studio's native API
+    sends stats.time_to_first_token. Plain OpenAI-compatible servers send
+    neither, in which case this returns None.
+    """
+    timings = result.get("timings") or {}
+    if "prompt_ms" in timings:
+        return timings["prompt_ms"] / 1000
+    stats = result.get("stats") or {}
+    if "time_to_first_token" in stats:
+        return float(stats["time_to_first_token"])
+    return None
+
+
+class PromptTimings:
+    """Prompt-processing time per call, for the end-of-run report."""
+
+    def __init__(self):
+        self._records: List[Tuple[str, str, float]] = []
+        self._lock = threading.Lock()
+
+    def record(self, model_name: str, kind: str, seconds: float):
+        with self._lock:
+            self._records.append((model_name, kind, seconds))
+
+    def clear(self):
+        with self._lock:
+            self._records = []
+
+    def report(self) -> List[str]:
+        """One line per call, then the total."""
+        with self._lock:
+            records = list(self._records)
+        if not records:
+            return []
+        lines = [f"   {model_name:<28} {kind:<8} {seconds:6.2f}s" for model_name, kind, seconds in records]
+        lines.append(f"   {'Total prompt processing':<37} {sum(r[2] for r in records):6.2f}s")
+        return lines
+
+
+class PrefixWarmer:
+    """Sends each model the shared prefix once, so its first real call hits a warm cache."""
+
+    def __init__(self):
+        self._warmed: Set[Tuple[str, int]] = set()
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._warmed = set()
+
+    def warm(self, model_name: str, prefix: str, send: Callable[[], None]) -> bool:
+        """
+        Runs send() the first time this model meets this prefix.
+
+        Returns:
+            True if a warm-up call was made
+        """
+        key = (model_name, hash(prefix))
+        with self._lock:
+            if key in self._warmed:
+                return False
+            self._warmed.add(key)
+        send()
+        return True
+
+
+timings = PromptTimings()
+warmer = PrefixWarmer()
@@ -0,0 +1,161 @@
+"""
+Rugby Council AI - Near-Duplicate Request Detection
+
+Coaches often ask for the same session in different words - "U10s 60
+minutes breakdown decisions" and "60 mins, U10s, decision making at the
+breakdown" - and each one used to cost a full council run.
+
+Before a run, the request is compared with every archived run (see
+archive.py):
+
+- the structured fields (duration, age group, players, coaches; see
+  session_params.py) must be compatible: the same age group, and duration
+  and numbers within a small tolerance when both requests give them
+- the focus is compared by TF-IDF cosine similarity over normalised words
+  ("decisions", "decision-making" and "decide" all count as the same word)
+
+When the best match reaches config.REQUEST_MATCH_THRESHOLD, the earlier run
+can be reused as it is, or its Stage 1 plans can seed the new run so only
+Stages 2 and 3 are run again (config.REQUEST_MATCH_ACTION).
+"""
+
+import math
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from archive import ArchivedSession
+from session_params import SessionParams, parse_session_params
+
+ACTIONS = ["off", "ask", "reuse_result", "reuse_plans"]
+
+STOPWORDS = set("""a an and around at the to of on in for with into from by our their its is are be
+                 session sessions focus focusing work working about using use making""".split())
+
+# Words coaches use interchangeably, mapped to one form (after stemming)
+SYNONYMS = {
+    "decid": "decision", "decis": "decision", "choic": "decision", "choos": "decision",
+    "ruck": "breakdown", "contact": "tackl",
+    "handl": "pass",
+    "defenc": "defend", "defens": "defend",
+}
+
+# How far durations and head counts can differ and still count as the same session
+DURATION_TOLERANCE = 0.15
+COUNT_TOLERANCE = 0.2
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ions", "ion", "es", "ed", "s", "e"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def normalise_words(text: str) -> List[str]:
+    """Lower-cased, stemmed words with stopwords removed and synonyms merged."""
+    words = []
+    for word in re.findall(r"[a-z]+", text.lower()):
+        if word in STOPWORDS or len(word) < 3:
+            continue
+        stem = _stem(word)
+        words.append(SYNONYMS.get(stem, stem))
+    return words
+
+
+def _close(a: Optional[int], b: Optional[int], tolerance: float) -> bool:
+    # Unknown on either side counts as compatible
+    if a is None or b is None:
+        return True
+    return abs(a - b) <= tolerance * max(a, b)
+
+
+def fields_compatible(a: SessionParams, b: SessionParams) -> bool:
+    """Whether two requests could be the same session, going by their structured fields."""
+    if a.age_group and b.age_group and a.age_group != b.age_group:
+        return False
+    return (
+        _close(a.duration_minutes, b.duration_minutes, DURATION_TOLERANCE)
+        and _close(a.players, b.players, COUNT_TOLERANCE)
+        and _close(a.coaches, b.coaches, COUNT_TOLERANCE)
+    )
+
+
+class TfidfIndex:
+    """TF-IDF vectors for a set of documents, compared by cosine similarity."""
+
+    def __init__(self, documents: List[List[str]]):
+        self.documents = documents
+        count = len(documents)
+        document_frequency = Counter(word for words in documents for word in set(words))
+        # Smoothed, so words in every document still count for something
+        self.idf = {word: math.log((1 + count) / (1 + df)) + 1 for word, df in document_frequency.items()}
+        self.vectors = [self.vector(words) for words in documents]
+
+    def vector(self, words: List[str]) -> Dict[str, float]:
+        counts = Counter(words)
+        weights = {word: count * self.idf.get(word, 1.0) for word, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {word: weight / norm for word, weight in weights.items()} if norm else {}
+
+    def similarities(self, words: List[str]) -> List[float]:
+        query = self.vector(words)
+        return [sum(weight * vector.get(word, 0.0) for word, weight in query.items()) for vector in self.vectors]
+
+
+@dataclass
+class RequestMatch:
+    """An archived run that looks like the same request."""
+    session: ArchivedSession
+    similarity: float
+
+    def summary(self) -> str:
+        return (f"{self.similarity:.0%} match: \"{self.session.session_params}\" "
+                f"({self.session.created[:10]}, {self.session.session_file})")
+
+
+def find_matches(session_params: str, candidates: List[ArchivedSession], limit: int = 3) -> List[RequestMatch]:
+    """
+    Ranks archived runs by how closely they match a request.
+
+    Runs whose structured fields are incompatible are left out. The rest are
+    scored by focus similarity, best first.
+    """
+    params = parse_session_params(session_params)
+    compatible = [
+        candidate for candidate in candidates
+        if fields_compatible(params, parse_session_params(candidate.session_params))
+    ]
+    if not compatible:
+        return []
+    # Compare focuses; fall back to the whole request when no focus could be read
+    index = TfidfIndex([normalise_words(c.focus or c.session_params) for c in compatible])
+    scores = index.similarities(normalise_words(params.focus or session_params))
+    matches = [RequestMatch(candidate, score) for candidate, score in zip(compatible, scores)]
+    return sorted(matches, key=lambda match: match.similarity, reverse=True)[:limit]
+
+
+def best_match(session_params: str, candidates: List[ArchivedSession], threshold: float) -> Optional[RequestMatch]:
+    """The closest archived run, if it reaches threshold."""
+    matches = find_matches(session_params, candidates, limit=1)
+    return matches[0] if matches and matches[0].similarity >= threshold else None
+
+
+def ask_what_to_do(match: RequestMatch) -> str:
+    """
+    Asks the user whether to reuse a matching earlier run. Returns one of ACTIONS.
+
+    With nobody at the terminal (stdin isn't a TTY) nothing is reused.
+    """
+    print(f"\n🔁 This request looks like an earlier council run:")
+    print(f"   {match.summary()}")
+    if not sys.stdin or not sys.stdin.isatty():
+        print("   (not asking - no terminal; running a new council)")
+        return "off"
+    print("\n   [r] Reuse the earlier result (no model calls)")
+    print("   [p] Reuse its Stage 1 plans, and rerun the reviews and synthesis")
+    print("   [n] Run a new council")
+    answer = input("\nChoose r, p or n [n]: ").strip().lower()
+    return {"r": "reuse_result", "p": "reuse_plans"}.get(answer[:1], "off")
@@ -0,0 +1,128 @@
+"""
+Rugby Council AI - Persistent Response Cache
+
+Every council run used to call every model again, even when nothing about
+the call had changed. Iterating on the chairman prompt meant sitting through
+stages 1 and 2 again for answers we already had.
+
+This cache sits in front of call_lm_studio. Each response is stored on disk
+under a hash of everything that determines it - model name, prompt,
+temperature and max_tokens - so a stage whose inputs haven't changed comes
+straight back from disk. The cache is bounded in size and evicts the least
+recently used entries first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import config
+
+
+class ResponseCache:
+    """
+    Content-addressed, size-bounded LRU cache of model responses.
+
+    Entries are one JSON file each; a file's modification time records when
+    it was last used, which is all the LRU policy needs.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_name: str, prompt, temperature: float, max_tokens: int) -> str:
+        """
+        Hashes the inputs that determine a response.
+
+        prompt can be a string or a list of chat messages - anything that
+        serialises to JSON.
+        """
+        material = json.dumps(
+            {"model": model_name, "prompt": prompt, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached response for key, or None on a miss."""
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                # Mark as recently used
+                os.utime(path, None)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry["response"]
+
+    def put(self, key: str, response: str, model_name: str = ""):
+        """Stores a response, then evicts old entries if the cache is over its size limit."""
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"model": model_name, "created": time.time(), "response": response}, f)
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        # Oldest use first
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Removes every cached response."""
+        with self._lock:
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = f"{100 * self.hits / lookups:.0f}%" if lookups else "n/a"
+        return f"{self.hits} hits, {self.misses} misses ({rate} hit rate), {self.evictions} evicted"
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Returns the shared response cache, or None when caching is turned off."""
+    global _cache
+    if not config.RESPONSE_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ResponseCache(
+            Path(__file__).parent / ".cache" / "responses",
+            max_bytes=int(config.RESPONSE_CACHE_MAX_MB * 1024 * 1024)
+        )
+    return _cache
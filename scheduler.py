@@ -0,0 +1,185 @@
+"""
+Rugby Council AI - Model Swap Scheduler
+
+Loading a model in LM Studio takes minutes, and on our hardware that load
+time dominates a council run. The stages themselves only care that every
+stage 1 plan exists before reviewing starts, and every review exists before
+the chairman writes the final plan - the order of calls *within* a stage is
+free. This module uses that freedom to order the calls so each model is
+loaded as few times as possible.
+
+For the default three-model council the stage-by-stage order needs seven
+loads. Scheduled, the last stage 1 model also does the first review and the
+chairman reviews last so stage 3 reuses it, which brings that down to five.
+"""
+
+from dataclasses import dataclass, field
+from typing import Collection, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class CouncilCall:
+    """
+    One model call in the council: which stage it belongs to and which model makes it.
+
+    session_id tells calls apart when several sessions are planned in one
+    batch (see batch.py); it is empty for a single council run.
+    """
+    stage: int
+    model_key: str
+    session_id: str = ""
+
+
+@dataclass
+class Schedule:
+    """
+    An ordered list of council calls plus the load counts that justify it.
+
+    naive_loads is how many model loads the plain stage-by-stage order
+    (config order for every stage) would need; model_loads is how many the
+    scheduled order needs.
+    """
+    calls: List[CouncilCall] = field(default_factory=list)
+    naive_loads: int = 0
+    model_loads: int = 0
+
+    @property
+    def swaps_saved(self) -> int:
+        return self.naive_loads - self.model_loads
+
+    def order_for_stage(self, stage: int) -> List[str]:
+        """Model keys for one stage, in the order they should run."""
+        order = []
+        for call in self.calls:
+            if call.stage == stage and call.model_key not in order:
+                order.append(call.model_key)
+        return order
+
+    def summary(self) -> str:
+        return (f"{self.model_loads} model loads "
+                f"(saves {self.swaps_saved} of {self.naive_loads} with stage-by-stage order)")
+
+
+def build_council_graph(
+    model_keys: Sequence[str],
+    chairman: str,
+    completed: Collection[CouncilCall] = (),
+    reviewer_keys: Optional[Sequence[str]] = None
+) -> List[List[CouncilCall]]:
+    """
+    Builds the stage dependency graph for a single council run.
+
+    The graph is returned as layers: every call in a layer depends on all of
+    the calls in the layers before it, and on nothing inside its own layer.
+
+    Args:
+        model_keys: Council members, in config order
+        chairman: Model key of the chairman
+        completed: Calls that already have a result (e.g. from a checkpoint)
+                   and so don't need scheduling
+        reviewer_keys: Stage 2 reviewers, when they aren't the plan writers
+                       (see config.STAGE_ROSTERS)
+
+    Returns:
+        [stage 1 calls, stage 2 calls, stage 3 calls]
+    """
+    layers = [
+        [CouncilCall(1, key) for key in model_keys],
+        [CouncilCall(2, key) for key in (model_keys if reviewer_keys is None else reviewer_keys)],
+        [CouncilCall(3, chairman)],
+    ]
+    return [[call for call in layer if call not in completed] for layer in layers]
+
+
+def count_model_loads(model_sequence: Sequence[str], loaded_model: Optional[str] = None) -> int:
+    """Counts how many times the model changes when calls run in this order."""
+    loads = 0
+    current = loaded_model
+    for model_key in model_sequence:
+        if model_key != current:
+            loads += 1
+            current = model_key
+    return loads
+
+
+def _group_by_model(layer: Sequence[CouncilCall]) -> Dict[str, List[CouncilCall]]:
+    # Calls for the same model always run back to back, so a layer only
+    # ever costs one load per distinct model (minus any reuse on entry)
+    groups: Dict[str, List[CouncilCall]] = {}
+    for call in layer:
+        groups.setdefault(call.model_key, []).append(call)
+    return groups
+
+
+def _endpoint_choices(models: List[str]) -> List[Tuple[str, str]]:
+    # A layer with one model starts and ends on it; otherwise any two
+    # different models can open and close the layer
+    if len(models) == 1:
+        return [(models[0], models[0])]
+    return [(first, last) for first in models for last in models if first != last]
+
+
+def plan_schedule(
+    layers: Sequence[Sequence[CouncilCall]],
+    loaded_model: Optional[str] = None
+) -> Schedule:
+    """
+    Orders calls across all layers to minimise the number of model loads.
+
+    Inside a layer calls are grouped by model, so the only decision that
+    matters is which model opens the layer and which closes it: a load is
+    saved whenever a layer opens with the model the previous layer closed
+    on. That is a small dynamic programme over "which model is loaded at the
+    end of each layer", which gives the true minimum rather than a greedy
+    guess.
+
+    Args:
+        layers: Dependency layers, e.g. from build_council_graph()
+        loaded_model: Model already loaded before the run starts, if known
+
+    Returns:
+        The scheduled Schedule
+    """
+    grouped = [_group_by_model(layer) for layer in layers]
+
+    # best[last_model] = (loads so far, [(first, last) per layer])
+    best: Dict[Optional[str], Tuple[int, List[Tuple[str, str]]]] = {loaded_model: (0, [])}
+    for groups in grouped:
+        models = list(groups)
+        if not models:
+            continue
+        next_best: Dict[Optional[str], Tuple[int, List[Tuple[str, str]]]] = {}
+        for previous_last, (loads, path) in best.items():
+            for first, last in _endpoint_choices(models):
+                cost = loads + len(models) - (1 if first == previous_last else 0)
+                if last not in next_best or cost < next_best[last][0]:
+                    next_best[last] = (cost, path + [(first, last)])
+        best = next_best
+
+    model_loads, endpoints = min(best.values(), key=lambda entry: entry[0])
+
+    calls: List[CouncilCall] = []
+    non_empty = [groups for groups in grouped if groups]
+    for groups, (first, last) in zip(non_empty, endpoints):
+        middle = [key for key in groups if key not in (first, last)]
+        order = [first] + middle + ([last] if last != first else [])
+        for model_key in order:
+            calls.extend(groups[model_key])
+
+    naive_sequence = [call.model_key for layer in layers for call in layer]
+    return Schedule(
+        calls=calls,
+        naive_loads=count_model_loads(naive_sequence, loaded_model),
+        model_loads=model_loads,
+    )
+
+
+def plan_council_schedule(
+    model_keys: Sequence[str],
+    chairman: str,
+    loaded_model: Optional[str] = None,
+    completed: Collection[CouncilCall] = (),
+    reviewer_keys: Optional[Sequence[str]] = None
+) -> Schedule:
+    """Convenience wrapper: schedule a single three-stage council run."""
+    return plan_schedule(build_council_graph(model_keys, chairman, completed, reviewer_keys), loaded_model)
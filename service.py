@@ -0,0 +1,352 @@
+"""
+Rugby Council AI - Council Service
+
+`python council.py` plans one session and exits, so every run reloads the
+config and framework, and the GPU sits idle between manual runs.
+
+The service is a long-running local HTTP server. Coaches (or scripts)
+submit session requests, which go into a persistent job queue (a SQLite
+database, sessions/jobs.db). A single worker takes every queued job,
+waiting config.SERVICE_BATCH_WINDOW seconds for others to arrive, and plans
+them together with batch.run_batch - so the calls are grouped by model
+across jobs, and each model is loaded about once per stage for the whole
+group rather than once per job.
+
+    python service.py
+
+    POST /jobs               {"session_params": "60 minutes, U10s, ...",
+                              "profile": "creative-council"}  (profile optional)
+                             -> 202 {"id": ..., "status": "queued"}
+    GET  /jobs               every job, newest first
+    GET  /jobs/<id>          the job; once done, "result" holds the saved session
+    GET  /jobs/<id>/events   server-sent events, one per status change,
+                             ending when the job is done or has failed
+
+Jobs with different profiles (see council_profiles.py) are planned in
+separate groups, each with its profile applied; profile files are read
+again when they change, so there's no need to restart the service.
+
+Jobs that were running when the service stopped are queued again when it
+starts, and pick up from their checkpoints (see checkpoint.py).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import batch
+import config
+import council
+import council_profiles
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED = (DONE, FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    session_params TEXT NOT NULL,
+    profile TEXT,
+    status TEXT NOT NULL,
+    created TEXT NOT NULL,
+    started TEXT,
+    finished TEXT,
+    output_file TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created);
+"""
+
+
+@dataclass
+class Job:
+    """A session request and where it has got to."""
+    id: str
+    session_params: str
+    status: str
+    created: str
+    profile: Optional[str] = None
+    started: Optional[str] = None
+    finished: Optional[str] = None
+    output_file: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self, include_result: bool = False) -> Dict:
+        data = asdict(self)
+        if include_result and self.status == DONE and self.output_file and Path(self.output_file).exists():
+            data["result"] = Path(self.output_file).read_text(encoding="utf-8")
+        return data
+
+
+class JobQueue:
+    """Persistent job queue in a SQLite database; safe to use from several threads."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        # Wakes the worker when a job is submitted
+        self.submitted = threading.Event()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.executescript(_SCHEMA)
+        columns = {row["name"] for row in connection.execute("PRAGMA table_info(jobs)")}
+        if "profile" not in columns:
+            # Queues created before jobs could have a profile
+            connection.execute("ALTER TABLE jobs ADD COLUMN profile TEXT")
+        return connection
+
+    def submit(self, session_params: str, profile: Optional[str] = None) -> Job:
+        job = Job(uuid.uuid4().hex[:12], session_params, QUEUED, datetime.now().isoformat(timespec="seconds"),
+                  profile)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT INTO jobs (id, session_params, profile, status, created) VALUES (?, ?, ?, ?, ?)",
+                (job.id, job.session_params, job.profile, job.status, job.created),
+            )
+        self.submitted.set()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with closing(self._connect()) as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(**row) if row else None
+
+    def jobs(self, limit: int = 100) -> List[Job]:
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT * FROM jobs ORDER BY created DESC LIMIT ?", (limit,)).fetchall()
+        return [Job(**row) for row in rows]
+
+    def claim(self, limit: int) -> List[Job]:
+        """
+        Marks up to limit of the oldest queued jobs as running and returns them.
+
+        The jobs all share the oldest job's profile, so they can run as one batch.
+        """
+        started = datetime.now().isoformat(timespec="seconds")
+        with closing(self._connect()) as connection, connection:
+            oldest = connection.execute(
+                "SELECT profile FROM jobs WHERE status = ? ORDER BY created LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if oldest is None:
+                return []
+            rows = connection.execute(
+                "SELECT * FROM jobs WHERE status = ? AND profile IS ? ORDER BY created LIMIT ?",
+                (QUEUED, oldest["profile"], limit),
+            ).fetchall()
+            connection.executemany(
+                "UPDATE jobs SET status = ?, started = ? WHERE id = ?",
+                [(RUNNING, started, row["id"]) for row in rows],
+            )
+        return [Job(**{**dict(row), "status": RUNNING, "started": started}) for row in rows]
+
+    def finish(self, job_id: str, output_file: Optional[Path] = None, error: Optional[str] = None):
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, finished = ?, output_file = ?, error = ? WHERE id = ?",
+                (FAILED if error else DONE, datetime.now().isoformat(timespec="seconds"),
+                 str(output_file) if output_file else None, error, job_id),
+            )
+
+    def requeue_interrupted(self) -> int:
+        """Queues jobs left running by a service that stopped. Returns how many."""
+        with closing(self._connect()) as connection, connection:
+            return connection.execute(
+                "UPDATE jobs SET status = ?, started = NULL WHERE status = ?", (QUEUED, RUNNING)
+            ).rowcount
+
+    def queued_count(self) -> int:
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+
+
+def get_queue() -> JobQueue:
+    """The job queue for the current sessions directory."""
+    return JobQueue(council.SESSIONS_DIR / "jobs.db")
+
+
+def run_jobs(queue: JobQueue, jobs: List[Job]):
+    """Plans a group of jobs as one batch, recording each job's result."""
+    specs = [batch.SessionSpec(job.id, job.session_params, job.profile) for job in jobs]
+    try:
+        with council_profiles.applied(jobs[0].profile):
+            outputs = batch.run_batch(specs, batch_name="service")
+    except Exception as e:
+        print(f"\n❌ Batch of {len(jobs)} job(s) failed: {e}")
+        for job in jobs:
+            queue.finish(job.id, error=str(e))
+        return
+    for job in jobs:
+        queue.finish(job.id, output_file=outputs[job.id])
+
+
+class Worker(threading.Thread):
+    """Takes queued jobs in groups and plans each group as a batch."""
+
+    def __init__(self, queue: JobQueue, batch_window: float, max_batch: int):
+        super().__init__(name="council-worker", daemon=True)
+        self.queue = queue
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.stopping = threading.Event()
+
+    def run(self):
+        while not self.stopping.is_set():
+            if not self.queue.queued_count():
+                self.queue.submitted.wait(timeout=1.0)
+                self.queue.submitted.clear()
+                continue
+            # Give other coaches a moment to submit, so their jobs share the model loads
+            self.stopping.wait(self.batch_window)
+            jobs = self.queue.claim(self.max_batch)
+            if jobs:
+                print(f"\n📥 Planning {len(jobs)} job(s): {', '.join(job.id for job in jobs)}")
+                run_jobs(self.queue, jobs)
+
+    def stop(self):
+        self.stopping.set()
+        self.queue.submitted.set()
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    queue: JobQueue
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            return self._send_json(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            session_params = str(body["session_params"]).strip()
+            profile = body.get("profile") or None
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return self._send_json(400, {"error": 'expected a JSON body with "session_params"'})
+        if not session_params:
+            return self._send_json(400, {"error": "session_params is empty"})
+        if profile is not None:
+            try:
+                council_profiles.loader.load(str(profile))
+            except council_profiles.ProfileError as e:
+                return self._send_json(400, {"error": str(e)})
+        job = self.queue.submit(session_params, profile and str(profile))
+        self._send_json(202, job.to_dict())
+
+    def do_GET(self):
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if parts == ["jobs"]:
+            return self._send_json(200, {"jobs": [job.to_dict() for job in self.queue.jobs()]})
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.queue.get(parts[1])
+            if job is None:
+                return self._send_json(404, {"error": f"no job {parts[1]}"})
+            if len(parts) == 2:
+                return self._send_json(200, job.to_dict(include_result=True))
+            if parts[2] == "events":
+                return self._stream_events(job)
+        self._send_json(404, {"error": "not found"})
+
+    def _stream_events(self, job: Job):
+        # One event per status change, until the job finishes (or the client goes)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        last_status = None
+        while True:
+            if job.status != last_status:
+                last_status = job.status
+                payload = json.dumps(job.to_dict(include_result=job.status in FINISHED))
+                try:
+                    self.wfile.write(f"event: {job.status}\ndata: {payload}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+            if job.status in FINISHED:
+                return
+            time.sleep(config.SERVICE_POLL_INTERVAL)
+            job = self.queue.get(job.id)
+
+    def _send_json(self, status: int, payload: dict):
+        reply = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+class CouncilService:
+    """The HTTP server and its worker, started and stopped together."""
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None, queue: Optional[JobQueue] = None):
+        self.queue = queue or get_queue()
+        handler = type("ServiceHandler", (_ServiceHandler,), {"queue": self.queue})
+        self.server = ThreadingHTTPServer(
+            (host or config.SERVICE_HOST, config.SERVICE_PORT if port is None else port), handler
+        )
+        self.server.daemon_threads = True
+        self.worker = Worker(self.queue, config.SERVICE_BATCH_WINDOW, config.SERVICE_MAX_BATCH)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "CouncilService":
+        requeued = self.queue.requeue_interrupted()
+        if requeued:
+            print(f"Resuming {requeued} job(s) that were running when the service stopped")
+        self.worker.start()
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.worker.stop()
+        # Let a running batch finish its current call; its checkpoint keeps the rest
+        self.worker.join(timeout=5)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the council as a local service with a job queue")
+    parser.add_argument("--host", default=None, help=f"address to listen on (default {config.SERVICE_HOST})")
+    parser.add_argument("--port", type=int, default=None, help=f"port (default {config.SERVICE_PORT})")
+    args = parser.parse_args()
+
+    if config.MODEL_SWITCH_MODE == "manual":
+        print("⚠️  MODEL_SWITCH_MODE is \"manual\": each model switch will wait for Enter in this terminal.")
+        print("   Set it to \"lmstudio\" (or \"none\") in config.py to run unattended.")
+    service = CouncilService(args.host, args.port).start()
+    print("\n" + "="*70)
+    print("🏉 RUGBY COUNCIL AI - SERVICE")
+    print("="*70)
+    print(f"\nListening on {service.url}")
+    print(f"Job queue: {service.queue.path}")
+    print("Submit a job:  curl -X POST " + service.url + "/jobs -d '{\"session_params\": \"...\"}'")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Stopping the service. Queued jobs are kept for the next start.")
+        service.stop()
@@ -0,0 +1,73 @@
+"""
+Rugby Council AI - Session Parameter Parsing
+
+Session parameters are free text ("60 minutes, U10s, 24 players, 4 coaches,
+focus on decision making around the breakdown"). Anything that needs to
+compare or check sessions - the archive, request matching, the plan
+linter - first breaks them into their fields here.
+
+Every field is optional: coaches write parameters in many ways, and a
+field that can't be found is left as None rather than guessed.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*[- ]?\s*(hours?|hrs?|minutes?|mins?)\b", re.IGNORECASE)
+_AGE_GROUP = re.compile(r"\b(?:u|under[- ]?)(\d{1,2})s?\b", re.IGNORECASE)
+_PLAYERS = re.compile(r"(\d+)\s*(?:players?|kids|children)\b", re.IGNORECASE)
+_COACHES = re.compile(r"(\d+)\s*coach(?:es)?\b", re.IGNORECASE)
+_FOCUS = re.compile(r"\bfocus(?:ing)?\s*(?:on|:)?\s*(.+)$", re.IGNORECASE)
+
+
+@dataclass
+class SessionParams:
+    """The fields of a session request, as far as they could be read."""
+    raw: str
+    duration_minutes: Optional[int] = None
+    age_group: Optional[str] = None
+    players: Optional[int] = None
+    coaches: Optional[int] = None
+    focus: str = ""
+
+    @property
+    def age(self) -> Optional[int]:
+        """The age from the age group ("U10" -> 10)."""
+        return int(self.age_group[1:]) if self.age_group else None
+
+
+def parse_session_params(text: str) -> SessionParams:
+    """
+    Reads duration, age group, player and coach counts and focus from session parameters.
+
+    The focus is the text after "focus on"; without that phrase it is
+    whatever is left once the other fields are taken out.
+    """
+    params = SessionParams(raw=text)
+    remaining = text
+
+    duration = _DURATION.search(text)
+    if duration:
+        amount = float(duration.group(1))
+        params.duration_minutes = round(amount * 60 if duration.group(2).lower().startswith("h") else amount)
+        remaining = remaining.replace(duration.group(0), " ")
+
+    age_group = _AGE_GROUP.search(text)
+    if age_group:
+        params.age_group = f"U{int(age_group.group(1))}"
+        remaining = remaining.replace(age_group.group(0), " ")
+
+    for pattern, field in ((_PLAYERS, "players"), (_COACHES, "coaches")):
+        found = pattern.search(text)
+        if found:
+            setattr(params, field, int(found.group(1)))
+            remaining = remaining.replace(found.group(0), " ")
+
+    focus = _FOCUS.search(text)
+    if focus:
+        params.focus = focus.group(1).strip(" .,;")
+    else:
+        params.focus = re.sub(r"\s*[,;]\s*", " ", remaining).strip(" .,;")
+        params.focus = re.sub(r"\s+", " ", params.focus)
+    return params
@@ -0,0 +1,152 @@
+"""
+Rugby Council AI - Streaming Responses
+
+Without streaming, an 8B model running at 6 tokens/sec sits silent for
+minutes, and a stalled server looks exactly like a slow one. In streaming
+mode the server sends the response as Server-Sent Events (SSE), one small
+chunk per token or so. Reading them as they arrive lets us:
+
+- show live tokens/sec and time-to-first-token while the model works
+- give up when no tokens arrive for a while (config.STREAM_STALL_TIMEOUT,
+  or config.STREAM_FIRST_TOKEN_TIMEOUT while the prompt is still being
+  processed), instead of waiting out the whole-request timeout
+
+The chunks are joined back into the same string the stage functions expect.
+"""
+
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+import requests
+
+
+class StreamStalledError(requests.exceptions.Timeout):
+    """Raised when a streaming response stops producing tokens."""
+
+
+@dataclass
+class StreamStats:
+    """Timing for one streamed response (all times in seconds)."""
+    time_to_first_token: Optional[float] = None
+    total_time: float = 0.0
+    tokens: int = 0
+    prompt_tokens: Optional[int] = None
+
+    @property
+    def tokens_per_second(self) -> float:
+        # Generation speed, measured from the first token so prompt
+        # processing time doesn't drag the figure down
+        if self.time_to_first_token is None:
+            return 0.0
+        generating = self.total_time - self.time_to_first_token
+        return self.tokens / generating if generating > 0 else 0.0
+
+    def summary(self) -> str:
+        ttft = f"{self.time_to_first_token:.1f}s" if self.time_to_first_token is not None else "n/a"
+        return (f"{self.tokens} tokens in {self.total_time:.1f}s "
+                f"({self.tokens_per_second:.1f} tok/s, first token after {ttft})")
+
+
+def _sse_events(lines: Iterable[str]) -> Iterable[Optional[dict]]:
+    # Yields each decoded "data:" event; None for keep-alives and comments
+    # so the caller still gets a chance to check for a stall
+    for line in lines:
+        if not line or not line.startswith("data:"):
+            yield None
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        yield json.loads(data)
+
+
+def _set_read_timeout(response: requests.Response, seconds: float):
+    # The read timeout given to requests applies to every read; once the
+    # first token is in, the socket's timeout is cut to the stall limit, so a
+    # stream that goes silent mid-response fails after stall_timeout. Best
+    # effort: if the socket can't be reached the original timeout still applies
+    connection = getattr(response.raw, "_fp", None)
+    sock = getattr(getattr(getattr(connection, "fp", None), "raw", None), "_sock", None)
+    if sock is not None:
+        sock.settimeout(seconds)
+
+
+def consume_stream(
+    response: requests.Response,
+    stall_timeout: float,
+    first_token_timeout: Optional[float] = None,
+    show_progress: bool = True,
+    progress_interval: float = 0.5
+) -> Tuple[str, StreamStats]:
+    """
+    Reads a streaming /chat/completions response to the end.
+
+    The response should be opened with first_token_timeout as its read
+    timeout; after the first token the limit between reads drops to
+    stall_timeout.
+
+    Args:
+        response: A requests response opened with stream=True
+        stall_timeout: Seconds without a new token before giving up
+        first_token_timeout: Seconds to wait for the first token, which also
+                             covers prompt processing (defaults to stall_timeout)
+        show_progress: Whether to print a live progress line
+        progress_interval: Seconds between progress line updates
+
+    Returns:
+        The full response text and its timing stats
+    """
+    stats = StreamStats()
+    parts = []
+    start = time.perf_counter()
+    last_token = start
+    last_progress = 0.0
+    first_token_timeout = first_token_timeout or stall_timeout
+
+    try:
+        for event in _sse_events(response.iter_lines(decode_unicode=True)):
+            now = time.perf_counter()
+            content = ""
+            if event and event.get("choices"):
+                content = event["choices"][0].get("delta", {}).get("content") or ""
+            if event and event.get("usage"):
+                # Some servers report exact token counts in the final chunk
+                stats.tokens = event["usage"].get("completion_tokens", stats.tokens)
+                stats.prompt_tokens = event["usage"].get("prompt_tokens", stats.prompt_tokens)
+
+            if content:
+                if stats.time_to_first_token is None:
+                    stats.time_to_first_token = now - start
+                    _set_read_timeout(response, stall_timeout)
+                parts.append(content)
+                # Servers send roughly one token per chunk
+                stats.tokens += 1
+                last_token = now
+            else:
+                limit = stall_timeout if stats.time_to_first_token is not None else first_token_timeout
+                if now - last_token > limit:
+                    raise StreamStalledError(f"No tokens received for {limit:.0f}s")
+
+            stats.total_time = now - start
+            if show_progress and now - last_progress >= progress_interval:
+                waiting = "waiting for first token" if stats.time_to_first_token is None else stats.summary()
+                sys.stdout.write(f"\r   ⏳ {waiting}   ")
+                sys.stdout.flush()
+                last_progress = now
+    except requests.exceptions.ConnectionError as e:
+        # requests reports a read timeout in the middle of a stream as a
+        # ConnectionError; with stream=True the read timeout is our first-token
+        # or stall limit
+        if "timed out" in str(e):
+            raise StreamStalledError("Server stopped sending data mid-response") from e
+        raise
+    finally:
+        response.close()
+
+    stats.total_time = time.perf_counter() - start
+    if show_progress:
+        sys.stdout.write("\r")
+    return "".join(parts), stats
@@ -0,0 +1,268 @@
+"""
+Rugby Council AI - Structured Session Plans
+
+Plans used to be free-form markdown, so every later step worked on raw
+strings: Stage 2 and 3 prompts carried whole 3000-character plans, and
+cutting them to fit relied on character offsets and heading matching.
+
+With config.STRUCTURED_OUTPUT on, Stage 1 and Stage 3 ask for the plan as
+JSON (objectives, activities with durations, coaching points, coaching
+habits), passing the schema as the request's response_format so servers
+that support constrained output can enforce it. Every reply is validated.
+A reply that isn't a valid plan is sent back to the model with the list of
+problems, a bounded number of times (config.STRUCTURED_MAX_REPAIRS).
+
+The JSON is what the council passes around and checkpoints. Reviewers and
+the chairman see a compact summary of each plan instead of its full text,
+and the saved session shows each plan rendered as markdown.
+"""
+
+import json
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+PHASES = ["warm-up", "skill", "game", "cool-down"]
+
+SESSION_PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "objectives": {"type": "array", "items": {"type": "string"}, "minItems": 1},
+        "activities": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "phase": {"type": "string", "enum": PHASES},
+                    "duration_minutes": {"type": "integer", "minimum": 1},
+                    "description": {"type": "string"},
+                    "step_progressions": {"type": "array", "items": {"type": "string"}},
+                    "coaching_points": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["name", "phase", "duration_minutes", "description"],
+            },
+        },
+        "coaching_points": {"type": "array", "items": {"type": "string"}},
+        "coaching_habits": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"habit": {"type": "string"}, "how": {"type": "string"}},
+                "required": ["habit", "how"],
+            },
+        },
+    },
+    "required": ["title", "objectives", "activities", "coaching_points", "coaching_habits"],
+}
+
+JSON_INSTRUCTIONS = """Respond with a single JSON object and nothing else, with these fields:
+- "title": short session title
+- "objectives": list of session objectives, linked to the Player Framework
+- "activities": list, in running order, each with "name", "phase" (one of
+  "warm-up", "skill", "game", "cool-down"), "duration_minutes" (whole number),
+  "description", "step_progressions" (list) and "coaching_points" (list)
+- "coaching_points": list of key coaching points for the whole session
+- "coaching_habits": list of {"habit", "how"} showing how each of the five
+  Coaching Habits is used"""
+
+
+class StructuredOutputError(ValueError):
+    """A reply could not be turned into a valid session plan."""
+
+
+def response_format() -> Dict:
+    """The response_format for /chat/completions that asks for a session plan."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": "session_plan", "schema": SESSION_PLAN_SCHEMA},
+    }
+
+
+def _is_string_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def validate_plan(plan) -> List[str]:
+    """
+    Checks a parsed plan against SESSION_PLAN_SCHEMA.
+
+    Returns:
+        A list of problems, empty if the plan is valid
+    """
+    if not isinstance(plan, dict):
+        return ["the reply must be a JSON object"]
+    errors = []
+    for field in SESSION_PLAN_SCHEMA["required"]:
+        if field not in plan:
+            errors.append(f'missing "{field}"')
+    if "title" in plan and not isinstance(plan["title"], str):
+        errors.append('"title" must be a string')
+    if "objectives" in plan and (not _is_string_list(plan["objectives"]) or not plan["objectives"]):
+        errors.append('"objectives" must be a non-empty list of strings')
+    if "coaching_points" in plan and not _is_string_list(plan["coaching_points"]):
+        errors.append('"coaching_points" must be a list of strings')
+
+    activities = plan.get("activities")
+    if "activities" in plan and (not isinstance(activities, list) or not activities):
+        errors.append('"activities" must be a non-empty list')
+    for number, activity in enumerate(activities if isinstance(activities, list) else [], start=1):
+        where = f"activity {number}"
+        if not isinstance(activity, dict):
+            errors.append(f"{where} must be an object")
+            continue
+        for field in ("name", "description"):
+            if not isinstance(activity.get(field), str) or not activity.get(field):
+                errors.append(f'{where}: "{field}" must be a non-empty string')
+        if activity.get("phase") not in PHASES:
+            errors.append(f'{where}: "phase" must be one of {", ".join(PHASES)}')
+        duration = activity.get("duration_minutes")
+        if isinstance(duration, bool) or not isinstance(duration, int) or duration < 1:
+            errors.append(f'{where}: "duration_minutes" must be a whole number of minutes')
+        for field in ("step_progressions", "coaching_points"):
+            if field in activity and not _is_string_list(activity[field]):
+                errors.append(f'{where}: "{field}" must be a list of strings')
+
+    habits = plan.get("coaching_habits")
+    if "coaching_habits" in plan and not (
+        isinstance(habits, list)
+        and all(isinstance(h, dict) and isinstance(h.get("habit"), str) and isinstance(h.get("how"), str)
+                for h in habits)
+    ):
+        errors.append('"coaching_habits" must be a list of {"habit", "how"} objects')
+    return errors
+
+
+def parse_plan(text: str) -> Dict:
+    """
+    Reads a plan from a model's reply, allowing for code fences or text around the JSON.
+
+    Raises:
+        StructuredOutputError: If there is no valid plan in the reply
+    """
+    candidate = text.strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", candidate, re.DOTALL)
+    if fenced:
+        candidate = fenced.group(1).strip()
+    elif not candidate.startswith("{") and "{" in candidate:
+        start, end = candidate.find("{"), candidate.rfind("}")
+        if end < start:
+            # Typically a reply cut off by max_tokens before the JSON closed
+            raise StructuredOutputError("not valid JSON (no closing brace)")
+        candidate = candidate[start:end + 1]
+    try:
+        plan = json.loads(candidate)
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"not valid JSON ({e.msg} at line {e.lineno}, column {e.colno})") from e
+    errors = validate_plan(plan)
+    if errors:
+        raise StructuredOutputError("; ".join(errors))
+    return plan
+
+
+def try_parse(text: str) -> Optional[Dict]:
+    """The plan in text if it is a valid structured plan, otherwise None (e.g. a markdown plan)."""
+    try:
+        return parse_plan(text)
+    except StructuredOutputError:
+        return None
+
+
+def build_repair_prompt(reply: str, problem: str) -> str:
+    """Asks the model to fix a reply that wasn't a valid plan."""
+    return f"""Your previous reply was not a valid session plan.
+
+Problems: {problem}
+
+Your previous reply:
+{reply[:4000]}
+
+{JSON_INSTRUCTIONS}
+
+Reply again with only the corrected JSON object."""
+
+
+def request_plan(ask: Callable[[str], str], prompt: str, max_repairs: int) -> Tuple[Optional[Dict], str]:
+    """
+    Asks for a structured plan, sending invalid replies back for repair.
+
+    Args:
+        ask: Sends a prompt to the model and returns its reply
+        prompt: The plan prompt, already including JSON_INSTRUCTIONS
+        max_repairs: Most repair requests to make after the first reply
+
+    Returns:
+        The plan and its canonical JSON text, or (None, last reply) if no
+        valid plan was produced - the caller can still use the text as it is
+    """
+    reply = ask(prompt)
+    for attempt in range(max_repairs + 1):
+        try:
+            plan = parse_plan(reply)
+            return plan, json.dumps(plan, ensure_ascii=False, indent=2)
+        except StructuredOutputError as e:
+            if attempt == max_repairs:
+                print(f"   ⚠️  Still not a valid plan after {max_repairs} repair(s) ({e}); keeping the text reply")
+                return None, reply
+            print(f"   🔧 Reply wasn't a valid plan ({e}); asking for a repair")
+            reply = ask(build_repair_prompt(reply, str(e)))
+
+
+def total_minutes(plan: Dict) -> int:
+    return sum(activity["duration_minutes"] for activity in plan["activities"])
+
+
+def render_markdown(plan: Dict) -> str:
+    """The plan as markdown, with the same sections the free-form prompt asks for."""
+    lines = [f"# {plan['title']}", "", f"**Total time:** {total_minutes(plan)} minutes", "",
+             "## Session Objectives", ""]
+    lines += [f"- {objective}" for objective in plan["objectives"]]
+    for phase in PHASES:
+        for activity in (a for a in plan["activities"] if a["phase"] == phase):
+            lines += ["", f"## {phase.replace('-', ' ').title()}: {activity['name']} "
+                          f"({activity['duration_minutes']} min)", "", activity["description"]]
+            if activity.get("step_progressions"):
+                lines += ["", "**STEP progressions:**"] + [f"- {step}" for step in activity["step_progressions"]]
+            if activity.get("coaching_points"):
+                lines += ["", "**Coaching points:**"] + [f"- {point}" for point in activity["coaching_points"]]
+    lines += ["", "## Coaching Points", ""] + [f"- {point}" for point in plan["coaching_points"]]
+    lines += ["", "## Coaching Habits", ""] + [f"- **{h['habit']}:** {h['how']}" for h in plan["coaching_habits"]]
+    return "\n".join(lines)
+
+
+def _first_sentence(text: str, limit: int = 160) -> str:
+    sentence = re.split(r"(?<=[.!?])\s", text.strip(), maxsplit=1)[0]
+    return sentence if len(sentence) <= limit else sentence[:limit - 3].rstrip() + "..."
+
+
+def summarise_plan(plan: Dict) -> str:
+    """
+    A compact summary of a plan for reviewers and the chairman.
+
+    Keeps the structure (objectives, every activity with its timing, coaching
+    points, habits) but only the first sentence of each description.
+    """
+    lines = [f"{plan['title']} ({total_minutes(plan)} min)", "Objectives: " + "; ".join(plan["objectives"])]
+    for activity in plan["activities"]:
+        lines.append(f"- [{activity['phase']}] {activity['name']} ({activity['duration_minutes']} min): "
+                     f"{_first_sentence(activity['description'])}")
+        if activity.get("step_progressions"):
+            lines.append("  STEP: " + "; ".join(activity["step_progressions"]))
+    if plan["coaching_points"]:
+        lines.append("Coaching points: " + "; ".join(plan["coaching_points"]))
+    lines.append("Habits: " + "; ".join(f"{h['habit']} - {_first_sentence(h['how'], 80)}"
+                                        for h in plan["coaching_habits"]))
+    return "\n".join(lines)
+
+
+def for_review(text: str) -> str:
+    """What later stages see of a plan: the compact summary if it is structured, else the text."""
+    plan = try_parse(text)
+    return summarise_plan(plan) if plan else text
+
+
+def to_markdown(text: str) -> str:
+    """A plan ready for the saved session: rendered if it is structured, else the text."""
+    plan = try_parse(text)
+    return render_markdown(plan) if plan else text
@@ -0,0 +1,296 @@
+"""
+Rugby Council AI - Performance Telemetry
+
+The stages used to print only how many characters each model returned, so
+there was no telling how a run's time split between loading models,
+processing prompts and generating text - or whether the third council
+member was worth what it costs.
+
+Every model call now records its stage, model, wall time, prompt and
+completion tokens (from the API's usage field), tokens/sec, time to first
+token (when streaming), retries, and whether it came from the response
+cache. Model loads and stage times are recorded too. When a session is
+saved, all of this is written as JSON next to the markdown file:
+
+    sessions/council_session_20241215_143022.md
+    sessions/council_session_20241215_143022.json
+
+To summarise every session saved so far:
+
+    python telemetry.py            # or: python telemetry.py path/to/sessions
+
+Calls are also summarised per stage and model tier (the "tier" of each
+council member in config.COUNCIL_MODELS), with a cost where the member has
+a "cost_per_1k_tokens", so the quality/throughput trade-off of each
+stage's roster (config.STAGE_ROSTERS) can be tuned.
+"""
+
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import config
+
+DEFAULT_TIER = "default"
+
+# Heading of the tier table at the end of a saved session
+TIERS_HEADING = "Cost and Latency by Stage"
+
+
+@dataclass
+class CallMetrics:
+    """Measurements for one model call (times in seconds)."""
+    stage: str
+    model: str
+    wall_time: float
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    time_to_first_token: Optional[float] = None
+    retries: int = 0
+    cached: bool = False
+    session_id: str = ""
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        # Generation speed; when streaming, prompt processing (time to first
+        # token) is left out so it doesn't drag the figure down
+        if not self.completion_tokens or self.cached:
+            return None
+        generating = self.wall_time - (self.time_to_first_token or 0.0)
+        return self.completion_tokens / generating if generating > 0 else None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CallMetrics":
+        """
+        A call as saved in a sidecar; keys CallMetrics doesn't have are ignored.
+
+        Raises:
+            TypeError: If a required field is missing
+        """
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        speed = self.tokens_per_second
+        data["tokens_per_second"] = round(speed, 2) if speed is not None else None
+        return data
+
+
+def summarise_calls(calls: Iterable[CallMetrics]) -> Dict:
+    """Totals for a group of calls: count, wall time, tokens, retries and cache hits."""
+    calls = list(calls)
+    generated = [call for call in calls if call.tokens_per_second is not None]
+    return {
+        "calls": len(calls),
+        "wall_time": round(sum(call.wall_time for call in calls), 3),
+        "prompt_tokens": sum(call.prompt_tokens or 0 for call in calls),
+        "completion_tokens": sum(call.completion_tokens or 0 for call in calls),
+        "retries": sum(call.retries for call in calls),
+        "cached": sum(1 for call in calls if call.cached),
+        "mean_tokens_per_second": (
+            round(sum(call.tokens_per_second for call in generated) / len(generated), 2) if generated else None
+        ),
+    }
+
+
+def member_info(model_name: str) -> Dict:
+    """The config.COUNCIL_MODELS entry for a model name (empty if it isn't a member)."""
+    return next((info for info in config.COUNCIL_MODELS.values() if info["name"] == model_name), {})
+
+
+def summarise_tiers(calls: Iterable[CallMetrics]) -> Dict[str, Dict[str, Dict]]:
+    """
+    Totals per stage and model tier, with mean latency and cost.
+
+    Returns:
+        {stage: {tier: summary}}, where each summary is summarise_calls'
+        plus mean_wall_time and cost (None if a model in the tier has no
+        cost_per_1k_tokens)
+    """
+    groups: Dict[str, Dict[str, List[CallMetrics]]] = {}
+    for call in calls:
+        tier = member_info(call.model).get("tier", DEFAULT_TIER)
+        groups.setdefault(call.stage, {}).setdefault(tier, []).append(call)
+    tiers = {}
+    for stage, by_tier in groups.items():
+        tiers[stage] = {}
+        for tier, group in by_tier.items():
+            summary = summarise_calls(group)
+            summary["mean_wall_time"] = round(summary["wall_time"] / len(group), 3)
+            rates = [member_info(call.model).get("cost_per_1k_tokens") for call in group]
+            summary["cost"] = None if None in rates else round(sum(
+                rate * ((call.prompt_tokens or 0) + (call.completion_tokens or 0)) / 1000
+                for rate, call in zip(rates, group) if not call.cached
+            ), 4)
+            tiers[stage][tier] = summary
+    return tiers
+
+
+def format_tiers(tiers: Dict[str, Dict[str, Dict]]) -> str:
+    """The per-stage tier summary as a markdown table, for the saved session."""
+    lines = ["| Stage | Tier | Calls | Mean time | Tok/s | Tokens | Cost |", "|---|---|---|---|---|---|---|"]
+    for stage in sorted(tiers):
+        for tier, summary in tiers[stage].items():
+            speed = summary["mean_tokens_per_second"]
+            lines.append(
+                f"| {stage} | {tier} | {summary['calls']} | {summary['mean_wall_time']:.1f}s | "
+                f"{speed if speed is not None else 'n/a'} | "
+                f"{summary['prompt_tokens'] + summary['completion_tokens']} | "
+                f"{summary['cost'] if summary['cost'] is not None else 'n/a'} |"
+            )
+    return "\n".join(lines)
+
+
+class Recorder:
+    """Collects call metrics and model loads for the current run (or batch)."""
+
+    def __init__(self):
+        self.calls: List[CallMetrics] = []
+        self.model_loads: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self.calls = []
+            self.model_loads = []
+
+    def record_call(self, metrics: CallMetrics):
+        with self._lock:
+            self.calls.append(metrics)
+
+    def record_load(self, model: str, seconds: float, mode: str):
+        with self._lock:
+            self.model_loads.append({"model": model, "seconds": round(seconds, 3), "mode": mode})
+
+    def session_report(
+        self,
+        session_params: str,
+        stage_times: Dict[str, float],
+        session_id: Optional[str] = None,
+        run_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Everything recorded for one session, ready to save as JSON.
+
+        Args:
+            session_params: The session requirements
+            stage_times: Wall time per stage, in seconds (for a batch these
+                         cover the whole batch, not just this session)
+            session_id: Only include calls for this batch session (None = all calls)
+            run_id: Checkpoint run id, so the report can be matched to its run
+        """
+        with self._lock:
+            calls = [call for call in self.calls if session_id is None or call.session_id == session_id]
+            model_loads = list(self.model_loads)
+        stages = sorted({call.stage for call in calls})
+        models = sorted({call.model for call in calls})
+        return {
+            "run_id": run_id,
+            "session_id": session_id,
+            "session_params": session_params,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "stage_times": {stage: round(seconds, 3) for stage, seconds in stage_times.items()},
+            "model_loads": model_loads,
+            "totals": summarise_calls(calls),
+            "by_stage": {stage: summarise_calls(c for c in calls if c.stage == stage) for stage in stages},
+            "by_model": {model: summarise_calls(c for c in calls if c.model == model) for model in models},
+            "by_tier": summarise_tiers(call for call in calls if call.stage.startswith("stage_")),
+            "calls": [call.to_dict() for call in calls],
+        }
+
+
+def sidecar_path(session_file: Path) -> Path:
+    """The JSON file that goes with a saved session's markdown file."""
+    return Path(session_file).with_suffix(".json")
+
+
+def write_sidecar(session_file: Path, report: Dict) -> Path:
+    # Written under another name and renamed, so a run that stops part way
+    # never leaves half a file for load_sidecars to read
+    path = sidecar_path(session_file)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    os.replace(temp_path, path)
+    return path
+
+
+def load_sidecars(sessions_dir: Path) -> List[Dict]:
+    """Reads every session's telemetry file in a sessions folder."""
+    reports = []
+    for path in sorted(Path(sessions_dir).glob("council_session_*.json")):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"   ⚠️  Skipped {path.name}: {e}")
+            continue
+        if not isinstance(report, dict):
+            print(f"   ⚠️  Skipped {path.name}: not a telemetry report")
+            continue
+        reports.append(report)
+    return reports
+
+
+def aggregate(reports: List[Dict]) -> Dict:
+    """
+    Combines many sessions' telemetry into per-model and per-stage figures.
+
+    Returns:
+        Dictionary with the session count, and for each model and stage the
+        number of calls, mean wall time, mean tokens/sec and total tokens
+    """
+    calls = [
+        CallMetrics(**{key: value for key, value in call.items() if key != "tokens_per_second"})
+        for report in reports for call in report.get("calls", [])
+    ]
+
+    def describe(group: List[CallMetrics]) -> Dict:
+        summary = summarise_calls(group)
+        summary["mean_wall_time"] = round(summary["wall_time"] / len(group), 3) if group else 0.0
+        return summary
+
+    loads: Dict[str, List[float]] = {}
+    for report in reports:
+        for load in report.get("model_loads", []):
+            loads.setdefault(load["model"], []).append(load["seconds"])
+    return {
+        "sessions": len(reports),
+        "by_model": {model: describe([c for c in calls if c.model == model])
+                     for model in sorted({c.model for c in calls})},
+        "by_stage": {stage: describe([c for c in calls if c.stage == stage])
+                     for stage in sorted({c.stage for c in calls})},
+        "model_load_seconds": {model: round(sum(times) / len(times), 3) for model, times in loads.items()},
+    }
+
+
+def print_aggregate(summary: Dict):
+    print(f"\nTelemetry across {summary['sessions']} session(s)")
+    for title, groups in (("Model", summary["by_model"]), ("Stage", summary["by_stage"])):
+        print(f"\n{title:<28} {'Calls':>6} {'Mean time':>10} {'Tok/s':>7} {'Prompt tok':>11} "
+              f"{'Output tok':>11} {'Retries':>8}")
+        for name, group in groups.items():
+            speed = f"{group['mean_tokens_per_second']:.1f}" if group["mean_tokens_per_second"] else "n/a"
+            print(f"{name:<28} {group['calls']:>6} {group['mean_wall_time']:>9.1f}s {speed:>7} "
+                  f"{group['prompt_tokens']:>11} {group['completion_tokens']:>11} {group['retries']:>8}")
+    if summary["model_load_seconds"]:
+        print("\nMean model load time")
+        for model, seconds in summary["model_load_seconds"].items():
+            print(f"{model:<28} {seconds:>9.1f}s")
+
+
+recorder = Recorder()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarise telemetry across saved council sessions")
+    parser.add_argument("sessions_dir", type=Path, nargs="?", default=Path(__file__).parent / "sessions")
+    args = parser.parse_args()
+    print_aggregate(aggregate(load_sidecars(args.sessions_dir)))
@@ -0,0 +1,40 @@
+import pytest
+
+import config
+import framework_digest
+import response_cache
+from benchmarks.mock_server import MockLLMServer
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(monkeypatch):
+    # Tests talk to mock servers and must never read or fill the real cache
+    monkeypatch.setattr(config, "RESPONSE_CACHE_ENABLED", False)
+    monkeypatch.setattr(response_cache, "_cache", None)
+
+
+@pytest.fixture(autouse=True)
+def temporary_digest_cache(monkeypatch, tmp_path):
+    # Framework digests go to the test's own directory, not .cache/
+    monkeypatch.setattr(framework_digest, "_cache", framework_digest.DigestCache(tmp_path / "digests"))
+
+
+@pytest.fixture
+def stub_server():
+    """
+    Starts local mock LLM servers (see benchmarks/mock_server.py).
+
+    Call it to get a running server; its url is the base URL to use and its
+    requests list holds every request body it has received. Replies are
+    "response from <model>".
+    """
+    servers = []
+
+    def start(delay: float = 0.0, **options) -> MockLLMServer:
+        server = MockLLMServer(latency=delay, **options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
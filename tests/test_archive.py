@@ -0,0 +1,85 @@
+import archive
+import checkpoint
+import config
+import council
+from session_params import parse_session_params
+
+OLD_SESSION = """# Rugby Council AI - Session Output
+
+**Generated:** 2024-12-15 14:30:22
+
+**Session Parameters:** 45 minutes, U8s, 16 players, 2 coaches, focus on tag tackling
+
+---
+
+## STAGE 1: Individual Plans
+
+### Analytical Coach (reasoning)
+
+Tag games plan
+
+---
+
+## STAGE 2: Peer Reviews
+
+### Review by Analytical Coach (reasoning)
+
+**Rankings:**
+1st: [Plan A] - fun
+
+---
+
+## STAGE 3: Final Synthesized Plan
+
+Final tag tackling plan with a chase game"""
+
+
+def test_session_params_are_parsed_into_fields():
+    params = parse_session_params("U10s 60 mins, 24 players, 4 coaches, focus on breakdown decisions")
+    assert (params.age_group, params.duration_minutes, params.players, params.coaches) == ("U10", 60, 24, 4)
+    assert params.focus == "breakdown decisions"
+
+
+def test_backfill_and_search(tmp_path):
+    (tmp_path / "council_session_20241215_143022.md").write_text(OLD_SESSION, encoding="utf-8")
+    session_archive = archive.SessionArchive(tmp_path / "archive.db")
+
+    assert session_archive.backfill(tmp_path) == 1
+    assert session_archive.backfill(tmp_path) == 0
+
+    found = session_archive.search(age_group="u8", focus="tackling", model="reasoning", since="2024-12-01")
+    assert [result.final_plan for result in found] == ["Final tag tackling plan with a chase game"]
+    assert session_archive.search(text="chase") and not session_archive.search(until="2024-12-14")
+    assert not session_archive.search(age_group="U10")
+
+
+def test_runs_are_archived_and_offered_as_reference(stub_server, tmp_path, monkeypatch):
+    server = stub_server()
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "MODEL_SWITCH_MODE", "none")
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path)
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+
+    council.run_council("60 minutes, U10s, 24 players, 4 coaches, focus on rucking")
+    assert len(council.get_archive().search(focus="rucking")) == 1
+
+    monkeypatch.setattr(config, "ARCHIVE_REFERENCE_PLANS", 1)
+    request = "U10s, 60 mins, rucking and support"
+    prompt = council.build_plan_prompt(request, council.reference_plans_for(request))
+    assert "PROVEN PLANS FROM SIMILAR PAST SESSIONS" in prompt
+    assert "response from" in prompt
+
+
+def test_plan_sub_headings_are_not_council_members(tmp_path, monkeypatch):
+    monkeypatch.setitem(config.COUNCIL_MODELS, "small-1", {"name": "small", "description": "", "role": "Quick Coach"})
+    plan = "### Warm-up (10 min)\n\nTag gates\n\n### Main Activity (20min)\n\nRuck race"
+    session = OLD_SESSION.replace("### Analytical Coach (reasoning)\n\nTag games plan",
+                                  f"### Analytical Coach (reasoning)\n\n{plan}\n\n---\n\n"
+                                  "### Quick Coach (small-1)\n\nSmall plan")
+    path = tmp_path / "council_session_20241215_143022.md"
+    path.write_text(session, encoding="utf-8")
+
+    plans = archive.parse_session_file(path)["plans"]
+
+    assert [(member["model_key"], member["text"]) for member in plans] == [("reasoning", plan),
+                                                                           ("small-1", "Small plan")]
@@ -0,0 +1,32 @@
+import time
+
+import backends
+import config
+import council
+
+
+def test_stage_runs_in_parallel_across_endpoints(stub_server, monkeypatch):
+    servers = {key: stub_server(delay=0.3) for key in config.COUNCIL_MODELS}
+    monkeypatch.setattr(config, "MODEL_ENDPOINTS", {
+        key: {"url": server.url, "max_concurrency": 1} for key, server in servers.items()
+    })
+
+    start = time.perf_counter()
+    responses = council.stage_1_individual_responses("60 minutes, U10s", "framework")
+    elapsed = time.perf_counter() - start
+
+    assert list(responses) == list(config.COUNCIL_MODELS)
+    assert responses["gpt"] == f"response from {config.COUNCIL_MODELS['gpt']['name']}"
+    assert elapsed < 0.3 * len(servers) - 0.2
+
+
+def test_shared_endpoint_respects_concurrency_limit(stub_server):
+    server = stub_server(delay=0.1)
+    pool = backends.BackendPool(
+        {"a": {"url": server.url, "max_concurrency": 1}, "b": {"url": server.url}},
+        default_url=server.url,
+    )
+    results = pool.run({key: (lambda url, key=key: council.call_lm_studio("hi", key, base_url=url))
+                        for key in ["a", "b"]})
+    assert results == {"a": "response from a", "b": "response from b"}
+    assert server.peak == 1
@@ -0,0 +1,52 @@
+import batch
+import checkpoint
+import config
+import council
+
+
+def test_batch_groups_calls_by_model_across_sessions(stub_server, tmp_path, monkeypatch):
+    server = stub_server()
+    switches = []
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "LINT_FIX", "off")
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path / "sessions")
+    monkeypatch.setattr(council, "_loaded_model", None)
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    monkeypatch.setattr(council, "wait_for_model_switch", switches.append)
+
+    spec_file = tmp_path / "term.jsonl"
+    spec_file.write_text(
+        '{"id": "u10", "session_params": "60 minutes, U10s, 24 players, 4 coaches, focus on rucks"}\n'
+        '{"id": "u12", "session_params": "75 minutes, U12s, 20 players, 3 coaches, focus on defence"}\n',
+        encoding="utf-8",
+    )
+    outputs = batch.run_batch(batch.read_session_specs(spec_file), batch_name="term")
+
+    assert set(outputs) == {"u10", "u12"}
+    assert len(set(outputs.values())) == 2
+    assert all(path.exists() for path in outputs.values())
+    assert len(server.requests) == 14
+    # Two separate scheduled runs would need ten loads
+    assert len(switches) == 5
+
+
+def test_csv_specs_are_built_from_columns(tmp_path):
+    spec_file = tmp_path / "term.csv"
+    spec_file.write_text(
+        "id,duration,age_group,players,coaches,focus\n"
+        "u10,60 minutes,U10s,24,4,tackling\n",
+        encoding="utf-8",
+    )
+    specs = batch.read_session_specs(spec_file)
+    assert specs == [batch.SessionSpec("u10", "60 minutes, U10s, 24 players, 4 coaches, focus on tackling")]
+
+
+def test_jsonl_specs_can_give_counts_as_numbers(tmp_path):
+    spec_file = tmp_path / "term.jsonl"
+    spec_file.write_text(
+        '{"id": "u10", "duration": "60 minutes", "age_group": "U10s", "players": 24, "coaches": 4,'
+        ' "focus": "tackling"}\n',
+        encoding="utf-8",
+    )
+    specs = batch.read_session_specs(spec_file)
+    assert specs == [batch.SessionSpec("u10", "60 minutes, U10s, 24 players, 4 coaches, focus on tackling")]
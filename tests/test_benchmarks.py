@@ -0,0 +1,29 @@
+import config
+from benchmarks import run_benchmarks
+
+SETTINGS = {"latency": 0.0, "tokens_per_second": None, "response_tokens": 50,
+            "load_seconds": 0.0, "sessions": 2, "stream": False}
+
+
+def test_sequential_scenario_drives_full_council():
+    result = run_benchmarks.run_scenario("sequential", SETTINGS)
+    assert result["requests"] == 7
+    assert result["model_swaps"] == 5
+    assert set(result["stage_times"]) == {"stage_1", "stage_2", "stage_3"}
+
+
+def test_batch_scenario_shares_model_loads_across_sessions():
+    result = run_benchmarks.run_scenario("batch", SETTINGS)
+    assert result["requests"] == 14
+    assert result["model_swaps"] == 5
+
+
+def test_council_settings_are_pinned_and_reported(monkeypatch):
+    monkeypatch.setattr(config, "LINT_FIX", "all")
+    monkeypatch.setattr(config, "REQUEST_MATCH_ACTION", "reuse_result")
+
+    document = run_benchmarks.run_benchmarks(SETTINGS, ["sequential"])
+
+    assert document["results"][0]["requests"] == 7
+    assert document["council_settings"] == run_benchmarks.COUNCIL_SETTINGS
+    assert config.LINT_FIX == "all"
@@ -0,0 +1,56 @@
+import json
+
+import call_budgets
+import config
+import council
+import telemetry
+
+
+def calls(model, stage, tokens_per_second, completion_tokens, count=5):
+    return [
+        telemetry.CallMetrics(stage, model, completion_tokens / tokens_per_second, completion_tokens=completion_tokens)
+        for _ in range(count)
+    ]
+
+
+def test_budgets_follow_each_models_speed_and_stage():
+    budgets = call_budgets.CallBudgets(
+        calls("fast", "stage_2", 15.0, 500) + calls("slow", "stage_2", 6.0, 500) + calls("slow", "stage_1", 6.0, 1800)
+    )
+    fast, slow = budgets.budget("fast", "stage_2"), budgets.budget("slow", "stage_2")
+
+    # Reviews don't need the full MAX_TOKENS; plans still get it
+    assert fast.max_tokens == slow.max_tokens == 750
+    assert budgets.budget("slow", "stage_1").max_tokens == config.MAX_TOKENS
+    assert fast.learned and fast.timeout < slow.timeout < call_budgets.DEFAULT_TIMEOUT
+    assert fast.stall_timeout < slow.stall_timeout
+
+
+def test_models_without_enough_history_keep_the_defaults():
+    budgets = call_budgets.CallBudgets(calls("new", "stage_1", 10.0, 500, count=2))
+    budget = budgets.budget("new", "stage_1")
+    assert not budget.learned
+    assert (budget.max_tokens, budget.timeout) == (config.MAX_TOKENS, call_budgets.DEFAULT_TIMEOUT)
+
+
+def test_calls_use_budgets_learned_from_saved_sessions(stub_server, tmp_path, monkeypatch):
+    server = stub_server()
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path)
+    history = [call.to_dict() for call in calls("model-a", "stage_2", 10.0, 300)]
+    (tmp_path / "council_session_20241215_143022.json").write_text(json.dumps({"calls": history}))
+
+    council.call_lm_studio("Review these plans", "model-a", stage="stage_2")
+    council.call_lm_studio("Write a plan", "model-a", stage="stage_1")
+
+    assert [request["max_tokens"] for request in server.requests] == [500, config.MAX_TOKENS]
+
+
+def test_damaged_or_newer_sidecars_dont_stop_calls(tmp_path):
+    history = [dict(call.to_dict(), energy_used=1.5) for call in calls("model-a", "stage_2", 10.0, 300)]
+    (tmp_path / "council_session_20241215_143022.json").write_text(json.dumps({"calls": history + [{"stage": "x"}]}))
+    (tmp_path / "council_session_20241216_090000.json").write_text('{"calls": [{"stage": "stage_2", "mod')
+
+    budgets = call_budgets.CallBudgets.from_sessions(tmp_path)
+
+    assert budgets.budget("model-a", "stage_2").max_tokens == 500
@@ -0,0 +1,36 @@
+import checkpoint
+import config
+import council
+
+
+def test_resumed_run_only_makes_missing_calls(stub_server, tmp_path, monkeypatch):
+    server = stub_server()
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "LINT_FIX", "off")
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path)
+    monkeypatch.setattr(council, "wait_for_model_switch", lambda model_name: None)
+
+    run = checkpoint.RunCheckpoint.create("60 minutes, U10s", checkpoint_dir=tmp_path)
+    run.record_plan("reasoning", "saved plan from reasoning")
+    run.record_plan("instruct", "saved plan from instruct")
+
+    resumed = checkpoint.RunCheckpoint.load(run.run_id, checkpoint_dir=tmp_path)
+    output_file = council.run_council(checkpoint=resumed)
+
+    # One missing plan, three reviews and the chairman
+    assert len(server.requests) == 5
+    assert "saved plan from instruct" in output_file.read_text(encoding="utf-8")
+    finished = checkpoint.RunCheckpoint.load(run.run_id, checkpoint_dir=tmp_path)
+    assert finished.completed_calls() == 7
+    assert finished.output_file == str(output_file)
+
+
+def test_checkpoints_follow_the_sessions_folder(stub_server, tmp_path, monkeypatch):
+    server = stub_server()
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "MODEL_SWITCH_MODE", "none")
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path / "sessions")
+
+    council.run_council("60 minutes, U10s")
+
+    assert len(checkpoint.list_run_ids(tmp_path / "sessions" / "checkpoints")) == 1
@@ -0,0 +1,59 @@
+import config
+import consensus
+import council
+
+LABELS = ["Plan A", "Plan B", "Plan C"]
+
+
+def review(*order):
+    lines = "\n".join(f"{place}: [{label}] - reason" for place, label in zip(["1st", "2nd", "3rd"], order))
+    return (f"**Rankings:**\n{lines}\n\n**Detailed Feedback:**\nPlan C mentions Plan A.\n\n"
+            f"**Recommended Improvements:**\nShorten the warm-up.")
+
+
+def test_rankings_are_read_from_the_rankings_block():
+    assert consensus.parse_rankings(review("Plan B", "Plan A", "Plan C"), LABELS) == ["Plan B", "Plan A", "Plan C"]
+    assert consensus.parse_rankings("1. **Plan C** is best\n2. Plan A", LABELS) == []
+    assert consensus.extract_section(review("Plan A"), "Recommended Improvements") == "Shorten the warm-up."
+
+
+def test_borda_count_measures_agreement():
+    unanimous = consensus.build_consensus(
+        {"a": review("Plan B", "Plan A", "Plan C"), "b": review("Plan B", "Plan C", "Plan A")}, LABELS
+    )
+    assert unanimous.winner == "Plan B"
+    assert unanimous.agreement == 1.0
+
+    split = consensus.build_consensus(
+        {"a": review("Plan A", "Plan B", "Plan C"), "b": review("Plan B", "Plan A", "Plan C")}, LABELS
+    )
+    assert split.winner is None
+
+
+def test_winner_mode_skips_the_chairman(monkeypatch):
+    monkeypatch.setattr(config, "CONSENSUS_MODE", "winner")
+    responses = {"reasoning": "plan one", "instruct": "plan two", "gpt": "plan three"}
+    reviews = {key: review("Plan B", "Plan A", "Plan C") for key in responses}
+
+    final_plan, decision = council.stage_3_final_plan(responses, reviews, "60 minutes, U10s", "FRAMEWORK")
+
+    assert final_plan == "plan two"
+    assert decision.path == consensus.WINNER
+    assert "Plan B" in decision.note
+
+
+def test_light_edit_sends_only_the_winner_and_improvements(stub_server, monkeypatch):
+    server = stub_server()
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "MODEL_SWITCH_MODE", "none")
+    monkeypatch.setattr(config, "CONSENSUS_MODE", "light_edit")
+    responses = {"reasoning": "plan one", "instruct": "plan two", "gpt": "plan three"}
+    reviews = {key: review("Plan C", "Plan B", "Plan A") for key in responses}
+
+    final_plan, decision = council.stage_3_final_plan(responses, reviews, "60 minutes, U10s", "FRAMEWORK")
+
+    prompt = server.requests[0]["messages"][-1]["content"]
+    assert decision.path == consensus.LIGHT_EDIT
+    assert "plan three" in prompt and "plan one" not in prompt
+    assert "Shorten the warm-up." in prompt
+    assert final_plan.startswith("response from")
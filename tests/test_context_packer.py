@@ -0,0 +1,36 @@
+import context_packer
+
+PLAN = """# Session Plan
+
+## Objectives
+Players make better decisions at the breakdown.
+
+## Notes for parents
+""" + "Lots of background detail. " * 200 + """
+
+## Warm-up (10 minutes)
+Tag games in pairs.
+
+## Review
+Players lead the reflection.
+"""
+
+
+def test_short_parts_are_left_untouched():
+    packed = context_packer.pack_parts({"Plan A": "short plan"}, "fixed prompt", label="test")
+    assert packed == {"Plan A": "short plan"}
+
+
+def test_long_plan_is_cut_along_section_boundaries():
+    fitted = context_packer.fit_to_budget(PLAN, max_tokens=120)
+    assert context_packer.estimate_tokens(fitted) <= 120
+    assert "## Objectives" in fitted
+    assert "## Warm-up" in fitted
+    assert "## Review" in fitted
+    assert "Notes for parents" not in fitted
+    assert "omitted to fit the context window" in fitted
+
+
+def test_unused_budget_goes_to_longer_parts():
+    allocation = context_packer.allocate_budget({"short": 100, "long": 5000, "longer": 8000}, 3000)
+    assert allocation == {"short": 100, "long": 1450, "longer": 1450}
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+import batch
+import checkpoint
+import config
+import council
+import council_profiles
+
+
+def test_example_presets_are_valid_profiles():
+    names = council_profiles.available_profiles()
+    assert {"creative-council", "systematic-council"} <= set(names)
+    for name in names:
+        assert council_profiles.loader.load(name).settings
+
+
+def test_invalid_profiles_report_every_problem(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PROFILES_DIR", str(tmp_path))
+    (tmp_path / "broken.json").write_text(
+        '{"TEMPERATURE": 3, "MAX_TOKEN": 100, "CHAIRMAN_MODEL": "nobody"}', encoding="utf-8"
+    )
+    with pytest.raises(council_profiles.ProfileError) as error:
+        council_profiles.loader.load("broken")
+    assert "unknown setting MAX_TOKEN" in str(error.value)
+
+    (tmp_path / "broken.json").write_text('{"TEMPERATURE": 3, "CHAIRMAN_MODEL": "nobody"}', encoding="utf-8")
+    with pytest.raises(council_profiles.ProfileError) as error:
+        council_profiles.loader.load("broken")
+    assert "TEMPERATURE must be a number from 0 to 2" in str(error.value)
+    assert "CHAIRMAN_MODEL 'nobody' is not in COUNCIL_MODELS" in str(error.value)
+
+
+def test_profiles_are_reloaded_when_their_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PROFILES_DIR", str(tmp_path))
+    path = tmp_path / "steady.py"
+    path.write_text('PRESET = {"TEMPERATURE": 0.2}\n', encoding="utf-8")
+    with council_profiles.applied("steady"):
+        assert config.TEMPERATURE == 0.2
+    assert config.TEMPERATURE == 0.7
+
+    path.write_text('PRESET = {"TEMPERATURE": 0.3}\n', encoding="utf-8")
+    modified = path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(modified, modified))
+    assert council_profiles.loader.load("steady").settings == {"TEMPERATURE": 0.3}
+
+
+def test_one_batch_can_mix_profiles(stub_server, tmp_path, monkeypatch):
+    server = stub_server()
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "MODEL_SWITCH_MODE", "none")
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path / "sessions")
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+
+    specs = [
+        batch.SessionSpec("creative", "60 minutes, U10s, focus on rucks", "creative-council"),
+        batch.SessionSpec("systematic", "60 minutes, U10s, focus on rucks", "systematic-council"),
+    ]
+    outputs = batch.run_profiled_batch(specs, batch_name="mixed")
+
+    assert set(outputs) == {"creative", "systematic"}
+    assert sorted({request["temperature"] for request in server.requests}) == [0.2, 0.95]
+    assert config.TEMPERATURE == 0.7
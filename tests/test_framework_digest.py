@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import config
+import council
+import framework_digest
+import plan_linter
+import prompt_prefix
+from context_packer import estimate_tokens
+
+FRAMEWORK = (Path(__file__).parent.parent / "coaching_framework.md").read_text(encoding="utf-8")
+
+
+def test_each_stage_gets_a_digest_suited_to_it():
+    digests = framework_digest.get_digests(FRAMEWORK)
+    planning, review, synthesis = (digests.for_stage(stage) for stage in ("stage_1", "stage_2", "stage_3"))
+
+    assert "Use STEP principle (Space, Task, Equipment, People)" in planning
+    assert "*Source:" not in planning
+    assert "- TREDS Values: Teamwork, Respect, Enjoyment, Discipline, Sportsmanship" in review
+    assert "Active - Players engaged and moving" in synthesis
+    for text in (review, synthesis):
+        assert all(habit in text for habit in plan_linter.HABITS)
+    assert estimate_tokens(review) < estimate_tokens(synthesis) < estimate_tokens(planning)
+    assert digests.for_stage("warm-up") == FRAMEWORK
+
+
+def test_digests_are_cached_until_the_framework_changes(tmp_path, monkeypatch):
+    first = framework_digest.DigestCache(tmp_path).get(FRAMEWORK)
+    assert [path.name for path in tmp_path.iterdir()] == [f"coaching_framework-{first.source_hash}.json"]
+
+    # A new process reads them back instead of building them again
+    monkeypatch.setattr(framework_digest, "BUILDERS", {kind: None for kind in framework_digest.BUILDERS})
+    assert framework_digest.DigestCache(tmp_path).get(FRAMEWORK).digests == first.digests
+
+    monkeypatch.undo()
+    changed = framework_digest.DigestCache(tmp_path).get(FRAMEWORK + "\n## Safety\n\n- Check the pitch\n")
+    assert changed.source_hash != first.source_hash
+    assert "- Safety: Check the pitch" in changed.for_stage("stage_2")
+    assert [path.name for path in tmp_path.iterdir()] == [f"coaching_framework-{changed.source_hash}.json"]
+
+    # Another framework's digests are kept alongside, not replaced
+    other = framework_digest.DigestCache(tmp_path).get("## Other\n\n- Run", source="other_framework")
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        f"coaching_framework-{changed.source_hash}.json", f"other_framework-{other.source_hash}.json"
+    ]
+
+
+def test_reviews_carry_the_checklist_not_the_whole_framework(stub_server, monkeypatch):
+    server = stub_server()
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "MODEL_SWITCH_MODE", "none")
+
+    responses = council.stage_1_individual_responses("60 minutes, U10s", FRAMEWORK)
+    council.stage_2_peer_review(responses, FRAMEWORK)
+
+    prefixes = [request["messages"][0]["content"] for request in server.requests]
+    assert set(prefixes[:3]) == {prompt_prefix.build_stage_prefix(FRAMEWORK, "stage_1")}
+    assert set(prefixes[3:]) == {prompt_prefix.build_stage_prefix(FRAMEWORK, "stage_2")}
+    assert estimate_tokens(prefixes[3]) < estimate_tokens(prefixes[0]) / 2
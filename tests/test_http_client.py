@@ -0,0 +1,34 @@
+import pytest
+import requests
+
+import http_client
+
+
+def test_busy_server_is_retried_with_backoff(stub_server):
+    server = stub_server(fail_first=2)
+    delays = []
+    client = http_client.CouncilHTTPClient(max_retries=3, sleep=delays.append)
+
+    response = client.post(f"{server.url}/chat/completions", json={"model": "m", "messages": []})
+
+    assert response.status_code == 200
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= 1.0 and 0 <= delays[1] <= 2.0
+    assert client.last_record().retries == 2
+
+
+def test_gives_up_after_max_retries(stub_server):
+    server = stub_server(fail_first=5)
+    client = http_client.CouncilHTTPClient(max_retries=1, sleep=lambda delay: None)
+
+    response = client.post(f"{server.url}/chat/completions", json={"model": "m", "messages": []})
+
+    assert response.status_code == 503
+    assert client.last_record().attempts == 2
+
+
+def test_connection_errors_are_retried_then_raised():
+    client = http_client.CouncilHTTPClient(max_retries=2, sleep=lambda delay: None)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post("http://127.0.0.1:9/v1/chat/completions", json={}, timeout=1)
+    assert client.last_record().attempts == 3
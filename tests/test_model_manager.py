@@ -0,0 +1,51 @@
+import pytest
+
+import checkpoint
+import config
+import council
+import model_manager
+
+
+def test_lmstudio_manager_loads_and_waits_until_ready(stub_server):
+    server = stub_server(load_seconds=0.2)
+    manager = model_manager.LMStudioModelManager(server.url, server.url, poll_interval=0.01)
+
+    manager.ensure_loaded("model-a")
+    manager.ensure_loaded("model-b")
+
+    assert manager.loaded_models() == ["model-b"]
+    assert server.model_loads == 2
+    assert all(times[0] >= 0.2 for times in manager.load_times.values())
+    assert len(manager.report()) == 3
+
+
+def test_unattended_council_run_loads_models_itself(stub_server, tmp_path, monkeypatch):
+    server = stub_server()
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "MODEL_SWITCH_MODE", "lmstudio")
+    monkeypatch.setattr(config, "MODEL_LOAD_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path / "sessions")
+    monkeypatch.setattr(council, "_loaded_model", None)
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    monkeypatch.setattr(council, "wait_for_model_switch", pytest.fail)
+
+    council.run_council("60 minutes, U10s")
+
+    # Every load went through the API; the chat requests never had to swap
+    assert server.model_loads == 5
+    assert set(council.get_model_manager().load_times) == {
+        info["name"] for info in config.COUNCIL_MODELS.values()
+    }
+
+
+def test_unknown_switch_mode_is_rejected():
+    with pytest.raises(ValueError):
+        model_manager.create_manager("automatic")
+
+
+def test_a_manager_without_load_cant_be_created():
+    class Incomplete(model_manager.ModelManager):
+        mode = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,36 @@
+import time
+
+import checkpoint
+import config
+import council
+import pipeline
+
+
+def test_incremental_stage_2_overlaps_with_slow_plans(stub_server, tmp_path, monkeypatch):
+    fast_a, fast_b, slow = stub_server(), stub_server(), stub_server(delay=0.6)
+    servers = {"reasoning": fast_a, "instruct": fast_b, "gpt": slow}
+    monkeypatch.setattr(config, "MODEL_ENDPOINTS", {key: {"url": server.url} for key, server in servers.items()})
+    monkeypatch.setattr(config, "LINT_FIX", "off")
+    monkeypatch.setattr(config, "STAGE_2_MODE", "incremental")
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path)
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+
+    start = time.perf_counter()
+    run = checkpoint.RunCheckpoint.create("60 minutes, U10s")
+    council.run_council(checkpoint=run)
+
+    # Each member writes a plan, scores one plan and makes one ranking pass;
+    # the chairman then synthesises
+    assert [len(servers[key].requests) for key in ("reasoning", "instruct", "gpt")] == [4, 3, 3]
+    # Plan A was scored (by instruct) before the slow plan had even arrived
+    scorecard_time = next(
+        arrived for arrived, request in zip(fast_b.request_times, fast_b.requests)
+        if "PLAN A:" in request["messages"][-1]["content"]
+    )
+    assert scorecard_time - start < 0.6
+    assert all("**Detailed Feedback:**" in review for review in run.reviews.values())
+
+
+def test_every_plan_is_scored_by_someone_else():
+    scorers = pipeline.assign_scorers(["a", "b", "c", "d"])
+    assert scorers == {"a": "b", "b": "c", "c": "d", "d": "a"}
@@ -0,0 +1,134 @@
+import json
+
+import checkpoint
+import config
+import council
+import plan_linter
+from archive import parse_session_file
+
+SESSION = "60 minutes, U10s, 24 players, 4 coaches, focus on decision making around the breakdown"
+
+HABITS = """## Coaching Habits
+
+- **Shared Purpose:** explain why the breakdown matters
+- **Progression:** add defenders as players succeed
+- **Praise:** praise good decisions, not just outcomes
+- **Review:** ask what they noticed after each round
+- **Choice:** players choose when to contest"""
+
+
+def markdown_plan(warm_up: int = 10) -> str:
+    return f"""# Breakdown Bosses (60 minutes)
+
+## Session Objectives
+
+- Decide when to contest and when to support
+
+## Warm-up: Ruck & Roll Circuit ({warm_up} minutes)
+
+Four stations in groups of 6.
+
+## Main Activity: Ruck Decision Race (20 minutes)
+
+## Game: Breakdown Battle (20 minutes)
+
+## Cool-down and Review (10 minutes)
+
+## Coaching Points
+
+- Low body height
+
+{HABITS}"""
+
+
+def test_a_plan_that_fits_the_session_passes():
+    report = plan_linter.lint_plan(markdown_plan(), SESSION)
+
+    assert report.issues == []
+    assert report.total_minutes == 60
+
+
+def test_the_case_study_overrun_is_caught():
+    # The case study's final plan: 65 minutes of activities in a 60-minute session
+    report = plan_linter.lint_plan(markdown_plan(warm_up=15), SESSION)
+
+    assert not report.ok
+    assert [issue.code for issue in report.errors] == ["DURATION"]
+    assert "65 minutes" in report.errors[0].message
+
+
+def test_missing_habits_sections_and_big_groups():
+    plan = markdown_plan().replace("- **Choice:** players choose when to contest", "")
+    plan = plan.replace("## Cool-down and Review", "## Wind-down").replace("groups of 6", "groups of 12")
+
+    report = plan_linter.lint_plan(plan, SESSION)
+
+    messages = {issue.code: issue.message for issue in report.errors}
+    assert messages["HABITS"] == "Missing Coaching Habit(s): Choice"
+    assert messages["SECTIONS"] == "Missing section(s): Cool-down"
+    assert "Groups of 12" in messages["RATIO"]
+
+
+def test_too_few_coaches_is_a_warning():
+    report = plan_linter.lint_plan(markdown_plan(), "60 minutes, U8s, 30 players, 2 coaches")
+
+    assert report.ok
+    assert [(issue.code, issue.severity) for issue in report.issues] == [("RATIO", plan_linter.WARNING)]
+
+
+def test_structured_plans_are_checked_from_their_fields():
+    activities = [("warm-up", 10), ("skill", 25), ("game", 20), ("cool-down", 5)]
+    plan = json.dumps({
+        "title": "Breakdown Bosses",
+        "objectives": ["Decide when to contest"],
+        "activities": [{"name": f"Activity {n}", "phase": phase, "duration_minutes": minutes,
+                        "description": "Rucks.", "step_progressions": [], "coaching_points": []}
+                       for n, (phase, minutes) in enumerate(activities)],
+        "coaching_points": ["Low body height"],
+        "coaching_habits": [{"habit": habit, "how": "Yes."} for habit in plan_linter.HABITS],
+    })
+
+    assert plan_linter.lint_plan(plan, SESSION).ok
+    assert not plan_linter.lint_plan(plan, "45 minutes, U10s").ok
+
+
+def _council(stub_server, tmp_path, monkeypatch):
+    server = stub_server(response_tokens=40)
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "MODEL_SWITCH_MODE", "none")
+    monkeypatch.setattr(config, "STRUCTURED_OUTPUT", True)
+    monkeypatch.setattr(config, "LINT_FIX", "final")
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path)
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    return server
+
+
+def test_a_failing_final_plan_gets_one_fix_up_request(stub_server, tmp_path, monkeypatch):
+    # Mock plans always last 60 minutes, so a 45-minute session fails the check
+    server = _council(stub_server, tmp_path, monkeypatch)
+
+    output_file = council.run_council("45 minutes, U10s, 20 players, 2 coaches, focus on rucks")
+
+    prompts = [request["messages"][-1]["content"] for request in server.requests]
+    fixes = [prompt for prompt in prompts if prompt.startswith("A check of your session plan")]
+    assert len(fixes) == 1
+    assert "Activities add up to 60 minutes, but the session is 45 minutes" in fixes[0]
+    assert len(server.requests) == 3 + 3 + 1 + 1
+
+    saved = output_file.read_text(encoding="utf-8")
+    assert f"## {plan_linter.CHECKS_HEADING}" in saved
+    assert "### Final plan\n\n- ❌ Activities add up to 60 minutes" in saved
+    assert plan_linter.CHECKS_HEADING not in parse_session_file(output_file)["final_plan"]
+
+
+def test_a_fix_is_kept_only_if_it_helps(monkeypatch):
+    monkeypatch.setattr(config, "STRUCTURED_OUTPUT", False)
+    monkeypatch.setattr(config, "LINT_FIX", "all")
+    replies = {"stage_1": markdown_plan(warm_up=15), "stage_1_fix": markdown_plan()}
+    monkeypatch.setattr(council, "_request_plan", lambda prompt, key, prefix, url, stage, session: replies[stage])
+
+    assert council.ask_for_plan("plan", "reasoning", "", stage="stage_1", session_params=SESSION) == markdown_plan()
+
+    replies["stage_1_fix"] = markdown_plan(warm_up=20)
+    plan = council.ask_for_plan("plan", "reasoning", "", stage="stage_1", session_params=SESSION)
+    assert plan == markdown_plan(warm_up=15)
@@ -0,0 +1,35 @@
+import config
+import council
+import prompt_prefix
+
+
+def test_every_stage_starts_with_the_same_prefix(stub_server, monkeypatch):
+    server = stub_server()
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(council, "wait_for_model_switch", lambda model_name: None)
+    # With digests each stage has its own prefix (see test_framework_digest.py)
+    monkeypatch.setattr(config, "FRAMEWORK_DIGESTS", False)
+
+    responses = council.stage_1_individual_responses("60 minutes, U10s", "FRAMEWORK TEXT")
+    council.stage_2_peer_review(responses, "FRAMEWORK TEXT")
+
+    system_messages = {request["messages"][0]["content"] for request in server.requests}
+    assert system_messages == {prompt_prefix.build_shared_prefix("FRAMEWORK TEXT")}
+    assert all("FRAMEWORK TEXT" not in request["messages"][1]["content"] for request in server.requests)
+
+
+def test_each_model_is_warmed_once(stub_server, monkeypatch):
+    server = stub_server()
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "PREFIX_WARMUP", True)
+    monkeypatch.setattr(prompt_prefix, "extract_prompt_time", lambda result: 0.25)
+    prompt_prefix.warmer.reset()
+    prompt_prefix.timings.clear()
+
+    council.call_council_model("plan please", "instruct", "PREFIX")
+    council.call_council_model("review please", "instruct", "PREFIX")
+
+    assert [request["max_tokens"] for request in server.requests] == [1, config.MAX_TOKENS, config.MAX_TOKENS]
+    # The warm-up's prompt time is recorded once, as a warm-up
+    kinds = [line.split()[1] for line in prompt_prefix.timings.report()[:-1]]
+    assert kinds == ["warm-up", "call", "call"]
@@ -0,0 +1,69 @@
+import sqlite3
+
+import checkpoint
+import config
+import council
+import request_matching
+from archive import ArchivedSession
+
+
+def archived(session_params, name="council_session_1.md"):
+    return ArchivedSession(name, "2024-12-15T14:30:22", session_params, None, "", "final plan")
+
+
+def test_reworded_requests_match_and_different_ones_do_not():
+    candidates = [
+        archived("U10s 60 minutes breakdown decisions", "same.md"),
+        archived("60 minutes, U10s, focus on passing in pairs", "other-focus.md"),
+        archived("60 minutes, U12s, focus on breakdown decisions", "other-age.md"),
+    ]
+    for candidate in candidates:
+        candidate.focus = request_matching.parse_session_params(candidate.session_params).focus
+
+    matches = request_matching.find_matches("60 mins, U10s, decision making at the breakdown", candidates)
+
+    assert matches[0].session.session_file == "same.md"
+    assert matches[0].similarity > 0.8
+    assert "other-age.md" not in [match.session.session_file for match in matches]
+    assert matches[1].similarity < 0.3
+
+
+def test_matching_request_reuses_earlier_plans(stub_server, tmp_path, monkeypatch):
+    server = stub_server()
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "LINT_FIX", "off")
+    monkeypatch.setattr(config, "MODEL_SWITCH_MODE", "none")
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path)
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+
+    first = council.plan_with_reuse(checkpoint.RunCheckpoint.create("U10s 60 minutes breakdown decisions"))
+    assert len(server.requests) == 7
+
+    again = checkpoint.RunCheckpoint.create("60 mins, U10s, decision making at the breakdown")
+    assert council.plan_with_reuse(again, action="reuse_result") == first
+    assert len(server.requests) == 7
+
+    council.plan_with_reuse(again, action="reuse_plans")
+    # Three reviews and the chairman; the plans came from the earlier run
+    assert len(server.requests) == 11
+
+
+def test_tag_is_not_tackling_and_unattended_runs_are_not_asked(monkeypatch):
+    assert "tackl" not in request_matching.normalise_words("tag rugby games")
+    assert "tackl" in request_matching.normalise_words("contact skills")
+
+    match = request_matching.RequestMatch(archived("60 minutes, U10s, rucks"), 0.9)
+    monkeypatch.setattr("sys.stdin", None)
+    assert request_matching.ask_what_to_do(match) == "off"
+
+
+def test_a_broken_archive_runs_a_new_council(tmp_path, monkeypatch):
+    class BrokenArchive:
+        def search(self, **filters):
+            raise sqlite3.DatabaseError("database disk image is malformed")
+
+    monkeypatch.setattr(council, "get_archive", lambda: BrokenArchive())
+    monkeypatch.setattr(council, "run_council", lambda checkpoint: "new council")
+
+    run = checkpoint.RunCheckpoint("run-1", "60 minutes, U10s, rucks", tmp_path / "run-1.json")
+    assert council.plan_with_reuse(run, action="reuse_result") == "new council"
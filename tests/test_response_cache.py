@@ -0,0 +1,36 @@
+import os
+
+import config
+import council
+import response_cache
+
+
+def test_identical_call_is_served_from_cache(stub_server, tmp_path, monkeypatch):
+    server = stub_server()
+    cache = response_cache.ResponseCache(tmp_path, max_bytes=1024 * 1024)
+    monkeypatch.setattr(config, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(response_cache, "_cache", cache)
+
+    first = council.call_lm_studio("hi", "mistral-3-8b", base_url=server.url)
+    second = council.call_lm_studio("hi", "mistral-3-8b", base_url=server.url)
+    council.call_lm_studio("hi", "mistral-3-8b", temperature=0.2, base_url=server.url)
+    council.call_lm_studio("hi", "mistral-3-8b", base_url=server.url, use_cache=False)
+
+    assert first == second
+    assert len(server.requests) == 3
+    assert cache.stats() == {"hits": 1, "misses": 2, "evictions": 0}
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = response_cache.ResponseCache(tmp_path, max_bytes=400)
+    cache.put("old", "x" * 100)
+    cache.put("used", "y" * 100)
+    os.utime(tmp_path / "old.json", (1, 1))
+    os.utime(tmp_path / "used.json", (2, 2))
+    assert cache.get("used") is not None
+    cache.put("new", "z" * 100)
+
+    assert cache.get("old") is None
+    assert cache.get("used") is not None
+    assert cache.get("new") is not None
+    assert cache.evictions == 1
@@ -0,0 +1,25 @@
+import scheduler
+
+
+def test_default_council_needs_five_loads_instead_of_seven():
+    schedule = scheduler.plan_council_schedule(["reasoning", "instruct", "gpt"], "reasoning")
+    assert schedule.naive_loads == 7
+    assert schedule.model_loads == 5
+    assert schedule.swaps_saved == 2
+
+
+def test_schedule_chains_stages_on_the_same_model():
+    schedule = scheduler.plan_council_schedule(["reasoning", "instruct", "gpt"], "reasoning")
+    stage_1 = schedule.order_for_stage(1)
+    stage_2 = schedule.order_for_stage(2)
+    assert sorted(stage_1) == sorted(stage_2) == ["gpt", "instruct", "reasoning"]
+    assert stage_1[-1] == stage_2[0]
+    assert stage_2[-1] == "reasoning"
+    assert schedule.order_for_stage(3) == ["reasoning"]
+
+
+def test_schedule_starts_with_already_loaded_model():
+    schedule = scheduler.plan_council_schedule(["reasoning", "instruct", "gpt"], "reasoning",
+                                               loaded_model="instruct")
+    assert schedule.order_for_stage(1)[0] == "instruct"
+    assert schedule.model_loads == 4
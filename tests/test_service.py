@@ -0,0 +1,58 @@
+import json
+import urllib.request
+
+import checkpoint
+import config
+import council
+import service
+
+
+def request(url, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=30) as response:
+        return response.status, response.read().decode("utf-8")
+
+
+def test_jobs_submitted_together_are_planned_as_one_batch(stub_server, tmp_path, monkeypatch):
+    server = stub_server()
+    switches = []
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "LINT_FIX", "off")
+    monkeypatch.setattr(config, "SERVICE_BATCH_WINDOW", 0.5)
+    monkeypatch.setattr(config, "SERVICE_POLL_INTERVAL", 0.05)
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path / "sessions")
+    monkeypatch.setattr(council, "_loaded_model", None)
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    monkeypatch.setattr(council, "wait_for_model_switch", switches.append)
+
+    council_service = service.CouncilService("127.0.0.1", 0).start()
+    try:
+        status, body = request(council_service.url + "/jobs", {"session_params": "60 minutes, U10s, focus on rucks"})
+        assert status == 202
+        first = json.loads(body)
+        _, body = request(council_service.url + "/jobs", {"session_params": "75 minutes, U12s, focus on defence"})
+        second = json.loads(body)
+
+        _, events = request(f"{council_service.url}/jobs/{first['id']}/events")
+        assert "event: done" in events
+
+        _, body = request(f"{council_service.url}/jobs/{second['id']}")
+        job = json.loads(body)
+    finally:
+        council_service.stop()
+
+    assert job["status"] == "done"
+    assert "## STAGE 3: Final Synthesized Plan" in job["result"]
+    assert len(server.requests) == 14
+    # Both sessions shared each model load
+    assert len(switches) == 5
+
+
+def test_interrupted_jobs_are_queued_again(tmp_path):
+    queue = service.JobQueue(tmp_path / "jobs.db")
+    job = queue.submit("60 minutes, U10s, focus on rucks")
+    assert [claimed.id for claimed in queue.claim(8)] == [job.id]
+    assert queue.claim(8) == []
+
+    assert queue.requeue_interrupted() == 1
+    assert queue.get(job.id).status == service.QUEUED
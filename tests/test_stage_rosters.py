@@ -0,0 +1,54 @@
+import json
+
+import checkpoint
+import config
+import council
+import telemetry
+from archive import parse_session_file
+
+
+def test_cheap_reviewers_and_a_chairman_only_model(stub_server, tmp_path, monkeypatch):
+    server = stub_server(response_tokens=20)
+    members = {
+        "writer-1": {"name": "writer-one", "role": "Writer One", "tier": "medium", "cost_per_1k_tokens": 2.0},
+        "writer-2": {"name": "writer-two", "role": "Writer Two", "tier": "medium", "cost_per_1k_tokens": 2.0},
+        "reviewer": {"name": "small-one", "role": "Quick Reviewer", "tier": "small", "cost_per_1k_tokens": 0.5},
+        "chair": {"name": "large-one", "role": "Chairman", "tier": "large", "cost_per_1k_tokens": 8.0},
+    }
+    monkeypatch.setattr(config, "COUNCIL_MODELS", members)
+    monkeypatch.setattr(config, "LINT_FIX", "off")
+    monkeypatch.setattr(config, "CHAIRMAN_MODEL", "chair")
+    monkeypatch.setattr(config, "STAGE_ROSTERS", {"stage_1": ["writer-1", "writer-2"], "stage_2": ["reviewer"]})
+    monkeypatch.setattr(config, "STAGE_MAX_TOKENS", {"stage_2": 600})
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "MODEL_SWITCH_MODE", "none")
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path)
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+
+    output_file = council.run_council("60 minutes, U10s, focus on rucks")
+
+    calls = [(request["model"], request["max_tokens"]) for request in server.requests]
+    assert calls == [("writer-one", 2000), ("writer-two", 2000), ("small-one", 600), ("large-one", 2000)]
+
+    by_tier = json.loads(telemetry.sidecar_path(output_file).read_text(encoding="utf-8"))["by_tier"]
+    assert set(by_tier["stage_1"]) == {"medium"}
+    assert by_tier["stage_2"]["small"]["calls"] == 1
+    assert by_tier["stage_3"]["large"]["cost"] > 0
+    assert "| stage_3 | large | 1 |" in output_file.read_text(encoding="utf-8")
+    assert telemetry.TIERS_HEADING not in parse_session_file(output_file)["final_plan"]
+
+
+def test_packing_reserves_each_stage_s_own_response_length(monkeypatch):
+    monkeypatch.setattr(config, "STAGE_MAX_TOKENS", {"stage_2": 600, "stage_3": 3000})
+    reserved = {}
+
+    def pack_parts(parts, fixed_prompt, label, max_output_tokens=None):
+        reserved[label] = max_output_tokens
+        return parts
+
+    monkeypatch.setattr(council.context_packer, "pack_parts", pack_parts)
+    responses = {key: "plan" for key in config.COUNCIL_MODELS}
+    council.prepare_review_prompt(responses, "framework")
+    council.prepare_synthesis_prompt(responses, {key: "review" for key in responses}, "60 minutes, U10s", "framework")
+
+    assert reserved == {"Stage 2": 600, "Stage 3": 3000}
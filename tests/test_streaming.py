@@ -0,0 +1,34 @@
+import time
+
+import pytest
+
+import config
+import council
+import streaming
+
+
+def test_streamed_response_matches_plain_response(stub_server):
+    server = stub_server()
+    plain = council.call_lm_studio("hi", "mistral-3-8b", base_url=server.url, stream=False)
+    streamed = council.call_lm_studio("hi", "mistral-3-8b", base_url=server.url, stream=True)
+    assert streamed == plain == "response from mistral-3-8b"
+    assert server.requests[-1]["stream"] is True
+
+
+def test_stalled_stream_is_aborted(stub_server, monkeypatch):
+    server = stub_server(stall_after=1, stall_for=2.0)
+    monkeypatch.setattr(config, "STREAM_STALL_TIMEOUT", 0.3)
+    monkeypatch.setattr(config, "STREAM_FIRST_TOKEN_TIMEOUT", 0.3)
+    with pytest.raises(streaming.StreamStalledError):
+        council.call_lm_studio("hi", "mistral-3-8b", base_url=server.url, stream=True)
+
+
+def test_mid_response_stall_uses_the_stall_limit(stub_server, monkeypatch):
+    # A generous first-token limit must not delay catching a stall once tokens flow
+    server = stub_server(stall_after=1, stall_for=5.0)
+    monkeypatch.setattr(config, "STREAM_STALL_TIMEOUT", 0.3)
+    monkeypatch.setattr(config, "STREAM_FIRST_TOKEN_TIMEOUT", 4.0)
+    start = time.perf_counter()
+    with pytest.raises(streaming.StreamStalledError):
+        council.call_lm_studio("hi", "mistral-3-8b", base_url=server.url, stream=True)
+    assert time.perf_counter() - start < 2.0
@@ -0,0 +1,87 @@
+import json
+
+import checkpoint
+import config
+import council
+import structured
+
+PLAN = {
+    "title": "Breakdown decisions",
+    "objectives": ["Choose when to ruck or pass"],
+    "activities": [
+        {"name": "Tag warm-up", "phase": "warm-up", "duration_minutes": 10, "description": "Tag in pairs."},
+        {"name": "Ruck or pass", "phase": "game", "duration_minutes": 50, "description": "Small-sided game.",
+         "step_progressions": ["Add a defender"]},
+    ],
+    "coaching_points": ["Scan before contact"],
+    "coaching_habits": [{"habit": "Choice", "how": "Players pick the rule."}],
+}
+
+
+def test_validator_lists_every_problem():
+    broken = dict(PLAN, activities=[{"name": "Drill", "phase": "drills", "duration_minutes": "ten"}])
+    del broken["coaching_points"]
+    errors = structured.validate_plan(broken)
+    assert 'missing "coaching_points"' in errors
+    assert any('"phase"' in error for error in errors)
+    assert any('"duration_minutes"' in error for error in errors)
+    assert structured.validate_plan(PLAN) == []
+
+
+def test_invalid_reply_is_repaired_within_the_limit():
+    replies = iter(["Here's a plan: not JSON", "```json\n" + json.dumps(PLAN) + "\n```"])
+    prompts = []
+
+    def ask(prompt):
+        prompts.append(prompt)
+        return next(replies)
+
+    plan, text = structured.request_plan(ask, "plan please", max_repairs=2)
+    assert plan == PLAN
+    assert json.loads(text) == PLAN
+    assert "not valid JSON" in prompts[1]
+
+    plan, text = structured.request_plan(lambda prompt: "still prose", "plan please", max_repairs=1)
+    assert plan is None and text == "still prose"
+
+
+def test_truncated_reply_is_sent_for_repair():
+    truncated = "Here is the plan:\n" + json.dumps(PLAN)[:80]
+    assert structured.try_parse(truncated) is None
+
+    replies = iter([truncated, json.dumps(PLAN)])
+    prompts = []
+
+    def ask(prompt):
+        prompts.append(prompt)
+        return next(replies)
+
+    plan, _ = structured.request_plan(ask, "plan please", max_repairs=1)
+    assert plan == PLAN
+    assert "not valid JSON (no closing brace)" in prompts[1]
+
+
+def test_structured_plan_renders_and_summarises():
+    markdown = structured.render_markdown(PLAN)
+    assert "**Total time:** 60 minutes" in markdown
+    assert "## Game: Ruck or pass (50 min)" in markdown
+    assert "Tag warm-up (10 min)" in structured.summarise_plan(PLAN)
+    assert structured.for_review("## A markdown plan") == "## A markdown plan"
+
+
+def test_structured_council_run(stub_server, tmp_path, monkeypatch):
+    server = stub_server(response_tokens=200)
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "MODEL_SWITCH_MODE", "none")
+    monkeypatch.setattr(config, "STRUCTURED_OUTPUT", True)
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path)
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+
+    output_file = council.run_council("60 minutes, U10s")
+
+    plan_requests = [r for r in server.requests if "response_format" in r]
+    assert len(plan_requests) == 4
+    review_prompt = next(r for r in server.requests if "response_format" not in r)["messages"][-1]["content"]
+    assert "[warm-up] Activity 1 (10 min)" in review_prompt
+    assert '"activities"' not in review_prompt
+    assert "**Total time:** 60 minutes" in output_file.read_text(encoding="utf-8")
@@ -0,0 +1,37 @@
+import json
+
+import checkpoint
+import config
+import council
+import telemetry
+
+
+def test_session_telemetry_is_saved_next_to_the_markdown(stub_server, tmp_path, monkeypatch):
+    server = stub_server(response_tokens=20)
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "LINT_FIX", "off")
+    monkeypatch.setattr(config, "MODEL_SWITCH_MODE", "none")
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path)
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+
+    output_file = council.run_council("60 minutes, U10s")
+
+    report = json.loads(telemetry.sidecar_path(output_file).read_text(encoding="utf-8"))
+    assert report["totals"]["calls"] == 7
+    assert report["by_stage"]["stage_1"]["calls"] == 3
+    assert report["by_stage"]["stage_3"]["calls"] == 1
+    # Token counts come from the API's usage field
+    assert report["totals"]["completion_tokens"] == 7 * 20
+    assert all(call["prompt_tokens"] for call in report["calls"])
+    assert set(report["stage_times"]) == {"stage_1", "stage_2", "stage_3"}
+
+    summary = telemetry.aggregate(telemetry.load_sidecars(tmp_path))
+    assert summary["sessions"] == 1
+    assert sum(group["calls"] for group in summary["by_model"].values()) == 7
+
+
+def test_streamed_calls_report_time_to_first_token():
+    call = telemetry.CallMetrics("stage_1", "model", wall_time=3.0, completion_tokens=100,
+                                 time_to_first_token=1.0)
+    assert call.tokens_per_second == 50.0
+    assert telemetry.CallMetrics("stage_1", "model", 0.01, cached=True).tokens_per_second is None
@@ -0,0 +1,69 @@
+from collections import Counter
+
+import pytest
+
+import checkpoint
+import config
+import consensus
+import council
+import tournament
+
+
+def test_every_plan_is_reviewed_equally_often_in_fixed_size_groups():
+    labels = [tournament.label(index) for index in range(7)]
+    groups = tournament.review_groups(labels, [f"member-{n}" for n in range(7)], 3)
+
+    assert all(len(group) == len(set(group)) == 3 for group in groups.values())
+    assert set(Counter(label for group in groups.values() for label in group).values()) == {3}
+    # Small councils still review every plan
+    assert tournament.review_groups(labels[:3], ["a", "b", "c"], 3)["a"] == labels[:3]
+
+
+def test_every_plan_is_reviewed_with_fewer_reviewers_than_plans():
+    for plans, reviewers in ((6, 3), (5, 2), (7, 3)):
+        labels = [tournament.label(index) for index in range(plans)]
+        groups = tournament.review_groups(labels, [f"member-{n}" for n in range(reviewers)], 3)
+
+        assert all(len(group) == len(set(group)) == 3 for group in groups.values())
+        assert {label for group in groups.values() for label in group} == set(labels)
+
+    with pytest.raises(ValueError, match="can't review all 7 plans"):
+        tournament.review_groups([tournament.label(index) for index in range(7)], ["a", "b"], 3)
+
+
+def test_group_rankings_combine_into_one_order():
+    rankings = [["Plan B", "Plan C", "Plan A"], ["Plan C", "Plan D", "Plan B"],
+                ["Plan D", "Plan A", "Plan C"], ["Plan B", "Plan A", "Plan D"]]
+    labels = ["Plan A", "Plan B", "Plan C", "Plan D"]
+    assert tournament.global_order(labels, rankings)[0] == "Plan B"
+
+    reviews = {str(n): "**Rankings:**\n" + "\n".join(f"{tournament.ordinal(i + 1)}: {plan}"
+                                                      for i, plan in enumerate(ranking))
+               for n, ranking in enumerate(rankings)}
+    agreed = consensus.build_consensus(reviews, labels, pairwise=True)
+    assert agreed.winner == "Plan B"
+    # Plan B won four of its six comparisons
+    assert agreed.agreement == 4 / 6
+
+
+def test_a_fourth_council_member_is_reviewed_in_groups(stub_server, tmp_path, monkeypatch):
+    server = stub_server()
+    members = dict(config.COUNCIL_MODELS)
+    members["fourth"] = {"name": "model-four", "description": "Fourth model", "role": "Fourth Coach"}
+    monkeypatch.setattr(config, "COUNCIL_MODELS", members)
+    monkeypatch.setattr(config, "LINT_FIX", "off")
+    monkeypatch.setattr(config, "LM_STUDIO_BASE_URL", server.url)
+    monkeypatch.setattr(config, "MODEL_SWITCH_MODE", "none")
+    monkeypatch.setattr(council, "SESSIONS_DIR", tmp_path)
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+
+    council.run_council("60 minutes, U10s, focus on rucks")
+
+    prompts = [request["messages"][-1]["content"] for request in server.requests]
+    reviews = [prompt for prompt in prompts if "You are reviewing" in prompt]
+    assert len(reviews) == 4
+    assert all(prompt.startswith("You are reviewing three") for prompt in reviews)
+    reviewed = Counter(label for prompt in reviews for label in ("Plan A", "Plan B", "Plan C", "Plan D")
+                       if f"{label}:" in prompt)
+    assert reviewed == {"Plan A": 3, "Plan B": 3, "Plan C": 3, "Plan D": 3}
+    assert "received four independent session plans" in prompts[-1]
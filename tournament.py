@@ -0,0 +1,142 @@
+"""
+Rugby Council AI - Review Tournament
+
+Stage 2 used to give every reviewer every plan, under three fixed labels,
+so a fourth council member's plan was silently dropped - and even with
+more labels, each review prompt (and the total review tokens) would grow
+with the size of the council until it no longer fitted.
+
+With more plans than config.REVIEW_GROUP_SIZE, Stage 2 becomes a small
+tournament instead. Each reviewer gets a fixed-size group of plans, dealt
+out in turn so that every plan is reviewed (as evenly as the numbers
+allow) and meets different opponents in different groups:
+
+    4 plans, groups of 3:   reviewer 1: A B C   reviewer 2: D A B
+                            reviewer 3: C D A   reviewer 4: B C D
+
+Each group ranking counts as a set of pairwise results (a plan beats
+every plan ranked below it), and the results are combined into one global
+order with a Bradley-Terry model, which - unlike a Borda count - allows
+for plans having been compared against different opponents.
+
+Review prompts then hold at most REVIEW_GROUP_SIZE plans however large the
+council, and total review tokens grow in step with the number of members.
+Councils no bigger than the group size review every plan, as before.
+"""
+
+import string
+from itertools import combinations
+from typing import Dict, List, Tuple
+
+# Bradley-Terry fitting
+ITERATIONS = 200
+TOLERANCE = 1e-9
+
+
+def label(index: int) -> str:
+    """The anonymous label of the index-th plan: Plan A ... Plan Z, then Plan AA, Plan AB..."""
+    letters = string.ascii_uppercase
+    if index < len(letters):
+        return f"Plan {letters[index]}"
+    return f"Plan {letters[index // len(letters) - 1]}{letters[index % len(letters)]}"
+
+
+def ordinal(position: int) -> str:
+    """1 -> "1st", 2 -> "2nd", 11 -> "11th"..."""
+    suffixes = {1: "st", 2: "nd", 3: "rd"}
+    if 10 <= position % 100 <= 20:
+        return f"{position}th"
+    return f"{position}{suffixes.get(position % 10, 'th')}"
+
+
+def is_tournament(plan_count: int, group_size: int) -> bool:
+    """Whether reviewers see only some of the plans."""
+    return plan_count > group_size
+
+
+def review_groups(labels: List[str], reviewers: List[str], group_size: int) -> Dict[str, List[str]]:
+    """
+    Which plans each reviewer ranks.
+
+    With no more plans than group_size, everyone reviews every plan.
+    Otherwise the plans are dealt out in turn, group_size to each reviewer
+    (slot k of reviewer i gets plan i * group_size + k, wrapping round), so
+    every plan is in a group however many reviewers there are - and with
+    one reviewer per plan, each plan is in exactly group_size groups.
+
+    Args:
+        labels: Plan labels, in council order
+        reviewers: Reviewer keys, in council order
+        group_size: Most plans in one review
+
+    Returns:
+        Labels to review, by reviewer
+
+    Raises:
+        ValueError: If there are too few reviewers for every plan to be reviewed
+    """
+    count = len(labels)
+    if not is_tournament(count, group_size):
+        return {reviewer: list(labels) for reviewer in reviewers}
+    if len(reviewers) * group_size < count:
+        raise ValueError(f"{len(reviewers)} reviewer(s) with groups of {group_size} can't review all {count} plans; "
+                         f"add reviewers to the stage_2 roster or raise REVIEW_GROUP_SIZE")
+    return {
+        reviewer: [labels[(index * group_size + slot) % count] for slot in range(group_size)]
+        for index, reviewer in enumerate(reviewers)
+    }
+
+
+def pairwise_results(rankings: List[List[str]]) -> Dict[Tuple[str, str], int]:
+    """How many times each plan was ranked above each other plan: (winner, loser) -> count."""
+    wins: Dict[Tuple[str, str], int] = {}
+    for ranking in rankings:
+        for winner, loser in combinations(ranking, 2):
+            wins[(winner, loser)] = wins.get((winner, loser), 0) + 1
+    return wins
+
+
+def bradley_terry(labels: List[str], wins: Dict[Tuple[str, str], int]) -> Dict[str, float]:
+    """
+    Bradley-Terry strengths from pairwise results; higher is better.
+
+    Fitted with the standard MM iteration. Every plan also gets one win and
+    one loss against an imaginary plan of strength 1.0, which anchors the
+    scale and keeps plans that won (or lost) every comparison at a finite
+    strength. Plans that were never compared stay at 1.0.
+    """
+    strength = {name: 1.0 for name in labels}
+    won = {name: 1.0 + sum(count for (winner, _), count in wins.items() if winner == name) for name in labels}
+    meetings: Dict[Tuple[str, str], int] = {}
+    for (winner, loser), count in wins.items():
+        pair = tuple(sorted((winner, loser)))
+        meetings[pair] = meetings.get(pair, 0) + count
+
+    for _ in range(ITERATIONS):
+        updated = {}
+        for name in labels:
+            # The imaginary average plan: two meetings at strength 1.0
+            denominator = 2.0 / (strength[name] + 1.0)
+            for (a, b), count in meetings.items():
+                if name in (a, b):
+                    other = b if name == a else a
+                    denominator += count / (strength[name] + strength[other])
+            updated[name] = won[name] / denominator
+        change = max(abs(updated[name] - strength[name]) for name in labels)
+        strength = updated
+        if change < TOLERANCE:
+            break
+    return strength
+
+
+def win_rate(name: str, wins: Dict[Tuple[str, str], int]) -> float:
+    """Share of its comparisons a plan won."""
+    won = sum(count for (winner, _), count in wins.items() if winner == name)
+    lost = sum(count for (_, loser), count in wins.items() if loser == name)
+    return won / (won + lost) if won + lost else 0.0
+
+
+def global_order(labels: List[str], rankings: List[List[str]]) -> List[str]:
+    """Every plan, best first, by Bradley-Terry strength."""
+    strength = bradley_terry(labels, pairwise_results(rankings))
+    return sorted(labels, key=lambda name: strength[name], reverse=True)